@@ -0,0 +1,74 @@
+"""Smart Resume Reviewer analysis engine, usable without Streamlit"""
+
+from .analysis import (
+    AnalysisResult,
+    analysis_history,
+    analyze,
+    analyze_revision,
+    build_result,
+    cache_analysis,
+    compare_results,
+    comparison_target,
+    forget_history,
+    get_cached_analysis,
+    latest_analysis,
+    record_analysis,
+    result_from_history,
+    role_keyword_match,
+    score_trend,
+    use_delta_review,
+)
+from .batching import EncodeBatcher
+from .cache import LRUCache, analysis_cache_key, get_analysis_cache
+from .compaction import compact_resume, count_tokens
+from .embedding_backends import EMBEDDING_BACKENDS, OnnxBackend, SentenceTransformerBackend, create_embedding_backend
+from .embedding_store import EmbeddingStore, embedding_key, get_embedding_store
+from .history import HistoryStore, analysis_key, get_history_store
+from .keywords import KEYWORD_ALIASES, KeywordIndex, get_keyword_index, normalize_keyword
+from .local_scoring import count_quantified_achievements, detect_sections, render_local_report, score_resume_locally
+from .pdf import (
+    PdfExtractionJob,
+    extract_pdf_text,
+    get_pdf_text_cache,
+    is_extraction_failure,
+    iter_pdf_pages,
+    submit_pdf_extraction,
+)
+from .ranking import job_description_embedding, rank_roles
+from .report import (
+    ReportStream,
+    build_delta_prompt,
+    build_report_prompt,
+    generate_comprehensive_report,
+    generate_delta_report,
+    parse_report,
+    stream_comprehensive_report,
+    stream_delta_report,
+)
+from .revisions import diff_resumes, score_deltas
+from .roles import JOB_ROLES, content_hash, role_catalogue_hash, role_comparison_text, standard_role_names
+from .scoring import (
+    SCORE_CATEGORIES,
+    calculate_percentage_score,
+    get_assessment_level,
+    validate_category_scores,
+    validate_inputs,
+)
+from .service import AnalysisJob, AnalysisJobQueue, QueueFullError, parse_analysis_request, start_analysis_service
+from .similarity import (
+    ModelRegistry,
+    RoleEmbeddingIndex,
+    SimilarityResult,
+    calculate_similarity_async,
+    calculate_similarity_bert,
+    compute_similarity,
+    compute_similarity_async,
+    cosine_similarity_matrix,
+    encode_cached,
+    get_encode_batcher,
+    get_model_registry,
+    get_role_embedding_index,
+    load_similarity_model,
+    normalize_embeddings,
+)
+from .telemetry import Telemetry, get_telemetry, start_metrics_server, trace
@@ -0,0 +1,69 @@
+# Command line interface: python -m resume_reviewer <command>
+
+import argparse
+import sys
+
+from . import batch, benchmark, embedding_bench, groq_stub, history, service
+from .settings import SERVICE_HOST, SERVICE_MAX_QUEUED, SERVICE_PORT, SERVICE_WORKERS
+
+def build_parser():
+    """Argument parser for all subcommands"""
+    parser = argparse.ArgumentParser(prog="python -m resume_reviewer", description="Smart Resume Reviewer headless tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    batch_parser = subparsers.add_parser("batch", help="Score a directory of resumes against job roles")
+    batch_parser.add_argument("--input", required=True, help="Directory containing .pdf/.txt resumes (searched recursively)")
+    batch_parser.add_argument("--roles", default="all", help='"all" or a comma-separated list of job roles')
+    batch_parser.add_argument("--out", default="-", help="JSONL output file (default: stdout)")
+    batch_parser.add_argument("--batch-size", type=int, default=64, help="Resumes encoded per model call")
+    batch_parser.add_argument("--job-desc", help="Optional text file with a custom job description scored as 'Custom Role'")
+    batch_parser.add_argument("--report-top", type=int, default=0, help="Generate LLM reports for each resume's top N roles")
+    batch_parser.set_defaults(handler=batch.main)
+    
+    stub_parser = subparsers.add_parser("stub-groq", help="Run a local stub of the Groq chat completions API")
+    stub_parser.add_argument("--host", default="127.0.0.1")
+    stub_parser.add_argument("--port", type=int, default=8765)
+    stub_parser.add_argument("--latency", type=float, default=0.5, help="Seconds before the first token")
+    stub_parser.add_argument("--token-delay", type=float, default=0.01, help="Seconds between streamed tokens")
+    stub_parser.add_argument("--fail-every", type=int, default=0, help="Answer every Nth request with 429")
+    stub_parser.add_argument("--retry-after", type=float, default=1.0, help="retry-after seconds sent with 429s")
+    stub_parser.set_defaults(handler=groq_stub.main)
+    
+    bench_parser = subparsers.add_parser("bench-embeddings", help="Compare embedding backends: latency, throughput, memory and ATS parity")
+    bench_parser.add_argument("--backends", default="sentence-transformers,onnx,onnx-int8,minilm", help="Comma-separated backends; the first is the parity reference for backends of the same model")
+    bench_parser.add_argument("--input", help="Directory of .pdf/.txt resumes (default: synthetic resumes from the role catalogue)")
+    bench_parser.add_argument("--limit", type=int, default=50, help="Maximum resumes read from --input")
+    bench_parser.add_argument("--batch-size", type=int, default=32)
+    bench_parser.add_argument("--tolerance", type=float, default=0.03, help="Maximum ATS score difference from the reference")
+    bench_parser.add_argument("--out", help="Optional JSON file for the results")
+    bench_parser.set_defaults(handler=embedding_bench.main)
+    
+    pipeline_parser = subparsers.add_parser("bench", help="Benchmark and load-test the analysis pipeline offline")
+    pipeline_parser.add_argument("--iterations", type=int, default=10, help="Samples per stage")
+    pipeline_parser.add_argument("--pages", default="1,2,5,10,20", help="Page counts of the synthetic PDFs")
+    pipeline_parser.add_argument("--concurrency", type=int, default=4, help="Concurrent users in the load-test stage")
+    pipeline_parser.add_argument("--stub-latency", type=float, default=0.05, help="Seconds the stub LLM waits before answering")
+    pipeline_parser.add_argument("--out", help="Write the results as a JSON baseline file")
+    pipeline_parser.add_argument("--compare", help="Baseline JSON file to compare against; exits 1 on regressions")
+    pipeline_parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed p50/p95 slowdown (0.2 = 20%%)")
+    pipeline_parser.set_defaults(handler=benchmark.main)
+    
+    serve_parser = subparsers.add_parser("serve", help="Run the HTTP analysis service (job queue and worker pool)")
+    serve_parser.add_argument("--host", default=SERVICE_HOST)
+    serve_parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    serve_parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="Analyses run concurrently")
+    serve_parser.add_argument("--max-queued", type=int, default=SERVICE_MAX_QUEUED, help="Queued jobs before new ones get 429")
+    serve_parser.set_defaults(handler=service.main)
+    
+    purge_parser = subparsers.add_parser("history-purge", help="Delete saved analyses from the history store")
+    purge_parser.add_argument("--user", help="Delete every analysis of this user id")
+    purge_parser.add_argument("--older-than-days", type=float, help="Delete analyses older than this (default: HISTORY_RETENTION_DAYS)")
+    purge_parser.set_defaults(handler=history.main)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+# Complete analysis of one resume against one job role, without any UI
+#
+# analyze() is the engine's single entry point for clients (the Streamlit app,
+# workers, the API): semantic similarity runs in the background while the LLM
+# report is generated, local scores stand in when the LLM is unavailable, and
+# successful AI analyses are cached by content and, for users who opt in,
+# analyses are kept in the persistent history. The Streamlit app streams the
+# report itself but shares the other steps through the helpers below.
+
+import copy
+import logging
+import sqlite3
+
+from .cache import analysis_cache_key, get_analysis_cache
+from .history import analysis_key, get_history_store
+from .keywords import get_keyword_index
+from .local_scoring import render_local_report, score_resume_locally
+from .report import generate_comprehensive_report, generate_delta_report
+from .revisions import diff_resumes, score_deltas
+from .roles import JOB_ROLES, role_comparison_text
+from .scoring import calculate_percentage_score, get_assessment_level, validate_inputs
+from .settings import GROQ_API_KEY, REVISION_MAX_CHANGED_RATIO
+from .similarity import SimilarityResult, compute_similarity_async, get_role_embedding_index
+from .telemetry import get_telemetry, trace
+
+logger = logging.getLogger(__name__)
+
+GENERIC_JOB_DESC = "Professional role requiring relevant experience and skills."
+
+class AnalysisResult:
+    """Scores, report and assessment of a resume for a job role.
+
+    scores_source is "llm" when the scores come from the AI report and "local"
+    when they were computed offline (no API key, or the report failed).
+    similarity holds the SimilarityResult with the resume and job vectors, for
+    reuse by later stages; it is None for cached results (results restored
+    from history keep only the job vector). revision is set by analyze_revision
+    (see compare_results).
+    """
+
+    def __init__(self, job_role, ats_score, report, scores, scores_source, keyword_match=None, compaction=None, from_cache=False, similarity=None, revision=None):
+        self.job_role = job_role
+        self.ats_score = ats_score
+        self.report = report
+        self.scores = scores
+        self.scores_source = scores_source
+        self.keyword_match = keyword_match
+        self.compaction = compaction
+        self.from_cache = from_cache
+        self.similarity = similarity
+        self.revision = revision
+
+    @property
+    def overall_percentage(self):
+        return calculate_percentage_score(self.scores)
+
+    @property
+    def assessment(self):
+        """(level, description) from the ATS and overall scores"""
+        return get_assessment_level(self.ats_score, self.overall_percentage)
+
+    def to_dict(self):
+        """JSON-serializable form, including the derived overall score and assessment (vectors excluded)"""
+        assessment_level, assessment_desc = self.assessment
+        return {
+            "job_role": self.job_role,
+            "ats_score": self.ats_score,
+            "overall_score": self.overall_percentage,
+            "assessment": assessment_level,
+            "assessment_detail": assessment_desc,
+            "scores": self.scores,
+            "scores_source": self.scores_source,
+            "report": self.report,
+            "keyword_match": self.keyword_match,
+            "compaction": self.compaction,
+            "from_cache": self.from_cache,
+            "revision": self.revision,
+        }
+
+def comparison_target(job_role, custom_job_desc=""):
+    """(text, precomputed embedding or None) the resume is compared against for similarity"""
+    if custom_job_desc.strip():
+        return custom_job_desc.strip(), None
+    if job_role in JOB_ROLES and job_role != "Custom Role":
+        role_index = get_role_embedding_index()
+        if role_index is not None and job_role in role_index:
+            return role_comparison_text(job_role), role_index.embedding(job_role)
+        return role_comparison_text(job_role), None
+    return GENERIC_JOB_DESC, None
+
+def role_keyword_match(resume, job_role):
+    """Matched/missing catalogue keywords of a role, or None for roles without a catalogue entry"""
+    keyword_index = get_keyword_index()
+    if job_role not in keyword_index.roles:
+        return None
+    return keyword_index.match(resume, [job_role])[job_role]
+
+def build_result(resume, job_role, ats_score, report=None, keyword_match=None, similarity=None):
+    """AnalysisResult from a similarity score and a report dict (None when no LLM was called).
+
+    Without usable AI scores, local scores are used; without a report at all,
+    the local report stands in for the narrative.
+    """
+    if report is not None and report["scores"]:
+        return AnalysisResult(
+            job_role, ats_score, report["report"], report["scores"], "llm", keyword_match, report.get("compaction"), similarity=similarity
+        )
+
+    local_result = score_resume_locally(resume, job_role, ats_score, keyword_match)
+    narrative = render_local_report(job_role, local_result) if report is None else report["report"]
+    return AnalysisResult(job_role, ats_score, narrative, local_result["scores"], "local", keyword_match, similarity=similarity)
+
+def get_cached_analysis(resume, job_role, custom_job_desc="", keyword_match=None, user_id=None):
+    """A previous AI analysis of identical inputs from the analysis cache, or else from user_id's saved history, or None.
+
+    Saved analyses are only ever served back to the user who saved them, so
+    they are not copied into the shared analysis cache.
+    """
+    cached = get_analysis_cache().get(analysis_cache_key(resume, job_role, custom_job_desc))
+    if cached is None and user_id is not None:
+        cached = _query_history("find_report", user_id, resume, job_role, custom_job_desc)
+    if cached is None:
+        return None
+    return AnalysisResult(job_role, cached["ats_score"], cached["report"], cached["scores"], "llm", keyword_match, from_cache=True)
+
+def _query_history(method, *args, default=None):
+    # History is an optimization: a disabled or failing store behaves like an empty one
+    store = get_history_store()
+    if store is None:
+        return default
+    try:
+        return getattr(store, method)(*args)
+    except sqlite3.Error as e:
+        logger.warning("Could not use the analysis history (%s): %s", method, e)
+        return default
+
+def cache_analysis(resume, custom_job_desc, result):
+    """Cache a successful full AI analysis; offline results, failures and delta reviews are not cached"""
+    if result.scores_source == "llm" and not result.from_cache and not (result.revision and result.revision["mode"] == "delta"):
+        get_analysis_cache().put(analysis_cache_key(resume, result.job_role, custom_job_desc), {
+            "ats_score": float(result.ats_score),
+            "report": result.report,
+            "scores": result.scores,
+        })
+
+def record_analysis(resume, custom_job_desc, result, user_id):
+    """Keep a new analysis in user_id's history; returns its history id, or None if not recorded.
+
+    Only call this for users who chose to keep their history: the resume text
+    is stored. Anonymous analyses (user_id None) and results served from the
+    caches are not recorded.
+    """
+    if user_id is None or result.from_cache:
+        return None
+    return _query_history("record", resume, custom_job_desc, result, user_id)
+
+def latest_analysis(user_id):
+    """(resume, custom_job_desc, AnalysisResult) of a user's most recent saved analysis, or None"""
+    record = _query_history("latest", user_id)
+    if record is None:
+        return None
+    return record["resume"], record["custom_job_desc"], result_from_history(record)
+
+def analysis_history(user_id, limit=20):
+    """Summaries of a user's saved analyses, newest first (see HistoryStore.recent)"""
+    return _query_history("recent", user_id, limit, default=[])
+
+def score_trend(user_id, job_role, limit=50):
+    """Summaries of a user's saved analyses for a role, oldest first (see HistoryStore.score_trend)"""
+    return _query_history("score_trend", user_id, job_role, limit, default=[])
+
+def forget_history(user_id):
+    """Delete every saved analysis of a user; returns the number deleted"""
+    return _query_history("purge", user_id, default=0)
+
+def result_from_history(record, keyword_match=None):
+    """AnalysisResult from a history record (see HistoryStore.latest).
+
+    The stored job vector is kept as similarity.job_embedding when the record
+    was made under the current model, prompt and chunking versions.
+    """
+    similarity = None
+    if record.get("job_embedding") is not None and record.get("analysis_key") == analysis_key(
+        record["resume"], record["job_role"], record["custom_job_desc"]
+    ):
+        similarity = SimilarityResult(record["ats_score"], job_embedding=record["job_embedding"])
+    return AnalysisResult(
+        record["job_role"], record["ats_score"], record["report"], record["scores"], record["scores_source"],
+        keyword_match, from_cache=True, similarity=similarity
+    )
+
+get_telemetry().register_stats("history", lambda: get_history_store() and get_history_store().stats())
+
+def analyze(resume, job_role, custom_job_desc="", api_key=GROQ_API_KEY, use_cache=True, user_id=None):
+    """Analyze a resume for a job role (and optional job description); returns an AnalysisResult.
+
+    Raises ValueError if the resume fails validation. Without an API key the
+    result holds the offline analysis. With a user_id, new analyses are kept
+    in the history (resume text included) under that id.
+    """
+    validation_errors = validate_inputs(resume)
+    if validation_errors:
+        raise ValueError(validation_errors[0])
+
+    with trace("analysis"):
+        keyword_match = role_keyword_match(resume, job_role)
+        if use_cache:
+            cached = get_cached_analysis(resume, job_role, custom_job_desc, keyword_match, user_id)
+            if cached is not None:
+                return cached
+
+        comparison_job_desc, comparison_embedding = comparison_target(job_role, custom_job_desc)
+        similarity_future = compute_similarity_async(resume, comparison_job_desc, comparison_embedding)
+        report = generate_comprehensive_report(resume, job_role, custom_job_desc, api_key) if api_key else None
+        similarity = similarity_future.result()
+        result = build_result(resume, job_role, similarity.score, report, keyword_match, similarity)
+        if use_cache:
+            cache_analysis(resume, custom_job_desc, result)
+        record_analysis(resume, custom_job_desc, result, user_id)
+        return result
+
+def compare_results(previous, result, diff, mode):
+    """Revision summary: the diff, how it was analyzed and the score changes since previous.
+
+    Category and overall deltas are only given when both results were scored
+    the same way (AI or local); otherwise overall_delta is None and
+    score_deltas is empty, as the two scales are not comparable.
+    """
+    comparable = result.scores_source == previous.scores_source
+    return {
+        "mode": mode,
+        "changed_sections": [section["title"] for section in diff["sections"]],
+        "changed_ratio": diff["changed_ratio"],
+        "ats_delta": round(result.ats_score - previous.ats_score, 3),
+        "overall_delta": round(result.overall_percentage - previous.overall_percentage, 1) if comparable else None,
+        "score_deltas": score_deltas(previous.scores, result.scores) if comparable else {},
+    }
+
+def use_delta_review(diff, previous, api_key, max_changed_ratio=REVISION_MAX_CHANGED_RATIO):
+    """True if a revision can be reviewed incrementally rather than with a full report"""
+    return bool(api_key) and previous.scores_source == "llm" and not diff["unchanged"] and diff["changed_ratio"] <= max_changed_ratio
+
+def analyze_revision(resume, previous_resume, previous, custom_job_desc="", api_key=GROQ_API_KEY, user_id=None):
+    """Re-analyze an edited resume against the previous AnalysisResult for the same role and job description.
+
+    Unchanged resumes return the previous result. Small revisions of an AI
+    analysis get a delta review of the changed sections (and re-embed only
+    changed chunks); larger ones, offline runs and failed delta reviews get a
+    full analysis. Either way result.revision holds the score changes (see
+    compare_results).
+    """
+    diff = diff_resumes(previous_resume, resume)
+    if diff["unchanged"]:
+        result = copy.copy(previous)
+        result.revision = compare_results(previous, previous, diff, "unchanged")
+        return result
+    if not use_delta_review(diff, previous, api_key):
+        result = analyze(resume, previous.job_role, custom_job_desc, api_key, user_id=user_id)
+        result.revision = compare_results(previous, result, diff, "full")
+        return result
+
+    validation_errors = validate_inputs(resume)
+    if validation_errors:
+        raise ValueError(validation_errors[0])
+    with trace("revision_analysis"):
+        keyword_match = role_keyword_match(resume, previous.job_role)
+        comparison_job_desc, comparison_embedding = comparison_target(previous.job_role, custom_job_desc)
+        if comparison_embedding is None and previous.similarity is not None:
+            comparison_embedding = previous.similarity.job_embedding  # Same role and job description as before
+        similarity_future = compute_similarity_async(resume, comparison_job_desc, comparison_embedding, previous.similarity)
+        report, mode = generate_delta_report(diff, previous.scores, previous.job_role, custom_job_desc, api_key), "delta"
+        if not report["scores"]:
+            # A failed delta review would leave local scores to compare with AI ones; run the full report instead
+            report, mode = generate_comprehensive_report(resume, previous.job_role, custom_job_desc, api_key), "full"
+        similarity = similarity_future.result()
+        result = build_result(resume, previous.job_role, similarity.score, report, keyword_match, similarity)
+        result.revision = compare_results(previous, result, diff, mode)
+        record_analysis(resume, custom_job_desc, result, user_id)
+        return result
@@ -0,0 +1,143 @@
+# Headless batch scoring of a directory of resumes against many job roles
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from .analysis import build_result
+from .chunking import chunk_text, mean_pooled_embedding, pool_chunk_scores
+from .local_scoring import score_resume_locally
+from .pdf import is_extraction_failure, submit_pdf_extraction
+from .report import generate_comprehensive_report
+from .roles import JOB_ROLES, standard_role_names
+from .scoring import validate_inputs
+from .similarity import encode_cached, get_role_embedding_index, load_similarity_model
+
+RESUME_SUFFIXES = (".pdf", ".txt")
+
+def iter_resume_paths(input_dir):
+    """Yield resume files under input_dir in a stable order"""
+    for path in sorted(Path(input_dir).rglob("*")):
+        if path.is_file() and path.suffix.lower() in RESUME_SUFFIXES:
+            yield path
+
+def read_resumes(paths):
+    """Yield (path, text) for each resume, parsing all PDFs in parallel in the extraction pool"""
+    jobs = [(path, submit_pdf_extraction(path) if path.suffix.lower() == ".pdf" else None) for path in paths]
+    for path, job in jobs:
+        if job is not None:
+            yield path, job.result()
+        else:
+            yield path, path.read_text(encoding="utf-8", errors="replace")
+
+def resolve_roles(roles):
+    """Turn the --roles argument ("all" or a comma-separated list) into role names"""
+    if roles.strip().lower() == "all":
+        return standard_role_names()
+    role_names = [name.strip() for name in roles.split(",") if name.strip()]
+    unknown = [name for name in role_names if name not in JOB_ROLES or name == "Custom Role"]
+    if unknown:
+        raise ValueError(f"Unknown job role(s): {', '.join(unknown)}")
+    return role_names
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _report_summary(resume_text, job_role, ats_score, custom_job_desc):
+    # build_result falls back to local scores when the LLM call failed or returned no usable scores
+    result = build_result(resume_text, job_role, ats_score, generate_comprehensive_report(resume_text, job_role, custom_job_desc))
+    assessment_level, assessment_desc = result.assessment
+    return {
+        "role": job_role,
+        "overall_score": result.overall_percentage,
+        "scores": result.scores,
+        "scores_source": result.scores_source,
+        "assessment": assessment_level,
+        "assessment_detail": assessment_desc,
+        "report": result.report,
+        "tokens_saved": (result.compaction or {}).get("tokens_saved", 0),
+    }
+
+def run_batch(input_dir, out, roles="all", batch_size=64, custom_job_desc="", report_top=0, progress=None):
+    """Score every resume under input_dir against the selected roles, writing one JSON line per resume.
+
+    Resumes are chunked and read batch_size at a time; all their chunks are
+    encoded in a single encode call and scored against all targets with one
+    cosine matrix, so memory stays flat regardless of corpus size. Returns counts of scored and failed files.
+    """
+    model = load_similarity_model()
+    role_index = get_role_embedding_index()
+    if model is None or role_index is None:
+        raise RuntimeError("Similarity model could not be loaded")
+    
+    target_names = resolve_roles(roles)
+    target_matrix = role_index.matrix(target_names)
+    if custom_job_desc.strip():
+        target_names = target_names + ["Custom Role"]
+        target_matrix = np.vstack([target_matrix, mean_pooled_embedding(encode_cached(chunk_text(custom_job_desc.strip())))])
+    
+    counts = {"scored": 0, "failed": 0}
+    for paths in _chunks(iter_resume_paths(input_dir), batch_size):
+        texts, records = [], []
+        for path, text in read_resumes(paths):
+            errors = [text] if is_extraction_failure(text) else validate_inputs(text)
+            if errors:
+                out.write(json.dumps({"file": str(path), "error": errors[0]}, ensure_ascii=False) + "\n")
+                counts["failed"] += 1
+                continue
+            texts.append(text)
+            records.append({"file": str(path), "words": len(text.split())})
+        
+        if texts:
+            # All chunks of all resumes in this batch go through one encode call and one cosine matrix
+            chunk_lists = [chunk_text(text) for text in texts]
+            bounds = np.cumsum([0] + [len(chunks) for chunks in chunk_lists])
+            chunk_scores = encode_cached(
+                [chunk for chunks in chunk_lists for chunk in chunks], batch_size=batch_size
+            ) @ target_matrix.T  # Unit-length embeddings: the dot product is the cosine similarity
+            similarity = [pool_chunk_scores(chunk_scores[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+            for record, text, row in zip(records, texts, similarity):
+                ranked = np.argsort(-row)
+                record["ats_scores"] = {name: round(float(score), 3) for name, score in zip(target_names, row)}
+                record["best_role"] = target_names[ranked[0]]
+                record["local_scores"] = score_resume_locally(text, record["best_role"], float(row[ranked[0]]))["scores"]
+                if report_top:
+                    record["reports"] = [
+                        _report_summary(
+                            text,
+                            target_names[i],
+                            float(row[i]),
+                            custom_job_desc if target_names[i] == "Custom Role" else "",
+                        )
+                        for i in ranked[:report_top]
+                    ]
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                counts["scored"] += 1
+        
+        out.flush()
+        if progress:
+            progress(counts)
+    return counts
+
+def main(args):
+    """Entry point for `python -m resume_reviewer batch`"""
+    custom_job_desc = Path(args.job_desc).read_text(encoding="utf-8") if args.job_desc else ""
+    
+    def report_progress(counts):
+        print(f"scored {counts['scored']}, failed {counts['failed']}", file=sys.stderr)
+    
+    if args.out == "-":
+        counts = run_batch(args.input, sys.stdout, args.roles, args.batch_size, custom_job_desc, args.report_top, report_progress)
+    else:
+        with open(args.out, "w", encoding="utf-8") as out:
+            counts = run_batch(args.input, out, args.roles, args.batch_size, custom_job_desc, args.report_top, report_progress)
+    return 0 if counts["scored"] or not counts["failed"] else 1
@@ -0,0 +1,112 @@
+# Micro-batching of embedding requests from concurrent sessions
+#
+# Each analysis encodes only a few chunks, which leaves most of a CPU forward
+# pass unused. Requests are queued and a single scheduler thread merges
+# whatever arrives within max_wait (or until max_batch texts are collected)
+# into one encode call, then hands each caller its rows through a future.
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from .settings import EMBED_BATCH_MAX_SIZE, EMBED_BATCH_MAX_WAIT_MS
+from .telemetry import get_telemetry
+
+logger = logging.getLogger(__name__)
+
+class EncodeBatcher:
+    """Merges concurrent encode requests into batched calls of encode(texts, batch_size=...)"""
+
+    def __init__(self, encode, max_batch=EMBED_BATCH_MAX_SIZE, max_wait_ms=EMBED_BATCH_MAX_WAIT_MS, window=1000):
+        self._encode = encode
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self.largest_batch = 0
+        self._recent_sizes = deque(maxlen=window)
+        self._recent_delays = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._held = None  # Request taken from the queue that did not fit in the last batch
+        threading.Thread(target=self._run, name="encode-batcher", daemon=True).start()
+
+    def submit(self, texts):
+        """Queue texts for encoding; returns a Future of their float32 embeddings"""
+        future = Future()
+        self._queue.put((list(texts), future, time.perf_counter()))
+        return future
+
+    def encode(self, texts):
+        """Embeddings for texts, encoded together with other callers' pending texts"""
+        return self.submit(texts).result()
+
+    def _collect(self):
+        # Block for the first request, then gather more until the batch is full or max_wait has passed.
+        # A request that would take the batch past max_batch is held over to start the next one;
+        # only a single request larger than max_batch makes a batch exceed it.
+        request, self._held = self._held or self._queue.get(), None
+        batch = [request]
+        size = len(request[0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if size + len(request[0]) > self.max_batch:
+                self._held = request
+                break
+            batch.append(request)
+            size += len(request[0])
+        return batch, size
+
+    def _run(self):
+        while True:
+            batch, size = self._collect()
+            started = time.perf_counter()
+            try:
+                embeddings = np.asarray(
+                    self._encode([text for texts, _, _ in batch for text in texts], batch_size=max(min(size, self.max_batch), 1)),
+                    dtype=np.float32,
+                )
+            except Exception as e:
+                logger.error("Batched encode of %s texts failed: %s", size, e)
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            position = 0
+            for texts, future, queued_at in batch:
+                future.set_result(embeddings[position:position + len(texts)])
+                position += len(texts)
+                get_telemetry().observe("encode_queue_delay", started - queued_at)
+            with self._lock:
+                self.batches += 1
+                self.requests += len(batch)
+                self.texts += size
+                self.largest_batch = max(self.largest_batch, size)
+                self._recent_sizes.append(size)
+                self._recent_delays.extend(started - queued_at for _, _, queued_at in batch)
+
+    def stats(self):
+        """Batch counts and sizes, and queueing delay of recent requests"""
+        with self._lock:
+            sizes, delays = list(self._recent_sizes), list(self._recent_delays)
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "texts": self.texts,
+                "requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "mean_batch_size": round(float(np.mean(sizes)), 2) if sizes else 0.0,
+                "largest_batch": self.largest_batch,
+                "queue_delay_p50_ms": round(float(np.percentile(delays, 50)) * 1000, 2) if delays else 0.0,
+                "queue_delay_p95_ms": round(float(np.percentile(delays, 95)) * 1000, 2) if delays else 0.0,
+            }
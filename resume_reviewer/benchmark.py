@@ -0,0 +1,279 @@
+# Offline benchmark and load test of the analysis pipeline
+#
+# Runs every stage against synthetic PDFs and a local stub of the Groq API,
+# records p50/p95/p99 latency, throughput and peak RSS per stage, writes a
+# machine-readable baseline and compares a run against a previous baseline.
+
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib import metadata
+
+import numpy as np
+
+from .embedding_bench import synthetic_resumes
+from .groq_stub import STUB_REPORT, start_stub_server
+
+BENCHMARK_VERSION = 1
+TRACKED_PACKAGES = ("streamlit", "pdfminer.six", "sentence-transformers", "numpy", "groq", "httpx")
+NOISE_FLOOR_MS = 1.0  # Differences below this are never reported as regressions
+
+def _pdf_string(text):
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+def synthetic_pdf(pages):
+    """Minimal single-font PDF with one list of text lines per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>")
+    font_id = 3 + 2 * len(pages)
+    for i, lines in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        content = "BT /F1 10 Tf 50 760 Td 14 TL " + " ".join(f"{_pdf_string(line)} '" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    pdf = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf.encode("latin-1")))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n"
+    xref_offset = len(pdf.encode("latin-1"))
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n" + "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    return pdf.encode("latin-1")
+
+def synthetic_resume_pdf(page_count, nonce, lines_per_page=50):
+    """A page_count-page resume PDF whose bytes (and so cache key) are unique per nonce"""
+    source_lines = [line for resume in synthetic_resumes() for line in resume.splitlines() if line.strip()]
+    source_lines = [line.encode("latin-1", "ignore").decode("latin-1") for line in source_lines]
+    pages = []
+    for page in range(page_count):
+        start = page * lines_per_page
+        lines = [source_lines[(start + i) % len(source_lines)] for i in range(lines_per_page - 1)]
+        pages.append([f"Candidate {nonce} - page {page + 1}"] + lines)
+    return synthetic_pdf(pages)
+
+def unique_resume_text(nonce):
+    """A resume whose every chunk is new, so no cached embedding can be reused"""
+    text = "\n".join(synthetic_resumes())
+    return "\n".join(f"{line} ref{nonce}x{i}" for i, line in enumerate(text.splitlines()) if line.strip())
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None if unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024, 1)
+
+def summarize(durations, elapsed=None):
+    """Latency percentiles (ms) and throughput for a list of durations in seconds"""
+    durations_ms = np.asarray(durations) * 1000
+    elapsed = elapsed if elapsed is not None else float(np.sum(durations))
+    return {
+        "count": len(durations),
+        "p50_ms": round(float(np.percentile(durations_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(durations_ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(durations_ms, 99)), 3),
+        "mean_ms": round(float(durations_ms.mean()), 3),
+        "throughput_per_s": round(len(durations) / elapsed, 2) if elapsed else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def _time_calls(function, arguments):
+    durations = []
+    start = time.perf_counter()
+    for argument in arguments:
+        call_start = time.perf_counter()
+        function(argument)
+        durations.append(time.perf_counter() - call_start)
+    return summarize(durations, time.perf_counter() - start)
+
+def _run_stages(options):
+    """Measure every stage; runs in a fresh process configured by environment variables"""
+    from .local_scoring import score_resume_locally
+    from .pdf import extract_pdf_text, is_extraction_failure, shutdown_extraction_pool
+    from .report import generate_comprehensive_report, parse_report, stream_comprehensive_report
+    from .similarity import compute_similarity, get_model_registry
+    from .roles import role_comparison_text
+
+    iterations = options["iterations"]
+    stages = {}
+
+    start = time.perf_counter()
+    model_loaded = get_model_registry().load() is not None
+    stages["model_load"] = summarize([time.perf_counter() - start])
+    stages["model_load"]["failures"] = 0 if model_loaded else 1
+
+    extract_pdf_text(synthetic_resume_pdf(1, "warm-up"))  # Start the worker processes outside the timings
+    for page_count in options["pages"]:
+        pdfs = [synthetic_resume_pdf(page_count, f"{page_count}-{i}") for i in range(iterations)]
+        failures = []
+
+        def extract(pdf):
+            if is_extraction_failure(extract_pdf_text(pdf)):
+                failures.append(pdf)
+
+        stages[f"pdf_extraction_{page_count}p"] = _time_calls(extract, pdfs)
+        stages[f"pdf_extraction_{page_count}p"]["failures"] = len(failures)
+    shutdown_extraction_pool()
+
+    job_desc = role_comparison_text("Data Scientist")
+    similarity_failures = []
+    def similarity(text):
+        # Without vectors the model failed and the score is a placeholder 0.0, not a timing of the model
+        result = compute_similarity(text, job_desc)
+        if result.resume_chunk_embeddings is None:
+            similarity_failures.append(text)
+        return result.score
+    stages["similarity_cold"] = _time_calls(similarity, [unique_resume_text(i) for i in range(iterations)])
+    stages["similarity_cold"]["failures"] = len(similarity_failures)
+    warm_resume = unique_resume_text("warm")
+    similarity(warm_resume)
+    similarity_failures.clear()
+    stages["similarity_warm"] = _time_calls(similarity, [warm_resume] * iterations)
+    stages["similarity_warm"]["failures"] = len(similarity_failures)
+
+    # Score extraction is now parsing and validating the report's JSON scores block
+    stages["score_parsing"] = _time_calls(parse_report, [STUB_REPORT] * iterations * 10)
+    score_resume_locally(warm_resume, "Data Scientist", 0.6)  # Compiles the keyword index
+    stages["local_scoring"] = _time_calls(lambda text: score_resume_locally(text, "Data Scientist", 0.6), [warm_resume] * iterations)
+    report_failures = []
+    def report(text):
+        if not generate_comprehensive_report(text, "Data Scientist")["scores"]:
+            report_failures.append(text)
+    stages["report_end_to_end"] = _time_calls(report, [warm_resume] * iterations)
+    stages["report_end_to_end"]["failures"] = len(report_failures)
+
+    first_chunk_durations = []
+    def first_chunk(text):
+        start = time.perf_counter()
+        stream = iter(stream_comprehensive_report(text, "Data Scientist"))
+        next(stream, "")
+        first_chunk_durations.append(time.perf_counter() - start)
+        for _ in stream:
+            pass
+    stages["report_stream_total"] = _time_calls(first_chunk, [warm_resume] * iterations)
+    stages["report_stream_first_chunk"] = summarize(first_chunk_durations)
+
+    # Load test: concurrent users each running similarity, local scoring and a report
+    def analyze(nonce):
+        start = time.perf_counter()
+        resume = unique_resume_text(f"load{nonce}")
+        ats_score = compute_similarity(resume, job_desc).score
+        score_resume_locally(resume, "Data Scientist", ats_score)
+        generate_comprehensive_report(resume, "Data Scientist")
+        return time.perf_counter() - start
+
+    requests = iterations * options["concurrency"]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+        durations = list(executor.map(analyze, range(requests)))
+    stages[f"analysis_concurrent_{options['concurrency']}"] = summarize(durations, time.perf_counter() - start)
+    return stages
+
+def _environment():
+    versions = {}
+    for package in TRACKED_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count(), "packages": versions}
+
+def run_benchmark(iterations=10, pages=(1, 2, 5, 10, 20), concurrency=4, stub_latency=0.05):
+    """Run all stages offline in a child process; returns the baseline document"""
+    server, base_url = start_stub_server(latency=stub_latency)
+    with tempfile.TemporaryDirectory(prefix="resume-bench-") as scratch:
+        # The child reads these at import time: stub LLM, no rate limits, throwaway caches
+        overrides = {
+            "GROQ_BASE_URL": base_url,
+            "GROQ_API_KEY": "stub",
+            "GROQ_REQUESTS_PER_MINUTE": "0",
+            "GROQ_TOKENS_PER_MINUTE": "0",
+            "EMBEDDING_CACHE_PATH": os.path.join(scratch, "embeddings.sqlite3"),
+            "PDF_TEXT_CACHE_DIR": "",
+            "ROLE_EMBEDDINGS_DIR": os.path.join(scratch, "role_embeddings"),
+        }
+        previous = {name: os.environ.get(name) for name in overrides}
+        os.environ.update(overrides)
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                stages = executor.submit(
+                    _run_stages, {"iterations": iterations, "pages": list(pages), "concurrency": concurrency}
+                ).result()
+        finally:
+            for name, value in previous.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            server.shutdown()
+    return {
+        "version": BENCHMARK_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": _environment(),
+        "options": {"iterations": iterations, "pages": list(pages), "concurrency": concurrency, "stub_latency": stub_latency},
+        "stages": stages,
+    }
+
+def compare_to_baseline(current, baseline, max_regression=0.2):
+    """Per-stage p50/p95 changes against a baseline; regressions exceed max_regression and the noise floor"""
+    comparison = []
+    for stage, stats in current["stages"].items():
+        reference = baseline.get("stages", {}).get(stage)
+        if reference is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            before, after = reference[metric], stats[metric]
+            change = (after - before) / before if before else 0.0
+            comparison.append({
+                "stage": stage,
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change": round(change, 3),
+                "regression": change > max_regression and after - before > NOISE_FLOOR_MS,
+            })
+    return comparison
+
+def main(args):
+    """Entry point for `python -m resume_reviewer bench`"""
+    pages = [int(page) for page in args.pages.split(",") if page.strip()]
+    result = run_benchmark(args.iterations, pages, args.concurrency, args.stub_latency)
+
+    print(f"{'stage':<30}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>10}{'peak MB':>9}")
+    for stage, stats in result["stages"].items():
+        print(
+            f"{stage:<30}{stats['count']:>6}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+            f"{stats['throughput_per_s'] or '—':>10}{stats['peak_rss_mb'] or '—':>9}"
+        )
+    failed = {stage: stats["failures"] for stage, stats in result["stages"].items() if stats.get("failures")}
+    for stage, failures in failed.items():
+        print(f"FAILED: {stage} had {failures} failed call(s); its timings are not valid", file=sys.stderr)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as out:
+            json.dump(result, out, indent=2)
+        print(f"Baseline written to {args.out}", file=sys.stderr)
+
+    if not args.compare:
+        return 1 if failed else 0
+    with open(args.compare, encoding="utf-8") as baseline_file:
+        comparison = compare_to_baseline(result, json.load(baseline_file), args.max_regression)
+    regressions = [row for row in comparison if row["regression"]]
+    print(f"\nCompared with {args.compare} (max regression {args.max_regression:.0%}):")
+    for row in comparison:
+        marker = "REGRESSION" if row["regression"] else ""
+        print(f"{row['stage']:<30}{row['metric']:>8}{row['baseline']:>10}{row['current']:>10}{row['change']:>+9.1%}  {marker}")
+    return 1 if regressions or failed else 0
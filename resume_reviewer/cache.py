@@ -0,0 +1,95 @@
+# In-process caches shared by every session and worker
+
+import threading
+import time
+from collections import OrderedDict
+
+from .roles import content_hash
+from .settings import (
+    ANALYSIS_CACHE_MAX_ENTRIES,
+    ANALYSIS_CACHE_TTL_SECONDS,
+    CHUNKING_VERSION,
+    EMBEDDING_MODEL_ID,
+    LLM_MODEL_NAME,
+    PROMPT_VERSION,
+    SIMILARITY_POOLING,
+)
+from .telemetry import get_telemetry
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and, optionally, total size, with an optional TTL"""
+
+    def __init__(self, max_entries, ttl_seconds=None, max_size=None, sizeof=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.sizeof = sizeof or (lambda value: 1)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entries"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic(), value, self.sizeof(value))
+            self.size += self._entries[key][2]
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_size is not None and self.size > self.max_size)
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        self.size -= self._entries.pop(key)[2]
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "size": self.size,
+            }
+
+_analysis_cache = LRUCache(ANALYSIS_CACHE_MAX_ENTRIES, ANALYSIS_CACHE_TTL_SECONDS)
+
+def get_analysis_cache():
+    """Process-wide analysis cache"""
+    return _analysis_cache
+
+get_telemetry().register_stats("analysis_cache", _analysis_cache.stats)
+
+def analysis_cache_key(resume, job_role, custom_job_desc=""):
+    """Content-addressed key for a full analysis"""
+    return (
+        content_hash(resume),
+        job_role,
+        content_hash(custom_job_desc.strip()),
+        EMBEDDING_MODEL_ID,
+        CHUNKING_VERSION,
+        SIMILARITY_POOLING,
+        LLM_MODEL_NAME,
+        PROMPT_VERSION,
+    )
@@ -0,0 +1,91 @@
+# Section- and sentence-aware chunking of long documents for embedding
+#
+# all-mpnet-base-v2 silently truncates its input at 384 word-pieces, so a
+# multi-page resume encoded as one string is scored on its first page only.
+# Documents are split into chunks that each fit the model, and the per-chunk
+# similarities are pooled into one score.
+
+import re
+
+import numpy as np
+
+from .settings import SIMILARITY_CHUNK_WORDS, SIMILARITY_MAX_CHUNKS, SIMILARITY_POOLING, SIMILARITY_TOP_K
+
+SECTION_KEYWORDS = (
+    "summary", "objective", "profile", "experience", "employment", "work history",
+    "education", "skills", "competencies", "projects", "certifications", "awards",
+    "publications", "languages", "interests", "volunteer", "achievements",
+)
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?;])\s+|\n+")  # Sentence ends and line breaks (bullets, PDF lines)
+
+def is_section_heading(line):
+    """Heuristic: a short line in capitals, ending with a colon or naming a common resume section"""
+    stripped = line.strip().strip("=-_#*:").strip()
+    if not stripped or len(stripped.split()) > 5:
+        return False
+    if line.strip().endswith(":") or (stripped.isupper() and any(c.isalpha() for c in stripped)):
+        return True
+    return stripped.lower() in SECTION_KEYWORDS
+
+def split_sections(text):
+    """Split text into sections, each starting at a heading line"""
+    sections, current = [], []
+    for line in text.splitlines():
+        if is_section_heading(line) and current:
+            sections.append("\n".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("\n".join(current))
+    return [section for section in sections if section.strip()]
+
+def _sentences(section, max_words):
+    for sentence in SENTENCE_SPLIT.split(section):
+        words = sentence.split()
+        # Sentences longer than a whole chunk are hard-wrapped
+        for start in range(0, len(words), max_words):
+            yield words[start:start + max_words]
+
+def chunk_text(text, max_words=SIMILARITY_CHUNK_WORDS, max_chunks=SIMILARITY_MAX_CHUNKS):
+    """Split text into chunks of at most max_words, never crossing a section boundary.
+
+    Sentences are kept whole where possible. If there are more than max_chunks
+    chunks, an evenly spaced subset is kept so the whole document stays
+    represented.
+    """
+    chunks = []
+    for section in split_sections(text):
+        current = []
+        for words in _sentences(section, max_words):
+            if current and len(current) + len(words) > max_words:
+                chunks.append(" ".join(current))
+                current = []
+            current.extend(words)
+        if current:
+            chunks.append(" ".join(current))
+    
+    if not chunks:
+        return [text.strip()]
+    if len(chunks) > max_chunks:
+        keep = np.linspace(0, len(chunks) - 1, max_chunks).round().astype(int)
+        chunks = [chunks[i] for i in sorted(set(keep))]
+    return chunks
+
+def pool_chunk_scores(chunk_scores, pooling=SIMILARITY_POOLING, top_k=SIMILARITY_TOP_K):
+    """Reduce a (n_chunks, n_targets) similarity matrix to one score per target"""
+    chunk_scores = np.asarray(chunk_scores)
+    if pooling == "max":
+        return chunk_scores.max(axis=0)
+    if pooling == "mean":
+        return chunk_scores.mean(axis=0)
+    if pooling == "topk":
+        k = min(top_k, chunk_scores.shape[0])
+        return np.sort(chunk_scores, axis=0)[-k:].mean(axis=0)
+    raise ValueError(f"Unknown pooling strategy: {pooling}")
+
+def mean_pooled_embedding(chunk_embeddings):
+    """Single unit-length vector for a document from its chunk embeddings"""
+    chunk_embeddings = np.asarray(chunk_embeddings, dtype=np.float32)
+    norms = np.linalg.norm(chunk_embeddings, axis=1, keepdims=True)
+    mean = (chunk_embeddings / np.where(norms == 0, 1, norms)).mean(axis=0)
+    return mean / (np.linalg.norm(mean) or 1)
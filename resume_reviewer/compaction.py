@@ -0,0 +1,118 @@
+# Resume compaction before the LLM call
+#
+# PDF text carries layout noise: runs of whitespace, headers and footers
+# repeated on every page, page numbers and duplicated lines. All of it costs
+# input tokens and latency without helping the analysis. compact_resume strips
+# that noise. It then enforces a token budget by truncating the lowest-value
+# sections first.
+
+import re
+from collections import Counter
+
+from .chunking import is_section_heading
+from .settings import RESUME_TOKEN_BUDGET
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional
+    _encoding = None
+
+PAGE_NUMBER = re.compile(r"^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$", re.IGNORECASE)
+PDF_ARTIFACT = re.compile(r"\(cid:\d+\)")
+INLINE_WHITESPACE = re.compile(r"[ \t\u00a0\u2000-\u200b]+")
+
+# Lower numbers are truncated first; unknown sections sit in the middle
+SECTION_PRIORITIES = {
+    "references": 0, "hobbies": 0, "interests": 0, "declaration": 0, "personal details": 0,
+    "languages": 1, "volunteer": 1, "activities": 1, "publications": 1,
+    "awards": 2, "certifications": 2, "education": 3, "projects": 3,
+    "summary": 4, "profile": 4, "objective": 4, "achievements": 4,
+    "skills": 5, "experience": 5, "employment": 5, "work history": 5,
+}
+DEFAULT_SECTION_PRIORITY = 2
+
+def count_tokens(text):
+    """Token count with tiktoken if installed, otherwise about four characters per token"""
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+def _normalize_lines(text):
+    return [INLINE_WHITESPACE.sub(" ", PDF_ARTIFACT.sub("", line)).strip() for line in text.splitlines()]
+
+def _page_furniture(pages):
+    """Lines that repeat at the top or bottom of at least half of the pages"""
+    if len(pages) < 2:
+        return set()
+    edge_counts = Counter()
+    for lines in pages:
+        content = [line for line in lines if line]
+        edge_counts.update(set(content[:3] + content[-3:]))
+    return {line for line, count in edge_counts.items() if count >= max(2, len(pages) / 2)}
+
+def _section_priority(heading):
+    heading = heading.strip().strip("=-_#*:").strip().lower()
+    for keyword, priority in SECTION_PRIORITIES.items():
+        if keyword in heading:
+            return priority
+    return DEFAULT_SECTION_PRIORITY
+
+def compact_resume(text, token_budget=RESUME_TOKEN_BUDGET):
+    """Return (compacted text, stats) for a resume.
+
+    Whitespace is normalized, page headers/footers and page numbers are
+    removed, and repeated lines are dropped. If the result still exceeds
+    token_budget, lines are cut from the end of the lowest-priority sections
+    first, and from the opening section (name and contact details) last. stats
+    reports original and compacted token counts, tokens saved and any
+    truncated sections.
+    """
+    original_tokens = count_tokens(text)
+    pages = [_normalize_lines(page) for page in text.split("\f")]
+    furniture = _page_furniture(pages)
+    
+    lines, seen = [], set()
+    for page in pages:
+        for line in page:
+            if PAGE_NUMBER.match(line):
+                continue
+            # Page furniture (e.g. a name header) is kept once, where it first appears
+            if line in furniture or len(line.split()) >= 4:
+                if line in seen:
+                    continue
+                seen.add(line)
+            if line or (lines and lines[-1]):
+                lines.append(line)
+    
+    # Group lines into sections: [heading, [lines...]]
+    sections = []
+    for line in lines:
+        if not sections or (line and is_section_heading(line)):
+            sections.append([line, []])
+        sections[-1][1].append(line)
+    
+    line_tokens = {line: count_tokens(line) + 1 for line in lines}
+    total_tokens = sum(line_tokens[line] for line in lines)
+    truncated = []
+    if total_tokens > token_budget:
+        # The opening section goes last: it holds the name and, without headings, the whole resume
+        order = sorted(range(1, len(sections)), key=lambda i: (_section_priority(sections[i][0]), -i)) + [0]
+        for i in order:
+            heading, section_lines = sections[i]
+            before = len(section_lines)
+            while section_lines and total_tokens > token_budget:
+                total_tokens -= line_tokens[section_lines.pop()]
+            if len(section_lines) < before:
+                truncated.append(heading.strip() or "(untitled)")
+            if total_tokens <= token_budget:
+                break
+    
+    compacted = "\n".join(line for _, section_lines in sections for line in section_lines).strip()
+    compacted_tokens = count_tokens(compacted)
+    return compacted, {
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "tokens_saved": original_tokens - compacted_tokens,
+        "truncated_sections": truncated,
+    }
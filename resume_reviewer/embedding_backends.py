@@ -0,0 +1,73 @@
+# Interchangeable embedding backends behind the similarity model registry
+#
+# Every backend exposes load() and encode(texts, batch_size) returning float32
+# rows, so chunking, pooling and caching work the same whichever one is active.
+# Heavy libraries are imported inside load() so unused backends cost nothing.
+
+import numpy as np
+
+from .settings import MINILM_MODEL_NAME, SIMILARITY_BACKEND, SIMILARITY_MODEL_NAME, SIMILARITY_ONNX_INT8_FILE
+
+class SentenceTransformerBackend:
+    """PyTorch inference through sentence-transformers (the reference backend)"""
+
+    backend_name = "sentence-transformers"
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self.model = None
+
+    def _load_model(self):
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(self.model_name, device="cpu")
+
+    def load(self):
+        """Load the model if needed and return self"""
+        if self.model is None:
+            self.model = self._load_model()
+        return self
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        """Embeddings for texts as a float32 array of shape (len(texts), dim)"""
+        return np.asarray(self.model.encode(texts, batch_size=batch_size, **kwargs), dtype=np.float32)
+
+    def param_mb(self):
+        """Size of the model weights in MB, or None if the backend cannot tell"""
+        try:
+            return round(sum(p.numel() * p.element_size() for p in self.model.parameters()) / 1024 ** 2, 1)
+        except Exception:
+            return None
+
+class OnnxBackend(SentenceTransformerBackend):
+    """ONNX Runtime inference; needs sentence-transformers>=3.2 and optimum[onnxruntime].
+
+    With file_name set, a pre-exported variant from the model repository is
+    used, e.g. one of the dynamically quantized int8 files.
+    """
+
+    backend_name = "onnx"
+
+    def __init__(self, model_name, file_name=None):
+        super().__init__(model_name)
+        self.file_name = file_name
+
+    def _load_model(self):
+        from sentence_transformers import SentenceTransformer
+        model_kwargs = {"file_name": self.file_name} if self.file_name else None
+        return SentenceTransformer(self.model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+
+    def param_mb(self):
+        return None
+
+EMBEDDING_BACKENDS = {
+    "sentence-transformers": lambda model_name: SentenceTransformerBackend(model_name),
+    "onnx": lambda model_name: OnnxBackend(model_name),
+    "onnx-int8": lambda model_name: OnnxBackend(model_name, SIMILARITY_ONNX_INT8_FILE),
+    "minilm": lambda model_name: SentenceTransformerBackend(MINILM_MODEL_NAME),  # A fixed model, whatever model_name is
+}
+
+def create_embedding_backend(name=SIMILARITY_BACKEND, model_name=SIMILARITY_MODEL_NAME):
+    """Instantiate a backend by its SIMILARITY_BACKEND name (not loaded yet)"""
+    if name not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {name} (choose from {', '.join(EMBEDDING_BACKENDS)})")
+    return EMBEDDING_BACKENDS[name](model_name)
@@ -0,0 +1,161 @@
+# Latency, throughput, memory and ATS-score parity of the embedding backends
+
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .chunking import chunk_text, pool_chunk_scores
+from .embedding_backends import create_embedding_backend
+from .roles import JOB_ROLES, role_comparison_text, standard_role_names
+
+def synthetic_resumes():
+    """One plain-text resume per standard role, built from the role catalogue"""
+    resumes = []
+    for role in standard_role_names():
+        info = JOB_ROLES[role]
+        resumes.append(
+            f"{role.upper()}\n\nSUMMARY\n{info['description']}\n\nEXPERIENCE\n"
+            + "\n".join(f"• Delivered {area.lower()} work that improved results by 20%" for area in info["experience_focus"])
+            + f"\n\nSKILLS\n{', '.join(info['key_skills'])}\n\nEDUCATION\nBachelor of Science, State University"
+        )
+    return resumes
+
+def load_corpus(input_dir=None, limit=50):
+    """Resume texts from input_dir (as the batch command reads them), or the synthetic set"""
+    if not input_dir:
+        return synthetic_resumes()
+    from .batch import iter_resume_paths, read_resumes
+    from .pdf import is_extraction_failure
+    paths = list(iter_resume_paths(input_dir))[:limit]
+    return [text for _, text in read_resumes(paths) if not is_extraction_failure(text)]
+
+def _measure_backend(backend_name, texts, batch_size):
+    """Benchmark one backend; runs in a fresh process so memory figures are not shared"""
+    from .similarity import cosine_similarity_matrix, current_rss_mb
+
+    rss_before = current_rss_mb()
+    backend = create_embedding_backend(backend_name)
+    start = time.perf_counter()
+    backend.load()
+    load_seconds = time.perf_counter() - start
+    backend.encode(["Warm-up sentence for the resume similarity model."])
+
+    # Latency of the interactive path: all chunks of one resume in one call
+    chunk_lists = [chunk_text(text) for text in texts]
+    latencies = []
+    for chunks in chunk_lists:
+        start = time.perf_counter()
+        backend.encode(chunks, batch_size=batch_size)
+        latencies.append(time.perf_counter() - start)
+
+    # Throughput of the batch path: every chunk of the corpus in one call
+    all_chunks = [chunk for chunks in chunk_lists for chunk in chunks]
+    start = time.perf_counter()
+    embeddings = backend.encode(all_chunks, batch_size=batch_size)
+    throughput = len(all_chunks) / (time.perf_counter() - start)
+
+    role_names = standard_role_names()
+    role_embeddings = backend.encode([role_comparison_text(role) for role in role_names])
+    chunk_scores = cosine_similarity_matrix(embeddings, role_embeddings)
+    bounds = np.cumsum([0] + [len(chunks) for chunks in chunk_lists])
+    ats_scores = [pool_chunk_scores(chunk_scores[start:end]).tolist() for start, end in zip(bounds[:-1], bounds[1:])]
+
+    return {
+        "backend": backend_name,
+        "model_name": backend.model_name,
+        "load_seconds": round(load_seconds, 3),
+        "latency_p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 2),
+        "latency_p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 2),
+        "chunks_per_second": round(throughput, 1),
+        "rss_mb": current_rss_mb(),
+        "rss_delta_mb": None if rss_before is None else round(current_rss_mb() - rss_before, 1),
+        "param_mb": backend.param_mb(),
+        "ats_scores": ats_scores,
+    }
+
+def compare_parity(reference, candidate, tolerance):
+    """ATS-score agreement of a candidate backend with the reference one"""
+    reference_scores = np.asarray(reference["ats_scores"])
+    candidate_scores = np.asarray(candidate["ats_scores"])
+    differences = np.abs(reference_scores - candidate_scores)
+    return {
+        "max_abs_diff": round(float(differences.max()), 4),
+        "mean_abs_diff": round(float(differences.mean()), 4),
+        "best_role_agreement": round(float(np.mean(reference_scores.argmax(axis=1) == candidate_scores.argmax(axis=1))), 3),
+        "within_tolerance": bool(differences.max() <= tolerance),
+    }
+
+def annotate_parity(results, tolerance):
+    """Add each result's parity with the first (reference) result.
+
+    Only backends running the reference's model must stay within tolerance.
+    Other models (e.g. minilm next to mpnet) are speed/quality alternatives:
+    their drift is reported with parity["same_model"] False but not enforced.
+    """
+    reference = results[0]
+    for result in results[1:]:
+        if "error" not in result and "error" not in reference:
+            result["parity"] = compare_parity(reference, result, tolerance)
+            result["parity"]["same_model"] = result["model_name"] == reference["model_name"]
+    return results
+
+def failed_backends(results):
+    """Results that errored, or that run the reference model but drift beyond the tolerance"""
+    return [
+        result for result in results
+        if "error" in result or (result.get("parity", {}).get("same_model") and not result["parity"]["within_tolerance"])
+    ]
+
+def run_benchmark(backend_names, texts, batch_size=32, tolerance=0.03):
+    """Benchmark each backend in its own process; the first one is the parity reference (see annotate_parity)"""
+    results = []
+    for backend_name in backend_names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            try:
+                results.append(executor.submit(_measure_backend, backend_name, texts, batch_size).result())
+            except Exception as e:
+                results.append({"backend": backend_name, "error": str(e)})
+
+    return annotate_parity(results, tolerance)
+
+def main(args):
+    """Entry point for `python -m resume_reviewer bench-embeddings`"""
+    texts = load_corpus(args.input, args.limit)
+    if not texts:
+        print("No resumes to benchmark", file=sys.stderr)
+        return 1
+
+    backend_names = [name.strip() for name in args.backends.split(",") if name.strip()]
+    results = run_benchmark(backend_names, texts, args.batch_size, args.tolerance)
+
+    print(f"{'backend':<22}{'load s':>8}{'p50 ms':>9}{'p95 ms':>9}{'chunks/s':>10}{'RSS MB':>9}{'max Δ':>8}{'best role':>10}  parity")
+    for result in results:
+        if "error" in result:
+            print(f"{result['backend']:<22}failed: {result['error']}")
+            continue
+        parity = result.get("parity", {})
+        print(
+            f"{result['backend']:<22}{result['load_seconds']:>8}{result['latency_p50_ms']:>9}{result['latency_p95_ms']:>9}"
+            f"{result['chunks_per_second']:>10}{result['rss_mb'] or '—':>9}"
+            f"{parity.get('max_abs_diff', 'ref'):>8}{parity.get('best_role_agreement', 'ref'):>10}  {_parity_label(parity)}"
+        )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as out:
+            json.dump([{key: value for key, value in result.items() if key != "ats_scores"} for result in results], out, indent=2)
+
+    failed = failed_backends(results)
+    for result in failed:
+        print(f"{result['backend']}: outside the ATS tolerance of {args.tolerance} or failed", file=sys.stderr)
+    return 1 if failed else 0
+
+def _parity_label(parity):
+    if not parity:
+        return "reference"
+    if not parity["same_model"]:
+        return "other model (not checked)"
+    return "ok" if parity["within_tolerance"] else "FAIL"
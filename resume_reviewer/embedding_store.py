@@ -0,0 +1,146 @@
+# Persistent on-disk cache of text embeddings (SQLite, float16 vectors)
+#
+# Embeddings are stored per chunk of text, keyed by the hash of the
+# whitespace-normalized text and the embedding model id, so re-submitted or
+# lightly edited resumes and job descriptions pasted by many applicants are
+# only encoded once, across sessions and restarts.
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from .roles import content_hash
+from .settings import EMBEDDING_CACHE_MAX_MB, EMBEDDING_CACHE_PATH, EMBEDDING_MODEL_ID
+
+logger = logging.getLogger(__name__)
+
+def embedding_key(text, model_id=EMBEDDING_MODEL_ID):
+    """Store key for a text's embedding under a model"""
+    return content_hash(model_id + "\0" + " ".join(text.split()))
+
+class EmbeddingStore:
+    """SQLite-backed embedding cache with least-recently-used eviction by total size"""
+
+    def __init__(self, path, max_bytes, model_id=EMBEDDING_MODEL_ID):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.model_id = model_id
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")  # Readers (other workers, the batch CLI) never block on writers
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, "
+            "vector BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._connection.commit()
+        self._size = self._total_size()
+
+    def _total_size(self):
+        return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+    def get_many(self, texts):
+        """{position: vector} for the texts already stored"""
+        keys = [embedding_key(text, self.model_id) for text in texts]
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit
+                batch = keys[start:start + 500]
+                rows = self._connection.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                found.update({key: np.frombuffer(vector, dtype=np.float16).reshape(dim) for key, dim, vector in rows})
+            if found:
+                now = time.time()
+                self._connection.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key in found])
+                self._connection.commit()
+        return {position: found[key].astype(np.float32) for position, key in enumerate(keys) if key in found}
+
+    def put_many(self, texts, vectors):
+        """Store embeddings for texts, evicting the least recently used ones beyond max_bytes"""
+        now = time.time()
+        rows = []
+        for text, vector in zip(texts, vectors):
+            blob = np.asarray(vector, dtype=np.float16).tobytes()
+            rows.append((embedding_key(text, self.model_id), self.model_id, len(vector), blob, len(blob), now))
+        with self._lock:
+            self._connection.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._connection.commit()
+            self._size += sum(row[4] for row in rows)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Other processes share the file, so recount before deciding how much to drop
+        self._size = self._total_size()
+        target = int(self.max_bytes * 0.9)
+        for key, size in self._connection.execute("SELECT key, size FROM embeddings ORDER BY last_used").fetchall():
+            if self._size <= target:
+                break
+            self._connection.execute("DELETE FROM embeddings WHERE key = ?", (key,))
+            self._size -= size
+        self._connection.commit()
+
+    def encode(self, texts, encode_missing):
+        """Embeddings for texts in order, calling encode_missing only for unique texts not yet stored"""
+        if not texts:
+            return encode_missing([])
+        try:
+            cached = self.get_many(texts)
+        except sqlite3.Error as e:
+            logger.warning("Could not read cached embeddings: %s", e)
+            cached = {}
+        missing = list(dict.fromkeys(texts[i] for i in range(len(texts)) if i not in cached))
+        self.hits += len(cached)
+        self.misses += len(texts) - len(cached)
+
+        encoded = {}
+        if missing:
+            vectors = np.asarray(encode_missing(missing), dtype=np.float32)
+            encoded = dict(zip(missing, vectors))
+            try:
+                self.put_many(missing, vectors)
+            except sqlite3.Error as e:
+                logger.warning("Could not store embeddings: %s", e)
+        return np.stack([cached[i] if i in cached else encoded[text] for i, text in enumerate(texts)])
+
+    def stats(self):
+        """Hit/miss counters (this process) and stored entries/size (all processes)"""
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "size_mb": round(self._size / 1024 ** 2, 2),
+            "max_mb": round(self.max_bytes / 1024 ** 2, 2),
+        }
+
+_embedding_store = None
+_embedding_store_lock = threading.Lock()
+
+def get_embedding_store():
+    """Process-wide embedding store, or None when disabled (EMBEDDING_CACHE_PATH empty) or unavailable"""
+    global _embedding_store
+    if not EMBEDDING_CACHE_PATH:
+        return None
+    with _embedding_store_lock:
+        if _embedding_store is None:
+            try:
+                _embedding_store = EmbeddingStore(EMBEDDING_CACHE_PATH, int(EMBEDDING_CACHE_MAX_MB * 1024 ** 2))
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Embedding cache disabled: %s", e)
+                return None
+        return _embedding_store
@@ -0,0 +1,162 @@
+# Local stand-in for the Groq chat completions API, for tests, benchmarks and load tests
+#
+# Point the app at it with GROQ_BASE_URL=http://127.0.0.1:<port> and any
+# GROQ_API_KEY. It returns a canned report (streamed or not) after a
+# configurable latency and can inject 429s with a retry-after header.
+
+import json
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+STUB_REPORT = """# 🎯 RESUME ANALYSIS REPORT
+
+## 📊 EXECUTIVE SCORECARD
+
+**OVERALL MATCH**: 73%
+
+```
+PERFORMANCE BREAKDOWN:
+├── Technical Skills : 8/10
+├── Experience       : 7/10
+├── Achievements     : 6/10
+├── Education        : 7/10
+├── ATS Optimization : 7/10
+└── Presentation     : 9/10
+```
+
+## 🔍 KEY FINDINGS
+
+### ✅ STRENGTHS
+- Solid technical foundation with relevant tools
+- Clear progression across roles
+- Consistent formatting
+
+### ⚠️ IMPROVEMENT AREAS
+- Quantify more achievements
+- Add role-specific keywords
+- Tighten the professional summary
+
+## ⚡ PRIORITY ACTION PLAN
+1. **Quantify impact**: Add metrics to the top three experience bullets
+2. **Keywords**: Mirror the job description's core skills in the skills section
+3. **Summary**: Lead with years of experience and the target role
+
+```json
+{"scores": {"technical_skills": 8, "experience": 7, "achievements": 6, "education": 7, "ats_optimization": 7, "presentation": 9}}
+```
+"""
+
+class StubGroqHandler(BaseHTTPRequestHandler):
+    """Serves chat completions from the server's canned report and options"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if self.path.rstrip("/") != CHAT_COMPLETIONS_PATH:
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        server = self.server
+        
+        with server.lock:
+            server.request_count += 1
+            request_number = server.request_count
+        if server.fail_every and request_number % server.fail_every == 0:
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached (stub)", "type": "tokens"}},
+                {"retry-after": str(server.retry_after)},
+            )
+            return
+        
+        time.sleep(server.latency)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = request.get("model", "stub")
+        if request.get("stream"):
+            self._stream(completion_id, model)
+        else:
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": server.report},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(server.report) // 4, "total_tokens": 0},
+            })
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, completion_id, model):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        
+        def send_event(data):
+            payload = f"data: {data}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(payload):x}\r\n".encode("ascii") + payload + b"\r\n")
+            self.wfile.flush()
+        
+        words = self.server.report.split(" ")
+        for i, word in enumerate(words):
+            send_event(json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": word if i == len(words) - 1 else word + " "},
+                    "finish_reason": None,
+                }],
+            }))
+            time.sleep(self.server.token_delay)
+        send_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+def start_stub_server(host="127.0.0.1", port=0, latency=0.0, token_delay=0.0, fail_every=0, retry_after=1.0, report=STUB_REPORT):
+    """Start a stub server in a daemon thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), StubGroqHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.latency = latency
+    server.token_delay = token_delay
+    server.fail_every = fail_every
+    server.retry_after = retry_after
+    server.report = report
+    threading.Thread(target=server.serve_forever, name="groq-stub", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main(args):
+    """Entry point for `python -m resume_reviewer stub-groq`"""
+    server, base_url = start_stub_server(
+        args.host, args.port, args.latency, args.token_delay, args.fail_every, args.retry_after
+    )
+    print(f"Stub Groq API listening on {base_url} (set GROQ_BASE_URL={base_url})", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
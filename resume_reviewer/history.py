@@ -0,0 +1,228 @@
+# Persistent history of analyses (SQLite, WAL), per user and resume revision
+#
+# Analyses the user chose to keep are recorded with the resume text, scores,
+# report and float16 resume and job vectors. Resubmitting identical inputs gets
+# the user's stored report back without calling the LLM, signed-in users get
+# their last analysis back on their next visit, and score trends over revisions
+# come from indexed queries instead of recomputation. Every query is scoped to
+# one user. Records expire after HISTORY_RETENTION_DAYS
+# and can be purged per user (see purge and `python -m resume_reviewer
+# history-purge`).
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+
+from .cache import analysis_cache_key
+from .roles import content_hash
+from .settings import HISTORY_DB_PATH, HISTORY_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLUMNS = "id, user_id, job_role, created_at, ats_score, overall_score, scores, scores_source, mode"
+
+def analysis_key(resume, job_role, custom_job_desc=""):
+    """Hash of analysis_cache_key: identical inputs under the same model, prompt and chunking versions"""
+    return content_hash("\0".join(str(part) for part in analysis_cache_key(resume, job_role, custom_job_desc)))
+
+def _vector_blob(vector):
+    return None if vector is None else np.asarray(vector, dtype=np.float16).tobytes()
+
+def _row_dict(cursor, row):
+    record = dict(zip([column[0] for column in cursor.description], row))
+    if "scores" in record:
+        record["scores"] = json.loads(record["scores"])
+    for name in ("resume_embedding", "job_embedding"):
+        if record.get(name) is not None:
+            record[name] = np.frombuffer(record[name], dtype=np.float16).astype(np.float32)
+    return record
+
+class HistoryStore:
+    """SQLite-backed analysis history, indexed by user, resume hash, role and time.
+
+    Records older than retention_days (0 keeps them) are purged when the store
+    opens and at most hourly while recording.
+    """
+
+    def __init__(self, path, retention_days=HISTORY_RETENTION_DAYS):
+        self.path = path
+        self.retention_days = retention_days
+        self.records = 0
+        self.reused = 0
+        self.purged = 0
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._connection.row_factory = _row_dict
+        self._connection.execute("PRAGMA journal_mode=WAL")  # App sessions, service workers and readers share the file
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            "id INTEGER PRIMARY KEY, user_id TEXT, resume_hash TEXT NOT NULL, analysis_key TEXT NOT NULL, "
+            "job_role TEXT NOT NULL, custom_job_desc TEXT NOT NULL, created_at REAL NOT NULL, "
+            "ats_score REAL NOT NULL, overall_score REAL NOT NULL, scores TEXT NOT NULL, scores_source TEXT NOT NULL, "
+            "mode TEXT, report TEXT NOT NULL, resume TEXT NOT NULL, resume_embedding BLOB, job_embedding BLOB)"
+        )
+        for statement in (
+            "CREATE INDEX IF NOT EXISTS analyses_user_role_time ON analyses (user_id, job_role, created_at)",
+            "CREATE INDEX IF NOT EXISTS analyses_user_time ON analyses (user_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS analyses_resume_time ON analyses (resume_hash, created_at)",
+            "CREATE INDEX IF NOT EXISTS analyses_user_key_time ON analyses (user_id, analysis_key, created_at)",
+            "CREATE INDEX IF NOT EXISTS analyses_role_time ON analyses (job_role, created_at)",
+            "CREATE INDEX IF NOT EXISTS analyses_time ON analyses (created_at)",
+        ):
+            self._connection.execute(statement)
+        self._connection.commit()
+        self.purge_expired()
+
+    def record(self, resume, custom_job_desc, result, user_id=None):
+        """Store an AnalysisResult; returns its history id"""
+        similarity = result.similarity
+        row = (
+            user_id,
+            content_hash(resume),
+            analysis_key(resume, result.job_role, custom_job_desc),
+            result.job_role,
+            custom_job_desc,
+            time.time(),
+            float(result.ats_score),
+            float(result.overall_percentage),
+            json.dumps(result.scores),
+            result.scores_source,
+            result.revision["mode"] if result.revision else None,
+            result.report,
+            resume,
+            None if similarity is None else _vector_blob(similarity.resume_embedding),
+            None if similarity is None else _vector_blob(similarity.job_embedding),
+        )
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO analyses (user_id, resume_hash, analysis_key, job_role, custom_job_desc, created_at, "
+                "ats_score, overall_score, scores, scores_source, mode, report, resume, resume_embedding, job_embedding) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            self._connection.commit()
+            self.records += 1
+            record_id = cursor.lastrowid
+        if time.time() - self._last_purge > 3600:
+            self.purge_expired()
+        return record_id
+
+    def purge(self, user_id=None, older_than_days=None):
+        """Delete a user's records and/or records older than older_than_days; returns the number deleted"""
+        if user_id is None and older_than_days is None:
+            raise ValueError("purge needs a user_id or older_than_days")
+        conditions, parameters = [], []
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            parameters.append(user_id)
+        if older_than_days is not None:
+            conditions.append("created_at < ?")
+            parameters.append(time.time() - older_than_days * 86400)
+        with self._lock:
+            deleted = self._connection.execute(f"DELETE FROM analyses WHERE {' AND '.join(conditions)}", parameters).rowcount
+            self._connection.commit()
+            self.purged += deleted
+        return deleted
+
+    def purge_expired(self):
+        """Delete records past the retention period; returns the number deleted"""
+        self._last_purge = time.time()
+        if not self.retention_days:
+            return 0
+        return self.purge(older_than_days=self.retention_days)
+
+    def find_report(self, user_id, resume, job_role, custom_job_desc=""):
+        """A user's latest full AI analysis of identical inputs, or None"""
+        with self._lock:
+            record = self._connection.execute(
+                f"SELECT {SUMMARY_COLUMNS}, report FROM analyses WHERE user_id = ? AND analysis_key = ? AND scores_source = 'llm' "
+                "AND (mode IS NULL OR mode != 'delta') ORDER BY created_at DESC LIMIT 1",
+                (user_id, analysis_key(resume, job_role, custom_job_desc)),
+            ).fetchone()
+            if record is not None:
+                self.reused += 1
+            return record
+
+    def latest(self, user_id):
+        """A user's most recent analysis, including the resume text and vectors, or None"""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT * FROM analyses WHERE user_id = ? ORDER BY created_at DESC LIMIT 1", (user_id,)
+            ).fetchone()
+
+    def recent(self, user_id, limit=20):
+        """Summaries (no report, resume or vectors) of a user's latest analyses, newest first"""
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM analyses WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
+                (user_id, limit),
+            ).fetchall()
+
+    def score_trend(self, user_id, job_role, limit=50):
+        """Summaries of a user's analyses for a role, oldest first (the latest limit of them)"""
+        with self._lock:
+            records = self._connection.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM analyses WHERE user_id = ? AND job_role = ? ORDER BY created_at DESC LIMIT ?",
+                (user_id, job_role, limit),
+            ).fetchall()
+        return records[::-1]
+
+    def resume_history(self, resume, limit=50):
+        """Summaries of every analysis of this exact resume text, newest first"""
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM analyses WHERE resume_hash = ? ORDER BY created_at DESC LIMIT ?",
+                (content_hash(resume), limit),
+            ).fetchall()
+
+    def stats(self):
+        """Recorded/reused/purged counters (this process) and stored analyses (all processes)"""
+        with self._lock:
+            record = self._connection.execute("SELECT COUNT(*) AS analyses, COUNT(DISTINCT user_id) AS users FROM analyses").fetchone()
+        return {
+            "records": self.records,
+            "reused": self.reused,
+            "purged": self.purged,
+            "analyses": record["analyses"],
+            "users": record["users"],
+        }
+
+_history_store = None
+_history_store_lock = threading.Lock()
+
+def get_history_store():
+    """Process-wide history store, or None when disabled (HISTORY_DB_PATH empty) or unavailable"""
+    global _history_store
+    if not HISTORY_DB_PATH:
+        return None
+    with _history_store_lock:
+        if _history_store is None:
+            try:
+                _history_store = HistoryStore(HISTORY_DB_PATH, HISTORY_RETENTION_DAYS)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Analysis history disabled: %s", e)
+                return None
+        return _history_store
+
+def main(args):
+    """Entry point for `python -m resume_reviewer history-purge`"""
+    store = get_history_store()
+    if store is None:
+        print("Analysis history is disabled (HISTORY_DB_PATH is empty) or unavailable", file=sys.stderr)
+        return 1
+    if args.user is None and args.older_than_days is None:
+        deleted = store.purge_expired()
+    else:
+        deleted = store.purge(args.user, args.older_than_days)
+    print(f"Deleted {deleted} analyses from {store.path}", file=sys.stderr)
+    return 0
@@ -0,0 +1,187 @@
+# Precompiled keyword matcher over every role's skills and keywords
+#
+# All key_skills, experience_focus and industry_keywords of the catalogue,
+# plus their aliases, are compiled into one alternation regex. A single scan
+# of the resume yields the canonical keywords it mentions, from which matched
+# and missing keywords are derived for every role at once.
+
+import re
+import threading
+
+from .roles import JOB_ROLES, role_catalogue_hash
+
+KEYWORD_FIELDS = ("key_skills", "experience_focus", "industry_keywords")
+
+# Canonical keyword (normalized) -> other names for the same thing that count as a mention.
+# Only true synonyms, spellings and abbreviations belong here: related tools and narrower
+# terms ("Git" for version control, "hiring" for recruitment) would inflate coverage.
+KEYWORD_ALIASES = {
+    "scikit learn": ["sklearn", "scikit"],
+    "machine learning": ["ML"],
+    "numpy": ["num py"],
+    "data visualization": ["data visualisation"],
+    "statistics": ["statistical analysis"],
+    "tensorflow": ["tensor flow"],
+    "a/b testing": ["AB testing", "A/B test", "split testing"],
+    "neural networks": ["neural net"],
+    "javascript": ["JS", "ECMAScript"],
+    "node.js": ["NodeJS"],
+    "react": ["React.js", "ReactJS"],
+    "c++": ["cpp"],
+    "aws": ["Amazon Web Services"],
+    "aws/azure/gcp": ["AWS", "Azure", "GCP", "Google Cloud", "Amazon Web Services"],
+    "ci/cd": ["continuous integration", "continuous delivery", "continuous deployment", "CI CD"],
+    "kubernetes": ["k8s"],
+    "version control": ["source control", "revision control"],
+    "api development": ["API design"],
+    "seo/sem": ["SEO", "SEM", "search engine optimization", "search engine marketing"],
+    "seo": ["search engine optimization"],
+    "sem": ["search engine marketing"],
+    "ppc advertising": ["PPC", "pay per click"],
+    "excel": ["Microsoft Excel", "MS Excel"],
+    "power bi": ["PowerBI"],
+    "customer relationship management": ["CRM"],
+    "user experience design": ["UX design"],
+    "user interface design": ["UI design"],
+    "hris": ["human resources information system"],
+    "recruitment": ["recruiting"],
+    "training & development": ["training and development", "L&D", "learning and development"],
+    "human resources": ["HR"],
+    "copywriting": ["copy writing"],
+}
+
+def normalize_keyword(keyword):
+    """Case- and spacing-insensitive form used as a keyword's identity"""
+    return " ".join(keyword.casefold().replace("-", " ").split())
+
+def _surface_pattern(surface):
+    # One- and two-letter terms ("R", "ML", "HR") only count in capitals, otherwise every "r" would match.
+    # A single letter must also end at whitespace, a comma or the end of the text, so "R&D" is not "R".
+    if len(surface) == 1:
+        return rf"(?-i:{re.escape(surface.upper())})(?=[\s,]|$)"
+    if len(surface) <= 2:
+        return f"(?-i:{re.escape(surface.upper())})"
+    # Spaces and hyphens are interchangeable; a trailing plural "s" is optional after a letter
+    words = [re.escape(word) for word in re.split(r"[\s\-]+", surface.strip()) if word]
+    pattern = r"[\s\-]+".join(words)
+    return pattern + "s?" if surface[-1:].isalpha() else pattern
+
+def _bounded(pattern):
+    # Lookarounds instead of \b so keywords such as "C++" and "Node.js" match at their edges
+    return rf"(?<!\w)(?:{pattern})(?!\w)"
+
+def _trie_pattern(node, leaves):
+    """Regex for a character trie, with an empty group marking each surface's end.
+
+    Shared prefixes are matched once, so the scan costs a few character
+    comparisons per position instead of one attempt per keyword. Surfaces
+    are appended to leaves in the order of their marker groups.
+    """
+    alternatives = []
+    for key in sorted(key for key in node if key):
+        step = r"[\s\-]+" if key == " " else re.escape(key)
+        alternatives.append(step + _trie_pattern(node[key], leaves))
+    if "" in node:
+        surface = node[""]
+        leaves.append(surface)
+        # Continuations come first so the longest keyword wins
+        alternatives.append("s?()" if surface[-1:].isalpha() else "()")
+    return alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+
+class KeywordIndex:
+    """One compiled matcher over the keywords of many roles"""
+
+    def __init__(self, roles):
+        self.roles = {
+            role: {field: list(info.get(field, [])) for field in KEYWORD_FIELDS}
+            for role, info in roles.items()
+        }
+        canonicals = {
+            normalize_keyword(keyword)
+            for fields in self.roles.values()
+            for keywords in fields.values()
+            for keyword in keywords
+        }
+
+        surfaces = {}
+        for canonical in canonicals:
+            surfaces.setdefault(canonical, set()).add(canonical)
+            for alias in KEYWORD_ALIASES.get(canonical, []):
+                surfaces.setdefault(normalize_keyword(alias), set()).add(canonical)
+
+        trie = {}
+        short_surfaces = []
+        for surface in surfaces:
+            if len(surface) <= 2:
+                short_surfaces.append(surface)
+                continue
+            node = trie
+            for char in surface:
+                node = node.setdefault(char, {})
+            node[""] = surface
+        leaves = []
+        alternatives = [_trie_pattern(trie, leaves)] if trie else []
+        for surface in short_surfaces:
+            alternatives.append(_surface_pattern(surface) + "()")
+            leaves.append(surface)
+        self._pattern = re.compile(_bounded("|".join(alternatives)), re.IGNORECASE) if leaves else None
+
+        # A long match hides the shorter keywords inside it ("SEO writing" also mentions "SEO"),
+        # so each surface also implies the keywords of every surface occurring within it.
+        # Abbreviations are left out: "js" inside "node.js" is not a mention of JavaScript.
+        surface_patterns = {
+            surface: re.compile(_bounded(_surface_pattern(surface)), re.IGNORECASE)
+            for surface in surfaces
+            if len(surface) > 2
+        }
+        self._implied = [
+            frozenset(surfaces[surface]).union(
+                canonical
+                for other, pattern in surface_patterns.items()
+                if pattern.search(surface)
+                for canonical in surfaces[other]
+            )
+            for surface in leaves
+        ]
+
+    def scan(self, text):
+        """Canonical keywords mentioned anywhere in text, in one pass"""
+        found = set()
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(text):
+            found |= self._implied[match.lastindex - 1]
+        return found
+
+    def match(self, text, role_names=None):
+        """Per-role matched and missing keywords for text.
+
+        Returns {role: {"matched": {field: [...]}, "missing": {field: [...]}, "coverage": float}}
+        where coverage is the share of the role's keywords found (None for roles without keywords).
+        """
+        found = self.scan(text)
+        results = {}
+        for role in role_names or self.roles:
+            matched, missing = {}, {}
+            for field, keywords in self.roles[role].items():
+                matched[field] = [keyword for keyword in keywords if normalize_keyword(keyword) in found]
+                missing[field] = [keyword for keyword in keywords if normalize_keyword(keyword) not in found]
+            total = sum(len(keywords) for keywords in self.roles[role].values())
+            found_count = sum(len(keywords) for keywords in matched.values())
+            results[role] = {
+                "matched": matched,
+                "missing": missing,
+                "coverage": found_count / total if total else None,
+            }
+        return results
+
+_keyword_indexes = {}
+_keyword_index_lock = threading.Lock()
+
+def get_keyword_index():
+    """Keyword index for the current catalogue, compiled once per process and catalogue hash"""
+    catalogue_hash = role_catalogue_hash()
+    with _keyword_index_lock:
+        if catalogue_hash not in _keyword_indexes:
+            _keyword_indexes[catalogue_hash] = KeywordIndex(JOB_ROLES)
+        return _keyword_indexes[catalogue_hash]
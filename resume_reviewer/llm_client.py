@@ -0,0 +1,153 @@
+# Shared Groq client with retries, backoff and client-side rate limiting
+#
+# One client (and with it one keep-alive HTTP connection pool) is reused for
+# every report. Each call first takes a request and its estimated tokens from
+# token buckets sized to the Groq tier, so bursts queue locally instead of
+# failing with 429. Transient failures are retried with jittered exponential
+# backoff, honouring the server's retry-after header when present. The groq
+# SDK (and httpx with it) is only imported when the first client is created.
+
+import logging
+import random
+import threading
+import time
+
+from .settings import (
+    GROQ_BACKOFF_BASE_SECONDS,
+    GROQ_BACKOFF_MAX_SECONDS,
+    GROQ_BASE_URL,
+    GROQ_MAX_CONNECTIONS,
+    GROQ_MAX_RETRIES,
+    GROQ_REQUESTS_PER_MINUTE,
+    GROQ_TIMEOUT_SECONDS,
+    GROQ_TOKENS_PER_MINUTE,
+)
+from .telemetry import get_telemetry
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute"""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate_per_second = rate_per_minute / 60
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def acquire(self, amount=1):
+        """Block until amount tokens are available and take them; returns seconds waited"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate_per_second
+            time.sleep(delay)
+            waited += delay
+
+_clients = {}
+_clients_lock = threading.Lock()
+_request_bucket = TokenBucket(GROQ_REQUESTS_PER_MINUTE) if GROQ_REQUESTS_PER_MINUTE > 0 else None
+_token_bucket = TokenBucket(GROQ_TOKENS_PER_MINUTE) if GROQ_TOKENS_PER_MINUTE > 0 else None
+_stats = {"calls": 0, "retries": 0, "failures": 0, "rate_limited_seconds": 0.0}
+_stats_lock = threading.Lock()
+
+def get_groq_client(api_key, base_url=GROQ_BASE_URL):
+    """Process-wide Groq client for an API key, with a keep-alive connection pool"""
+    import httpx
+    from groq import Groq
+    
+    with _clients_lock:
+        key = (api_key, base_url)
+        if key not in _clients:
+            _clients[key] = Groq(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=GROQ_TIMEOUT_SECONDS,
+                max_retries=0,  # Retries are handled by create_chat_completion
+                http_client=httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=GROQ_MAX_CONNECTIONS,
+                        max_keepalive_connections=GROQ_MAX_CONNECTIONS,
+                    ),
+                    timeout=GROQ_TIMEOUT_SECONDS,
+                ),
+            )
+        return _clients[key]
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token)"""
+    return len(text) // 4 + 1
+
+def _record(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+
+def get_llm_stats():
+    """Counters for calls, retries, failures and time spent waiting on the rate limiter"""
+    with _stats_lock:
+        return dict(_stats)
+
+get_telemetry().register_stats("llm", get_llm_stats)
+
+def record_token_usage(prompt_tokens, completion_tokens):
+    """Count tokens sent to and received from the LLM"""
+    get_telemetry().inc("llm_tokens", prompt_tokens, kind="prompt")
+    get_telemetry().inc("llm_tokens", completion_tokens, kind="completion")
+
+def _retry_delay(error, attempt):
+    """Seconds to wait before retrying after error, or None if it is not retryable"""
+    from groq import APIConnectionError, APIStatusError
+    
+    if isinstance(error, APIStatusError):
+        if error.status_code not in RETRYABLE_STATUS_CODES:
+            return None
+        retry_after = error.response.headers.get("retry-after")
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), GROQ_BACKOFF_MAX_SECONDS)
+        except ValueError:
+            pass
+    elif not isinstance(error, APIConnectionError):
+        return None
+    # Full jitter keeps many workers that failed together from retrying in lockstep
+    return random.uniform(0, min(GROQ_BACKOFF_MAX_SECONDS, GROQ_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+def create_chat_completion(api_key, messages, max_tokens, **kwargs):
+    """chat.completions.create on the shared client, rate limited and retried on transient errors"""
+    client = get_groq_client(api_key)
+    estimated = sum(estimate_tokens(message["content"]) for message in messages) + max_tokens
+    _record("calls")
+    for attempt in range(GROQ_MAX_RETRIES + 1):
+        if _request_bucket is not None:
+            _record("rate_limited_seconds", _request_bucket.acquire())
+        if _token_bucket is not None:
+            _record("rate_limited_seconds", _token_bucket.acquire(estimated))
+        try:
+            response = client.chat.completions.create(messages=messages, max_tokens=max_tokens, **kwargs)
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt == GROQ_MAX_RETRIES:
+                _record("failures")
+                raise
+            logger.warning("Groq call failed (%s); retrying in %.1fs", e, delay)
+            _record("retries")
+            time.sleep(delay)
+            continue
+        
+        usage = getattr(response, "usage", None)
+        if usage is not None and not kwargs.get("stream"):  # Streamed reports count their own tokens
+            record_token_usage(usage.prompt_tokens or 0, usage.completion_tokens or 0)
+        return response
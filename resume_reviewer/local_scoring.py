@@ -0,0 +1,129 @@
+# Deterministic local scoring from the role catalogue, keywords and document structure
+#
+# Produces the same six category scores as the LLM report in milliseconds and
+# without network access. It is shown as a preliminary dashboard while the
+# report streams, and as the full result when Groq is unavailable.
+
+import re
+
+from .keywords import get_keyword_index
+from .scoring import SCORE_CATEGORIES
+
+# One alternation with a named group per section, so detection is a single scan of the text
+SECTION_PATTERN = re.compile(
+    r"(?P<experience>\b(?:experience|work history|employment)\b)"
+    r"|(?P<education>\beducation\b)"
+    r"|(?P<skills>\b(?:skills?|technical|competenc\w*)\b)"
+    r"|(?P<summary>\b(?:summary|objective|profile)\b)"
+    r"|(?P<contact>[\w.+-]+@[\w-]+\.[\w.]+|\b(?:phone|linkedin)\b)",
+    re.IGNORECASE,
+)
+SECTION_NAMES = ("experience", "education", "skills", "summary", "contact")
+QUANTIFIED = re.compile(
+    r"(\d[\d,.]*\s*(%|percent\b|x\b|\+|k\b|m\b|million\b|billion\b|users\b|customers\b|clients\b))|([$€£₹]\s?\d)",
+    re.IGNORECASE,
+)
+YEARS_OF_EXPERIENCE = re.compile(r"\b\d{1,2}\+?\s*(years?|yrs?)\b", re.IGNORECASE)
+DEGREE = re.compile(r"\b(bachelor|master|ph\.?d|mba|b\.?s\.?c?|m\.?s\.?c?|b\.?tech|m\.?tech|b\.?e|degree|diploma|university|college)\b", re.IGNORECASE)
+BULLET = re.compile(r"^\s*[•▪●◦\-\*–]\s+", re.MULTILINE)
+
+def detect_sections(text):
+    """Names of the standard resume sections found in text"""
+    found = {match.lastgroup for match in SECTION_PATTERN.finditer(text)}
+    return [name for name in SECTION_NAMES if name in found]
+
+def count_quantified_achievements(text):
+    """Number of lines containing a quantified result (percentages, money, counts, multipliers)"""
+    return sum(1 for line in text.splitlines() if QUANTIFIED.search(line))
+
+def _ratio(matched, missing):
+    return len(matched) / (len(matched) + len(missing)) if matched or missing else None
+
+def _clamp(value):
+    return max(0.0, min(10.0, value))
+
+def score_resume_locally(resume, job_role, ats_score=None, keyword_match=None):
+    """Six category scores (out of 5) plus the evidence behind them.
+
+    Keyword coverage uses the role's key_skills, experience_focus and
+    industry_keywords. When the role has no keywords (Custom Role), the
+    embedding similarity ats_score stands in for coverage. keyword_match is
+    the role's entry from KeywordIndex.match, if the caller already has it.
+    """
+    if keyword_match is None:
+        index = get_keyword_index()
+        keyword_match = index.match(resume, [job_role])[job_role] if job_role in index.roles else None
+    matched = keyword_match["matched"] if keyword_match else {}
+    missing = keyword_match["missing"] if keyword_match else {}
+    skills_matched, skills_missing = matched.get("key_skills", []), missing.get("key_skills", [])
+    focus_matched, focus_missing = matched.get("experience_focus", []), missing.get("experience_focus", [])
+    industry_matched, industry_missing = matched.get("industry_keywords", []), missing.get("industry_keywords", [])
+    
+    similarity = ats_score if ats_score is not None else 0.5
+    skills_ratio = _ratio(skills_matched, skills_missing)
+    focus_ratio = _ratio(focus_matched, focus_missing)
+    industry_ratio = _ratio(industry_matched, industry_missing)
+    skills_ratio = similarity if skills_ratio is None else skills_ratio
+    focus_ratio = similarity if focus_ratio is None else focus_ratio
+    industry_ratio = similarity if industry_ratio is None else industry_ratio
+    
+    sections = detect_sections(resume)
+    achievements = count_quantified_achievements(resume)
+    words = len(resume.split())
+    bullets = len(BULLET.findall(resume))
+    has_years = bool(YEARS_OF_EXPERIENCE.search(resume))
+    degree_found = bool(DEGREE.search(resume))
+    
+    # Each score is on the LLM's 0-10 scale, then halved like validate_category_scores does
+    raw_scores = {
+        "technical_skills": 2 + 8 * min(1.0, skills_ratio / 0.7),
+        "experience": 2 * ("experience" in sections) + 6 * min(1.0, focus_ratio / 0.6) + 2 * has_years,
+        "achievements": 1 + 1.8 * min(achievements, 5),
+        "education": 3 * ("education" in sections) + 5 * degree_found + 2 * (words >= 150),
+        "ats_optimization": 4 * min(1.0, industry_ratio / 0.6) + 4 * min(1.0, similarity / 0.7) + 0.4 * len(sections),
+        "presentation": 1.2 * len(sections) + 2 * (bullets >= 5) + 2 * (300 <= words <= 1200),
+    }
+    scores = {label: round(_clamp(raw_scores[key]) / 2, 2) for key, label in SCORE_CATEGORIES}
+    return {
+        "scores": scores,
+        "details": {
+            "matched_skills": skills_matched,
+            "missing_skills": skills_missing,
+            "matched_focus": focus_matched,
+            "missing_focus": focus_missing,
+            "matched_keywords": industry_matched,
+            "missing_keywords": industry_missing,
+            "sections": sections,
+            "quantified_achievements": achievements,
+            "word_count": words,
+        },
+    }
+
+def render_local_report(job_role, local_result):
+    """Short markdown summary of a local scoring result, for offline mode"""
+    details = local_result["details"]
+    
+    def listing(items):
+        return ", ".join(items) if items else "—"
+    
+    return f"""## ⚡ Offline Analysis for {job_role}
+
+*Generated locally from keyword coverage, resume structure and semantic similarity. Connect a Groq API key for the full AI report.*
+
+### 🎯 Skills
+- **Matched**: {listing(details['matched_skills'])}
+- **Missing**: {listing(details['missing_skills'])}
+
+### 💼 Experience Focus
+- **Matched**: {listing(details['matched_focus'])}
+- **Missing**: {listing(details['missing_focus'])}
+
+### 🔑 Industry Keywords
+- **Matched**: {listing(details['matched_keywords'])}
+- **Missing**: {listing(details['missing_keywords'])}
+
+### 📋 Structure
+- **Sections detected**: {listing(details['sections'])}
+- **Quantified achievements**: {details['quantified_achievements']} lines
+- **Length**: {details['word_count']} words
+"""
@@ -0,0 +1,274 @@
+# PDF text extraction
+#
+# Documents are parsed straight from memory (or their path) page by page; no
+# temporary files are written. Results are cached by the SHA-256 of the PDF
+# bytes, so an identical file is only parsed once per process (and, with
+# PDF_TEXT_CACHE_DIR set, once across restarts). pdfminer is pure Python and CPU-bound, so
+# documents are parsed in a bounded set of worker processes, one single-process
+# executor per worker, fed by a small dispatcher thread pool. Each document gets
+# a page cap and a timeout that starts when a worker picks it up, so documents
+# queued behind slow PDFs keep their full budget. A document that times out or
+# is cancelled while running has only its own worker process killed and
+# replaced; a queued one is just dropped.
+
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .cache import LRUCache
+from .settings import (
+    PDF_EXTRACTION_TIMEOUT_SECONDS,
+    PDF_EXTRACTION_WORKERS,
+    PDF_MAX_PAGES,
+    PDF_TEXT_CACHE_DIR,
+    PDF_TEXT_CACHE_MAX_CHARS,
+    PDF_TEXT_CACHE_MAX_ENTRIES,
+)
+from .telemetry import get_telemetry, trace
+
+logger = logging.getLogger(__name__)
+
+NO_TEXT_WARNING = "Warning: No text could be extracted from this PDF. Please ensure your PDF contains selectable text."
+EXTRACTION_ERROR = "Could not extract text from the PDF file. Please try with a different PDF."
+EXTRACTION_TIMEOUT = "Could not extract text from the PDF file in time. Please try a smaller or simpler PDF."
+EXTRACTION_CANCELLED = "PDF extraction was cancelled."
+
+_pool = None  # Dispatcher threads, one per worker process
+_slots = None  # Queue of idle single-process executors
+_pool_lock = threading.Lock()
+_text_cache = LRUCache(
+    PDF_TEXT_CACHE_MAX_ENTRIES,
+    max_size=PDF_TEXT_CACHE_MAX_CHARS,
+    sizeof=lambda pages: sum(len(page) for page in pages),
+)
+
+def get_pdf_text_cache():
+    """Process-wide cache of extracted pages, keyed by (SHA-256 of the PDF, page cap)"""
+    return _text_cache
+
+get_telemetry().register_stats("pdf_text_cache", _text_cache.stats)
+
+def _disk_cache_path(cache_key):
+    return os.path.join(PDF_TEXT_CACHE_DIR, f"{cache_key[0]}_{cache_key[1]}.json")
+
+def _load_cached_pages(cache_key):
+    pages = _text_cache.get(cache_key)
+    if pages is None and PDF_TEXT_CACHE_DIR:
+        try:
+            with open(_disk_cache_path(cache_key), encoding="utf-8") as cache_file:
+                pages = json.load(cache_file)
+            _text_cache.put(cache_key, pages)
+        except (OSError, ValueError):
+            pages = None
+    return pages
+
+def _store_cached_pages(cache_key, pages):
+    _text_cache.put(cache_key, pages)
+    if PDF_TEXT_CACHE_DIR:
+        path = _disk_cache_path(cache_key)
+        try:
+            os.makedirs(PDF_TEXT_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(pages, cache_file, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not persist extracted PDF text: %s", e)
+
+def _new_slot():
+    return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+def _kill_slot(slot):
+    """Terminate a slot's worker process; ProcessPoolExecutor has no way to cancel a running task"""
+    for process in list((getattr(slot, "_processes", None) or {}).values()):
+        process.terminate()
+    slot.shutdown(wait=False, cancel_futures=True)
+
+def get_extraction_pool():
+    """Process-wide dispatcher that runs PdfExtractionJobs on the extraction worker processes"""
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None:
+            workers = max(1, PDF_EXTRACTION_WORKERS)
+            _slots = queue.Queue()
+            for _ in range(workers):
+                _slots.put(_new_slot())
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-extraction")
+        return _pool
+
+def _run_on_slot(job, slots):
+    # Runs in a dispatcher thread: wait for an idle worker process, then give the document its timeout
+    slot = slots.get()
+    healthy = True
+    try:
+        job.slot = slot
+        if job.cancelled:
+            raise CancelledError
+        future = slot.submit(_extract_pages_worker, job.source, job.max_pages)
+        try:
+            return future.result(timeout=job.timeout)
+        except TimeoutError:
+            healthy = False
+            _kill_slot(slot)
+            raise
+    except BrokenProcessPool:
+        healthy = False  # The worker died or was killed by job.cancel()
+        if job.cancelled:
+            raise CancelledError
+        raise
+    finally:
+        job.slot = None
+        slots.put(slot if healthy else _new_slot())
+
+def shutdown_extraction_pool():
+    """Stop the extraction workers; needed before a process that is itself a pool worker can exit"""
+    global _pool, _slots
+    with _pool_lock:
+        pool, slots, _pool, _slots = _pool, _slots, None, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+        while not slots.empty():
+            slots.get().shutdown(wait=True, cancel_futures=True)
+
+def _open_pdf(source):
+    """Binary file object for PDF bytes, an uploaded file or a path on disk"""
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, "rb")
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return io.BytesIO(source.getvalue())
+
+def iter_pdf_pages(source, max_pages=PDF_MAX_PAGES):
+    """Yield the text of each page in turn; stops after max_pages (0 means all).
+
+    source may be PDF bytes, an uploaded file or a path. Nothing is written to
+    disk, and callers can stop iterating early to skip the remaining pages.
+    Joining the pages gives the same text as pdfminer's extract_text.
+    """
+    # pdfminer is only needed where PDFs are parsed, usually the pool's worker processes
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    
+    with _open_pdf(source) as fp:
+        resource_manager = PDFResourceManager(caching=True)
+        output = io.StringIO()
+        with TextConverter(resource_manager, output, laparams=LAParams()) as device:
+            interpreter = PDFPageInterpreter(resource_manager, device)
+            for page in PDFPage.get_pages(fp, maxpages=max_pages, caching=True):
+                interpreter.process_page(page)
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+
+def _extract_pages_worker(source, max_pages):
+    return list(iter_pdf_pages(source, max_pages))
+
+class PdfExtractionJob:
+    """A PDF queued for extraction on a worker process (or already answered from the cache).
+
+    timeout counts from when a worker process starts parsing the document.
+    """
+
+    def __init__(self, source, max_pages, cache_key=None, pages=None, timeout=PDF_EXTRACTION_TIMEOUT_SECONDS):
+        self.source = source
+        self.max_pages = max_pages
+        self.cache_key = cache_key
+        self.pages = pages
+        self.timeout = timeout
+        self.from_cache = pages is not None
+        self.submitted_at = time.perf_counter()
+        self.cancelled = False
+        self.slot = None  # Executor of the worker process parsing this document, while it runs
+        self.future = None
+        if pages is None:
+            pool = get_extraction_pool()
+            self.future = pool.submit(_run_on_slot, self, _slots)
+
+    def cancel(self):
+        """Stop the job; a running parse is stopped by killing (and replacing) its worker process only"""
+        self.cancelled = True
+        if self.future is None or self.future.done() or self.future.cancel():
+            return
+        slot = self.slot
+        if slot is not None:
+            _kill_slot(slot)
+
+    def result(self, on_wait=None, poll_interval=0.25):
+        """Extracted text, or one of the warning/error messages.
+
+        on_wait, if given, is called every poll_interval seconds while waiting.
+        Any exception it raises (e.g. Streamlit stopping the script because the
+        form was cleared) cancels the job before propagating. The time from
+        submission to the answer is traced as the pdf_extraction stage.
+        """
+        with trace("pdf_extraction") as span:
+            span["start"] = self.submitted_at
+            text = self._result(on_wait, poll_interval)
+            span["error"] = is_extraction_failure(text)
+        return text
+
+    def _result(self, on_wait, poll_interval):
+        if self.pages is None:
+            try:
+                while not wait([self.future], timeout=poll_interval if on_wait else None, return_when=FIRST_COMPLETED)[0]:
+                    on_wait()
+                self.pages = self.future.result()
+            except TimeoutError:
+                logger.warning("PDF extraction timed out after %ss", self.timeout)
+                return EXTRACTION_TIMEOUT
+            except CancelledError:
+                return EXTRACTION_CANCELLED
+            except Exception as e:
+                logger.error("Error extracting text from PDF: %s", e)
+                return EXTRACTION_CANCELLED if self.cancelled else EXTRACTION_ERROR
+            except BaseException:
+                self.cancel()
+                raise
+            
+            if self.cache_key is not None:
+                _store_cached_pages(self.cache_key, self.pages)
+        
+        extracted_text = "".join(self.pages)
+        if not extracted_text.strip():
+            return NO_TEXT_WARNING
+        
+        return extracted_text
+
+def submit_pdf_extraction(source, max_pages=PDF_MAX_PAGES, timeout=PDF_EXTRACTION_TIMEOUT_SECONDS):
+    """Queue PDF bytes (or any bytes-like object), an uploaded file or a path on disk for extraction, unless its text is cached"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as pdf_file:
+            digest = hashlib.sha256(pdf_file.read()).hexdigest()
+    else:
+        if isinstance(source, (bytearray, memoryview)):
+            source = bytes(source)
+        elif not isinstance(source, bytes):
+            source = source.getvalue()
+        digest = hashlib.sha256(source).hexdigest()
+    
+    cache_key = (digest, max_pages)
+    pages = _load_cached_pages(cache_key)
+    return PdfExtractionJob(source, max_pages, cache_key, pages, timeout)
+
+def extract_pdf_text(source, timeout=PDF_EXTRACTION_TIMEOUT_SECONDS, max_pages=PDF_MAX_PAGES):
+    """Extract text from an uploaded PDF file or a path on disk"""
+    try:
+        job = submit_pdf_extraction(source, max_pages, timeout)
+    except Exception as e:
+        logger.error("Error extracting text from PDF: %s", e)
+        return EXTRACTION_ERROR
+    return job.result()
+
+def is_extraction_failure(text):
+    """True if text is one of the extraction warning/error messages"""
+    return text in (NO_TEXT_WARNING, EXTRACTION_ERROR, EXTRACTION_TIMEOUT, EXTRACTION_CANCELLED)
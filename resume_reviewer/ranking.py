@@ -0,0 +1,86 @@
+# Best-fit role ranking across the whole catalogue from a single resume encode
+
+import logging
+
+import numpy as np
+
+from .cache import LRUCache
+from .chunking import chunk_text, mean_pooled_embedding, pool_chunk_scores
+from .keywords import get_keyword_index
+from .roles import content_hash, standard_role_names
+from .settings import CHUNKING_VERSION, EMBEDDING_MODEL_ID, RANKING_KEYWORD_WEIGHT, RANKING_TOP_N
+from .similarity import encode_cached, get_role_embedding_index, load_similarity_model
+
+logger = logging.getLogger(__name__)
+
+# Saved job descriptions are ranked on every run, so their pooled embeddings are kept
+_job_desc_embeddings = LRUCache(max_entries=128)
+
+def job_description_embedding(job_desc):
+    """Mean-pooled embedding of a job description, cached by content"""
+    key = (content_hash(job_desc), EMBEDDING_MODEL_ID, CHUNKING_VERSION)
+    embedding = _job_desc_embeddings.get(key)
+    if embedding is None:
+        embedding = mean_pooled_embedding(encode_cached(chunk_text(job_desc)))
+        _job_desc_embeddings.put(key, embedding)
+    return embedding
+
+def rank_roles(resume, custom_job_descs=None, top_n=RANKING_TOP_N, keyword_weight=RANKING_KEYWORD_WEIGHT, resume_chunk_embeddings=None):
+    """Rank every standard role and saved custom job description for a resume, best first.
+
+    The resume is chunked and encoded once; one cosine matrix against the role
+    embedding matrix (plus any custom job descriptions) gives every semantic
+    score, which is blended with keyword coverage from the keyword index. For
+    custom job descriptions, coverage is the share of catalogue keywords named
+    in the description that the resume also mentions. Returns up to top_n dicts
+    with role, job_desc, similarity, keyword_coverage and score; similarity is
+    None when the model is unavailable, and the ranking falls back to keywords.
+    Pass resume_chunk_embeddings (e.g. from a SimilarityResult) to skip encoding.
+    """
+    custom_job_descs = {name: text for name, text in (custom_job_descs or {}).items() if text.strip()}
+    role_names = standard_role_names()
+    # (name, job description) per target: a saved description may share a standard role's name
+    targets = [(name, "") for name in role_names] + list(custom_job_descs.items())
+    
+    keyword_index = get_keyword_index()
+    resume_keywords = keyword_index.scan(resume)
+    role_coverage = keyword_index.match(resume, role_names)
+    coverage = [role_coverage[name]["coverage"] for name in role_names]
+    for job_desc in custom_job_descs.values():
+        job_keywords = keyword_index.scan(job_desc)
+        coverage.append(len(job_keywords & resume_keywords) / len(job_keywords) if job_keywords else None)
+    
+    similarity = [None] * len(targets)
+    model = load_similarity_model()
+    role_index = get_role_embedding_index() if model is not None else None
+    if role_index is not None:
+        try:
+            target_matrix = role_index.matrix(role_names)
+            if custom_job_descs:
+                target_matrix = np.vstack([target_matrix] + [
+                    job_description_embedding(job_desc) for job_desc in custom_job_descs.values()
+                ])
+            if resume_chunk_embeddings is None:
+                resume_chunk_embeddings = encode_cached(chunk_text(resume))
+            chunk_scores = resume_chunk_embeddings @ target_matrix.T  # Both sides are unit length
+            similarity = [round(float(score), 3) for score in pool_chunk_scores(chunk_scores)]
+        except Exception as e:
+            logger.error("Error ranking roles by similarity: %s", e)
+    
+    ranking = []
+    for (name, job_desc), semantic, keywords in zip(targets, similarity, coverage):
+        if semantic is None:
+            score = keywords or 0.0
+        elif keywords is None:
+            score = semantic
+        else:
+            score = (1 - keyword_weight) * semantic + keyword_weight * keywords
+        ranking.append({
+            "role": name,
+            "job_desc": job_desc,
+            "similarity": semantic,
+            "keyword_coverage": None if keywords is None else round(keywords, 3),
+            "score": round(score, 3),
+        })
+    ranking.sort(key=lambda entry: entry["score"], reverse=True)
+    return ranking[:top_n] if top_n else ranking
@@ -0,0 +1,398 @@
+# LLM report generation
+#
+# The model writes the markdown narrative followed by a fenced JSON block of
+# named category scores. The narrative streams to the user; the JSON block is
+# held back, validated, and repaired with one small JSON-mode call if invalid.
+
+import json
+import logging
+import time
+from datetime import datetime
+
+from .compaction import compact_resume
+from .llm_client import create_chat_completion, estimate_tokens, record_token_usage
+from .roles import JOB_ROLES
+from .scoring import SCORE_CATEGORIES, validate_category_scores
+from .settings import GROQ_API_KEY, LLM_MODEL_NAME
+from .telemetry import get_telemetry, trace
+
+logger = logging.getLogger(__name__)
+
+MISSING_KEY_ERROR = "❌ Error: GROQ_API_KEY not found. Please check your .env file."
+SCORES_FENCE = "```json"
+SCORES_SCHEMA = json.dumps({"scores": {key: "<number 0-10>" for key, _ in SCORE_CATEGORIES}})
+# The narrative scorecard lists the same categories as the scores block, so the report and the dashboard agree
+SCORECARD = "\n".join(
+    f"{'└──' if position == len(SCORE_CATEGORIES) - 1 else '├──'} {label:<17}: [X]/10 ⭐⭐⭐⭐⭐⭐⭐⭐⚪⚪"
+    for position, (_, label) in enumerate(SCORE_CATEGORIES)
+)
+
+def build_report_prompt(resume, job_role, custom_job_desc=""):
+    """Build the report prompt for a resume, role and optional custom job description"""
+    # Get job role context
+    role_context = ""
+    if job_role in JOB_ROLES and job_role != "Custom Role":
+        role_info = JOB_ROLES[job_role]
+        role_context = f"""
+**🎯 TARGET ROLE**: {job_role}
+**Key Skills**: {', '.join(role_info['key_skills'][:8])}
+**Focus Areas**: {', '.join(role_info.get('experience_focus', [])[:4])}
+"""
+
+    # Determine which job description to use
+    if custom_job_desc.strip():
+        # Use custom job description if provided
+        job_desc = custom_job_desc.strip()
+        job_source = "custom job description provided by user"
+    elif job_role in JOB_ROLES and job_role != "Custom Role":
+        # Use standard job description
+        role_info = JOB_ROLES[job_role]
+        job_desc = f"""We are seeking a skilled {job_role} with 3+ years experience in: {', '.join(role_info['key_skills'][:8])}. Strong proficiency in: {', '.join(role_info.get('experience_focus', [])[:5])}."""
+        job_source = f"standard {job_role} requirements"
+    else:
+        job_desc = "General professional role requiring relevant experience and skills."
+        job_source = "general professional requirements"
+
+    prompt = f"""
+You are an expert AI Career Consultant. Create a CONCISE, PROFESSIONAL resume analysis report with creative visual elements. Keep it focused and actionable - maximum 800 words total.
+
+{role_context}
+
+# 🎯 RESUME ANALYSIS REPORT
+**Target Position**: {job_role} | **Analysis Date**: {datetime.now().strftime('%B %d, %Y')}
+
+---
+
+## 📊 EXECUTIVE SCORECARD
+
+**OVERALL MATCH**: [average of the {len(SCORE_CATEGORIES)} scores below x 10]%
+
+```
+PERFORMANCE BREAKDOWN:
+{SCORECARD}
+```
+
+**🏆 COMPETITIVE POSITION**: [Strong Candidate/Needs Development/Excellent Match]
+
+---
+
+## 🔍 KEY FINDINGS
+
+### ✅ STRENGTHS
+- [Top 3 specific strengths with examples]
+
+### ⚠️ IMPROVEMENT AREAS  
+- [Top 3 specific areas needing attention]
+
+### 📈 MARKET POSITION
+- [1-2 sentences on competitive positioning for {job_role}]
+
+---
+
+## ⚡ PRIORITY ACTION PLAN
+
+### 🔥 IMMEDIATE WINS (24-48 Hours)
+1. **[SPECIFIC ACTION]**: Add quantified result - "Increased [metric] by X%"
+   - **Location**: Experience section, [specific bullet]
+   - **Impact**: +[X]% match improvement
+
+2. **[SPECIFIC ACTION]**: Include keywords: "[skill1], [skill2], [skill3]"
+   - **Location**: Skills section & summary
+   - **Impact**: +[X]% ATS score
+
+3. **[SPECIFIC ACTION]**: Enhance summary with: "[specific language]"
+   - **Location**: Top of resume
+   - **Impact**: Stronger first impression
+
+### 📋 CONTENT OPTIMIZATION
+```
+SKILLS UPGRADE:
+├── ADD: [3-4 missing {job_role} skills]
+├── REMOVE: [2-3 outdated skills]
+└── REORGANIZE: [Priority order for {job_role}]
+
+EXPERIENCE ENHANCEMENT:
+├── QUANTIFY: [Add specific numbers/percentages]
+├── CONTEXTUALIZE: [Include project scope]  
+└── IMPACT: [Connect to business outcomes]
+```
+
+---
+
+## 🎯 SUCCESS METRICS
+
+**TARGET IMPROVEMENTS:**
+- ATS Score: 75%+ (Current: [X]%)
+- Interview Rate: +25% improvement expected
+- Response Time: <2 weeks average
+
+**📅 IMPLEMENTATION TIMELINE:**
+- Week 1: Complete all Priority Actions
+- Week 2: Content optimization & formatting
+- Week 3: Test optimized resume with 5+ applications
+
+---
+
+## 💡 {job_role.upper()} SPECIFIC INSIGHTS
+
+**🔑 KEY SUCCESS FACTORS:**
+- [2-3 most important elements for {job_role} success]
+
+**📈 MARKET TRENDS:**
+- [1-2 current trends affecting {job_role} hiring]
+
+**🚀 COMPETITIVE EDGE:**
+- [Unique positioning strategy for {job_role}]
+
+---
+
+**⚡ QUICK WIN SUMMARY:** Focus on quantifying achievements, adding {job_role} keywords, and optimizing for ATS compatibility. Expected results: 25-30% improvement in application success rate.
+
+---
+
+# ANALYSIS INPUTS:
+**Target Role**: {job_role}
+**Resume Content**: {resume}
+**Job Requirements**: {job_desc}
+
+IMPORTANT: 
+- Keep total response under 800 words
+- Use REAL numbers for all scoring (X/10, X%)
+- The scorecard must show exactly the scores of the JSON block below
+- Include SPECIFIC, actionable recommendations
+- Create VISUAL text elements (progress bars, trees, checklists)
+- Focus on highest-impact improvements
+- Include role-specific insights for {job_role}
+- Use engaging, professional language
+- After the report, end with a {SCORES_FENCE} fenced block containing ONLY this JSON object with your real scores, and nothing after it:
+{SCORES_SCHEMA}
+"""
+    return prompt
+
+def build_delta_prompt(diff, previous_scores, job_role, custom_job_desc=""):
+    """Prompt reviewing only what changed since the previous analysis (see revisions.diff_resumes)"""
+    changes = []
+    for section in diff["sections"]:
+        if section["status"] == "removed":
+            changes.append(f"### {section['title']} (section removed)")
+        else:
+            changes.append(f"### {section['title']} ({section['status']} section, full current text)\n{section['text'].strip()}")
+        if section["status"] == "changed":
+            changes.append("Added or rewritten lines:\n" + "\n".join(f"+ {line}" for line in section["added"]))
+        if section["removed"]:
+            changes.append("Removed lines:\n" + "\n".join(f"- {line}" for line in section["removed"]))
+    previous = json.dumps({"scores": {key: round(previous_scores[label] * 2, 1) for key, label in SCORE_CATEGORIES if label in previous_scores}})
+    job_context = f"\n**Job Requirements**: {custom_job_desc.strip()}" if custom_job_desc.strip() else ""
+
+    return f"""
+You are an expert AI Career Consultant. The candidate revised a resume you already reviewed for the **{job_role}** role. Only the changed sections are shown below. Write a SHORT delta review - maximum 250 words - in markdown:
+
+## ♻️ REVISION REVIEW
+### ✅ WHAT IMPROVED
+- [Specific changes that strengthen the resume for {job_role}]
+
+### ⚠️ WHAT GOT WORSE OR IS STILL MISSING
+- [Regressions or gaps the changes did not address]
+
+### ⚡ NEXT STEP
+1. **[SPECIFIC ACTION]**: [the single highest-impact edit to make next]
+
+# REVISION INPUTS:
+**Target Role**: {job_role}{job_context}
+**Previous Scores (0-10)**: {previous}
+**Changes**:
+{chr(10).join(changes)}
+
+IMPORTANT:
+- Review only these changes; do not repeat the full analysis
+- After the review, end with a {SCORES_FENCE} fenced block containing ONLY this JSON object with scores for the WHOLE revised resume, and nothing after it. Start from the previous scores and change only those the revision affects:
+{SCORES_SCHEMA}
+"""
+
+DELTA_MAX_TOKENS = 500
+
+def _create_completion(prompt, api_key, stream=False, max_tokens=1200):
+    return create_chat_completion(
+        api_key,
+        [{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+        model=LLM_MODEL_NAME,
+        temperature=0.3,
+        stream=stream
+    )
+
+def _error_message(error):
+    return f"❌ Error generating report: {str(error)}. Please check your API key and try again."
+
+def _narrative(raw_report):
+    # The scores block is the last json fence; the narrative may contain json code blocks of its own
+    narrative, fence, _ = raw_report.rpartition(SCORES_FENCE)
+    return (narrative if fence else raw_report).rstrip()
+
+def parse_report(raw_report):
+    """Split a raw model response into (markdown narrative, {category: score out of 5}).
+
+    The scores are read from the last json fenced block. Raises ValueError if
+    it is missing or invalid.
+    """
+    with trace("score_parsing"):
+        narrative, fence, scores_block = raw_report.rpartition(SCORES_FENCE)
+        narrative = narrative.rstrip()
+        if not fence:
+            raise ValueError(f"no {SCORES_FENCE} scores block found")
+        try:
+            data = json.loads(scores_block.split("```", 1)[0])
+        except json.JSONDecodeError as e:
+            raise ValueError(f"scores block is not valid JSON ({e})")
+        return narrative, validate_category_scores(data)
+
+def _repair_scores(prompt, raw_report, error, api_key):
+    """Ask once for a corrected scores object; returns {} if it is still invalid"""
+    try:
+        completion = create_chat_completion(
+            api_key,
+            [
+                {"role": "user", "content": prompt},
+                {"role": "assistant", "content": raw_report},
+                {"role": "user", "content": f"Your scores block was invalid: {error}. Reply with ONLY this JSON object, filled in with your real scores: {SCORES_SCHEMA}"},
+            ],
+            max_tokens=200,
+            model=LLM_MODEL_NAME,
+            temperature=0,
+            response_format={"type": "json_object"},
+        )
+        return validate_category_scores(json.loads(completion.choices[0].message.content))
+    except Exception as e:
+        logger.warning("Could not repair report scores: %s", e)
+        return {}
+
+def _prepare_prompt(resume, job_role, custom_job_desc):
+    """Compact the resume and build the prompt; returns (prompt, compaction stats)"""
+    compacted_resume, compaction = compact_resume(resume)
+    return build_report_prompt(compacted_resume, job_role, custom_job_desc), compaction
+
+def _finish_report(prompt, raw_report, api_key):
+    """Report dict for a complete raw response, repairing the scores once if needed"""
+    try:
+        narrative, scores = parse_report(raw_report)
+        return {"report": narrative, "scores": scores, "repaired": False}
+    except ValueError as e:
+        logger.warning("Invalid scores block in report (%s); requesting a repair", e)
+        return {"report": _narrative(raw_report), "scores": _repair_scores(prompt, raw_report, e, api_key), "repaired": True}
+
+def generate_comprehensive_report(resume, job_role, custom_job_desc="", api_key=GROQ_API_KEY):
+    """Generate CONCISE, CREATIVE analysis report using Groq LLM.
+
+    Returns {"report": markdown, "scores": {category: score out of 5}, "repaired": bool,
+    "compaction": stats from compact_resume}; on failure "report" holds the
+    error message and "scores" is empty.
+    """
+    with trace("report_generation") as span:
+        result = _generate_report(resume, job_role, custom_job_desc, api_key)
+        span["error"] = not result["scores"]
+    return result
+
+def generate_delta_report(diff, previous_scores, job_role, custom_job_desc="", api_key=GROQ_API_KEY):
+    """Delta review of a revised resume; returns the same dict as generate_comprehensive_report"""
+    if not api_key:
+        return {"report": MISSING_KEY_ERROR, "scores": {}, "repaired": False}
+    with trace("delta_report_generation") as span:
+        try:
+            prompt = build_delta_prompt(diff, previous_scores, job_role, custom_job_desc)
+            chat_completion = _create_completion(prompt, api_key, max_tokens=DELTA_MAX_TOKENS)
+            result = _finish_report(prompt, chat_completion.choices[0].message.content, api_key)
+        except Exception as e:
+            result = {"report": _error_message(e), "scores": {}, "repaired": False}
+        span["error"] = not result["scores"]
+    return result
+
+def _generate_report(resume, job_role, custom_job_desc, api_key):
+    try:
+        if not api_key:
+            return {"report": MISSING_KEY_ERROR, "scores": {}, "repaired": False}
+        
+        prompt, compaction = _prepare_prompt(resume, job_role, custom_job_desc)
+        chat_completion = _create_completion(prompt, api_key)
+        return dict(_finish_report(prompt, chat_completion.choices[0].message.content, api_key), compaction=compaction)
+    
+    except Exception as e:
+        return {"report": _error_message(e), "scores": {}, "repaired": False}
+
+class ReportStream:
+    """Iterate to receive the report narrative as tokens arrive.
+
+    The trailing scores block is never yielded. Once iteration finishes,
+    .result holds the same dict generate_comprehensive_report returns. Errors
+    are yielded as the same messages, so the output can be shown as is.
+    .received_chars counts the raw response received so far, scores included.
+    With delta set, the stream is the shorter review of a revision instead.
+    """
+
+    def __init__(self, resume, job_role, custom_job_desc="", api_key=GROQ_API_KEY, delta=None):
+        self.resume = resume
+        self.job_role = job_role
+        self.custom_job_desc = custom_job_desc
+        self.api_key = api_key
+        self.delta = delta  # (diff, previous scores) streams a delta review instead of the full report
+        self.result = None
+        self.received_chars = 0
+
+    def __iter__(self):
+        with trace("report_stream") as span:
+            for position, piece in enumerate(self._generate()):
+                if position == 0:
+                    get_telemetry().observe("report_first_chunk", time.perf_counter() - span["start"])
+                yield piece
+            span["error"] = not self.result["scores"]
+
+    def _generate(self):
+        if not self.api_key:
+            self.result = {"report": MISSING_KEY_ERROR, "scores": {}, "repaired": False}
+            yield MISSING_KEY_ERROR
+            return
+        
+        if self.delta is not None:
+            prompt, compaction = build_delta_prompt(*self.delta, self.job_role, self.custom_job_desc), None
+        else:
+            prompt, compaction = _prepare_prompt(self.resume, self.job_role, self.custom_job_desc)
+        max_tokens = DELTA_MAX_TOKENS if self.delta is not None else 1200
+        raw_report = ""
+        emitted = 0  # Characters of raw_report already yielded
+        try:
+            for chunk in _create_completion(prompt, self.api_key, stream=True, max_tokens=max_tokens):
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                raw_report += delta
+                self.received_chars = len(raw_report)
+                fence_at = raw_report.find(SCORES_FENCE, max(0, emitted - len(SCORES_FENCE)))
+                if fence_at >= 0:
+                    safe_end = fence_at
+                else:
+                    # Hold back a tail that could be the start of the scores fence
+                    safe_end = len(raw_report)
+                    for size in range(min(len(SCORES_FENCE) - 1, len(raw_report)), 0, -1):
+                        if SCORES_FENCE.startswith(raw_report[-size:]):
+                            safe_end -= size
+                            break
+                if safe_end > emitted:
+                    yield raw_report[emitted:safe_end]
+                    emitted = safe_end
+        except Exception as e:
+            error = _error_message(e)
+            self.result = {"report": error, "scores": {}, "repaired": False}
+            yield f"\n\n{error}" if emitted else error
+            return
+        
+        record_token_usage(estimate_tokens(prompt), estimate_tokens(raw_report))
+        self.result = dict(_finish_report(prompt, raw_report, self.api_key), compaction=compaction)
+        if len(self.result["report"]) > emitted:
+            yield self.result["report"][emitted:]
+
+def stream_comprehensive_report(resume, job_role, custom_job_desc="", api_key=GROQ_API_KEY):
+    """ReportStream for a resume, role and optional custom job description"""
+    return ReportStream(resume, job_role, custom_job_desc, api_key)
+
+def stream_delta_report(resume, diff, previous_scores, job_role, custom_job_desc="", api_key=GROQ_API_KEY):
+    """ReportStream of the delta review of a revised resume"""
+    return ReportStream(resume, job_role, custom_job_desc, api_key, delta=(diff, previous_scores))
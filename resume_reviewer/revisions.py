@@ -0,0 +1,67 @@
+# Differences between two revisions of a resume, for incremental re-analysis
+#
+# Between runs users usually rewrite a few bullets. The new text is compared
+# with the last analyzed version section by section (using the same headings
+# as chunking) and line by line, so only the changed sections are sent to the
+# LLM for a delta review, and unchanged chunks keep their embeddings.
+
+import difflib
+import re
+
+from .chunking import split_sections
+
+def _lines(text):
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+def _section_title(section):
+    title = re.sub(r"[=\-_#*:]+", " ", _lines(section)[0]).strip()
+    return " ".join(title.split()) or "Untitled"
+
+def _sections_by_title(text):
+    sections = {}
+    for section in split_sections(text):
+        title = _section_title(section)
+        key, n = title.lower(), 2
+        while key in sections:  # Repeated headings stay separate sections
+            key, n = f"{title.lower()} ({n})", n + 1
+        sections[key] = (title, section)
+    return sections
+
+def diff_resumes(previous, current):
+    """Section- and line-level changes from previous to current resume text.
+
+    Returns {"sections": [{"title", "status" ("added", "removed" or "changed"),
+    "text" (current section text), "added": [lines], "removed": [lines]}],
+    "changed_ratio": share of lines that differ (0 to 1), "unchanged": bool}.
+    """
+    previous_sections = _sections_by_title(previous)
+    current_sections = _sections_by_title(current)
+
+    changes = []
+    for key, (title, section) in current_sections.items():
+        if key not in previous_sections:
+            changes.append({"title": title, "status": "added", "text": section, "added": _lines(section), "removed": []})
+            continue
+        old_lines, new_lines = _lines(previous_sections[key][1]), _lines(section)
+        if old_lines == new_lines:
+            continue
+        added, removed = [], []
+        for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+            if tag != "equal":
+                removed += old_lines[i1:i2]
+                added += new_lines[j1:j2]
+        changes.append({"title": title, "status": "changed", "text": section, "added": added, "removed": removed})
+    for key, (title, section) in previous_sections.items():
+        if key not in current_sections:
+            changes.append({"title": title, "status": "removed", "text": "", "added": [], "removed": _lines(section)})
+
+    matcher = difflib.SequenceMatcher(None, _lines(previous), _lines(current), autojunk=False)
+    return {
+        "sections": changes,
+        "changed_ratio": round(1 - matcher.ratio(), 3),
+        "unchanged": not changes,
+    }
+
+def score_deltas(previous_scores, scores):
+    """{category: change} for the categories scored in both runs"""
+    return {label: round(score - previous_scores[label], 2) for label, score in scores.items() if label in previous_scores}
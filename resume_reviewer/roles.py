@@ -0,0 +1,99 @@
+# Job role catalogue used for similarity scoring and report prompts
+
+import hashlib
+import json
+
+from .settings import EMBEDDING_MODEL_ID
+
+# Comprehensive job roles database
+JOB_ROLES = {
+    "Data Scientist": {
+        "description": "Analyzes complex datasets to extract actionable insights, builds predictive models using machine learning algorithms, and creates data-driven solutions to solve business problems.",
+        "key_skills": ["Python", "R", "SQL", "Machine Learning", "Statistics", "Data Visualization", "Pandas", "NumPy", "Scikit-learn", "TensorFlow"],
+        "experience_focus": ["Model Development", "Data Analysis", "Statistical Modeling", "Feature Engineering", "A/B Testing"],
+        "industry_keywords": ["predictive modeling", "data mining", "neural networks", "deep learning", "data science", "analytics"]
+    },
+    "Software Engineer": {
+        "description": "Designs, develops, tests, and maintains software applications and systems using various programming languages and technologies.",
+        "key_skills": ["Java", "Python", "JavaScript", "C++", "React", "Node.js", "SQL", "Git", "Docker", "AWS"],
+        "experience_focus": ["Software Development", "Code Review", "System Architecture", "API Development", "Testing"],
+        "industry_keywords": ["software development", "programming", "coding", "debugging", "version control", "agile"]
+    },
+    "Product Manager": {
+        "description": "Drives product strategy, vision, and roadmap development while collaborating with cross-functional teams.",
+        "key_skills": ["Product Strategy", "Market Research", "User Experience Design", "Data Analysis", "Project Management", "Stakeholder Management"],
+        "experience_focus": ["Product Roadmapping", "Feature Prioritization", "User Research", "Market Analysis"],
+        "industry_keywords": ["product management", "product strategy", "user stories", "product roadmap", "market research"]
+    },
+    "Digital Marketing Specialist": {
+        "description": "Develops and executes comprehensive digital marketing strategies across multiple channels.",
+        "key_skills": ["SEO/SEM", "Google Analytics", "Social Media Marketing", "Content Marketing", "Email Marketing", "PPC Advertising"],
+        "experience_focus": ["Campaign Management", "Content Creation", "Social Media Strategy", "Performance Analysis"],
+        "industry_keywords": ["digital marketing", "SEO", "SEM", "social media", "content marketing", "conversion rates"]
+    },
+    "Business Analyst": {
+        "description": "Analyzes business processes and works with stakeholders to implement data-driven solutions.",
+        "key_skills": ["Business Analysis", "Requirements Gathering", "Process Mapping", "SQL", "Excel", "Power BI"],
+        "experience_focus": ["Process Analysis", "Requirements Documentation", "Data Analysis", "Process Improvement"],
+        "industry_keywords": ["business analysis", "process improvement", "requirements gathering", "business intelligence"]
+    },
+    "UI/UX Designer": {
+        "description": "Creates intuitive and engaging user interfaces and experiences for digital products.",
+        "key_skills": ["User Research", "Wireframing", "Prototyping", "Visual Design", "Figma", "Sketch", "Adobe Creative Suite", "User Testing"],
+        "experience_focus": ["User Experience Design", "User Interface Design", "User Research", "Prototyping", "Usability Testing"],
+        "industry_keywords": ["UI design", "UX design", "user experience", "user interface", "wireframing", "prototyping"]
+    },
+    "DevOps Engineer": {
+        "description": "Bridges the gap between development and operations teams by implementing CI/CD pipelines and managing infrastructure.",
+        "key_skills": ["CI/CD", "Docker", "Kubernetes", "AWS/Azure/GCP", "Terraform", "Jenkins", "Git", "Linux"],
+        "experience_focus": ["Infrastructure Management", "Automation", "CI/CD Pipeline Development", "Cloud Architecture"],
+        "industry_keywords": ["devops", "CI/CD", "infrastructure", "automation", "cloud computing", "containerization"]
+    },
+    "Sales Representative": {
+        "description": "Builds and maintains relationships with prospects and customers to drive revenue growth.",
+        "key_skills": ["Relationship Building", "Negotiation", "CRM Systems", "Lead Generation", "Sales Process", "Communication"],
+        "experience_focus": ["Lead Generation", "Customer Relationship Management", "Sales Presentations", "Contract Negotiation"],
+        "industry_keywords": ["sales", "business development", "lead generation", "customer acquisition", "revenue growth"]
+    },
+    "Financial Analyst": {
+        "description": "Analyzes financial data and creates comprehensive financial models to support strategic business decisions.",
+        "key_skills": ["Financial Modeling", "Excel", "Financial Analysis", "Forecasting", "Budgeting", "Valuation", "SQL"],
+        "experience_focus": ["Financial Modeling", "Budget Analysis", "Forecasting", "Investment Analysis", "Financial Reporting"],
+        "industry_keywords": ["financial analysis", "financial modeling", "budgeting", "forecasting", "investment analysis"]
+    },
+    "Human Resources Manager": {
+        "description": "Manages comprehensive HR functions including talent acquisition and employee relations.",
+        "key_skills": ["Recruitment", "Performance Management", "Employee Relations", "HR Policies", "Training & Development", "HRIS"],
+        "experience_focus": ["Talent Acquisition", "Employee Development", "Performance Management", "HR Policy Development"],
+        "industry_keywords": ["human resources", "talent acquisition", "employee relations", "performance management"]
+    },
+    "Content Writer": {
+        "description": "Creates compelling, engaging, and SEO-optimized written content across various platforms.",
+        "key_skills": ["Content Writing", "SEO Writing", "Research", "Editing", "Social Media Content", "Content Strategy"],
+        "experience_focus": ["Content Creation", "Content Strategy", "SEO Optimization", "Editorial Management"],
+        "industry_keywords": ["content writing", "content marketing", "SEO writing", "copywriting", "content strategy"]
+    },
+    "Custom Role": {
+        "description": "Enter your own job description below",
+        "key_skills": [],
+        "experience_focus": [],
+        "industry_keywords": []
+    }
+}
+
+def content_hash(text):
+    """SHA-256 hex digest of a text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def standard_role_names():
+    """Roles with a predefined description (everything except Custom Role)"""
+    return [name for name in JOB_ROLES if name != "Custom Role"]
+
+def role_comparison_text(job_role):
+    """Job description text used for similarity against a standard role"""
+    role_info = JOB_ROLES[job_role]
+    return f"{role_info['description']} Key skills: {', '.join(role_info['key_skills'])} Experience areas: {', '.join(role_info.get('experience_focus', []))}"
+
+def role_catalogue_hash():
+    """Hash of the role catalogue and embedding model; changes whenever JOB_ROLES is edited"""
+    return content_hash(json.dumps(JOB_ROLES, sort_keys=True) + EMBEDDING_MODEL_ID)
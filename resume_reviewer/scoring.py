@@ -0,0 +1,69 @@
+# Score validation and assessment helpers
+
+# (JSON key requested from the LLM, dashboard label)
+SCORE_CATEGORIES = [
+    ("technical_skills", "Technical Skills"),
+    ("experience", "Experience"),
+    ("achievements", "Achievements"),
+    ("education", "Education"),
+    ("ats_optimization", "ATS Optimization"),
+    ("presentation", "Presentation"),
+]
+
+def validate_category_scores(data):
+    """Validate the LLM's {"scores": {...}} object and return {label: score out of 5}.
+
+    Every category must be present with a number from 0 to 10. Raises
+    ValueError describing every problem found, so it can be sent back to the
+    model in a repair request.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("scores"), dict):
+        raise ValueError('expected an object with a "scores" object')
+    raw_scores = data["scores"]
+    
+    scores, problems = {}, []
+    for key, label in SCORE_CATEGORIES:
+        value = raw_scores.get(key)
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            problems.append(f"{key} must be a number from 0 to 10 (got {value!r})")
+            continue
+        if not 0 <= value <= 10:
+            problems.append(f"{key} must be between 0 and 10 (got {value})")
+            continue
+        scores[label] = round(value / 2, 2)
+    if problems:
+        raise ValueError("; ".join(problems))
+    return scores
+
+def calculate_percentage_score(scores):
+    """Convert scores (a {category: score} dict or a list, out of 5) to percentage"""
+    if isinstance(scores, dict):
+        scores = list(scores.values())
+    if not scores:
+        return 0.0
+    avg_score = sum(scores) / len(scores)
+    percentage = (avg_score / 5) * 100
+    return round(percentage, 1)
+
+def get_assessment_level(ats_score, overall_score):
+    """Get assessment level based on scores"""
+    avg_score = (ats_score * 100 + overall_score) / 2
+    if avg_score >= 85:
+        return "🟢 Excellent Match", "Outstanding alignment with job requirements. You're highly competitive for this role."
+    elif avg_score >= 70:
+        return "🟡 Strong Candidate", "Good foundation with some areas for strategic improvement."
+    elif avg_score >= 55:
+        return "🟠 Moderate Fit", "Solid potential but requires focused enhancement in key areas."
+    else:
+        return "🔴 Needs Development", "Significant improvements needed to be competitive for this role."
+
+def validate_inputs(resume_text):
+    """Validate inputs meet minimum requirements"""
+    errors = []
+    
+    if len(resume_text.strip()) < 150:
+        errors.append("❌ Resume content seems too short. Please provide a complete resume with all sections.")
+    
+    return errors
@@ -0,0 +1,308 @@
+# HTTP analysis service: a JSON API over analyze() with a job queue and worker pool
+#
+# Clients POST an analysis job and poll (or long-poll with ?wait=) for the
+# result. A bounded queue feeds a fixed pool of worker threads; when it is full
+# new jobs get 429 with a retry-after header instead of piling up. All workers
+# share the process-wide embedding model and Groq connection pool. Repeating a
+# POST with the same Idempotency-Key returns the original job.
+
+import base64
+import binascii
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .analysis import analyze
+from .pdf import extract_pdf_text, is_extraction_failure
+from .roles import JOB_ROLES, content_hash
+from .settings import (
+    GROQ_API_KEY,
+    SERVICE_HOST,
+    SERVICE_MAX_BODY_BYTES,
+    SERVICE_MAX_JOBS,
+    SERVICE_MAX_QUEUED,
+    SERVICE_PORT,
+    SERVICE_WORKERS,
+)
+from .similarity import get_model_registry
+from .telemetry import get_telemetry
+
+logger = logging.getLogger(__name__)
+
+ANALYSES_PATH = "/analyses"
+MAX_WAIT_SECONDS = 60
+
+class QueueFullError(Exception):
+    """Raised when the job queue cannot take another job"""
+
+class IdempotencyConflictError(Exception):
+    """Raised when an Idempotency-Key is reused with a different request"""
+
+class AnalysisJob:
+    """One submitted analysis and its outcome"""
+
+    def __init__(self, request, idempotency_key=None):
+        self.id = uuid.uuid4().hex
+        self.request = request
+        self.idempotency_key = idempotency_key
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+
+    def to_dict(self):
+        """Public view of the job; result is AnalysisResult.to_dict() once done"""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "job_role": self.request["job_role"],
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+def parse_analysis_request(payload):
+    """Validate a POST body into {resume, resume_pdf, job_role, custom_job_desc, user_id}; raises ValueError"""
+    if not isinstance(payload, dict):
+        raise ValueError("request body must be a JSON object")
+    job_role = payload.get("job_role")
+    if job_role not in JOB_ROLES:
+        raise ValueError(f"job_role must be one of: {', '.join(JOB_ROLES)}")
+    custom_job_desc = payload.get("custom_job_desc") or ""
+    if not isinstance(custom_job_desc, str):
+        raise ValueError("custom_job_desc must be a string")
+    user_id = payload.get("user_id")
+    if user_id is not None and not isinstance(user_id, str):
+        raise ValueError("user_id must be a string")
+
+    resume, resume_pdf = payload.get("resume"), None
+    if payload.get("resume_pdf_base64"):
+        try:
+            resume_pdf = base64.b64decode(payload["resume_pdf_base64"], validate=True)
+        except (binascii.Error, TypeError):
+            raise ValueError("resume_pdf_base64 is not valid base64")
+    elif not isinstance(resume, str) or not resume.strip():
+        raise ValueError("provide resume (text) or resume_pdf_base64")
+    return {"resume": resume, "resume_pdf": resume_pdf, "job_role": job_role, "custom_job_desc": custom_job_desc, "user_id": user_id}
+
+def request_fingerprint(request):
+    """Hash of a parsed request, to tell a retried submission from a different one"""
+    resume = request["resume_pdf"].hex() if request["resume_pdf"] is not None else request["resume"]
+    return content_hash("\0".join([resume, request["job_role"], request["custom_job_desc"], request["user_id"] or ""]))
+
+class AnalysisJobQueue:
+    """Bounded job queue drained by a pool of worker threads.
+
+    Finished jobs are kept (newest max_jobs) so clients can fetch results
+    after the fact; queued and running jobs are never dropped.
+    """
+
+    def __init__(self, workers=SERVICE_WORKERS, max_queued=SERVICE_MAX_QUEUED, max_jobs=SERVICE_MAX_JOBS, api_key=GROQ_API_KEY):
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.api_key = api_key
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._jobs = OrderedDict()
+        self._idempotency = {}
+        self._lock = threading.Lock()
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"analysis-worker-{i}", daemon=True).start()
+
+    def submit(self, request, idempotency_key=None):
+        """Queue a parsed request; returns (job, created).
+
+        Raises QueueFullError when the queue is full and IdempotencyConflictError
+        when idempotency_key was used for a different request.
+        """
+        fingerprint = request_fingerprint(request)
+        with self._lock:
+            if idempotency_key is not None and idempotency_key in self._idempotency:
+                job_id, previous_fingerprint = self._idempotency[idempotency_key]
+                if previous_fingerprint != fingerprint:
+                    raise IdempotencyConflictError(f"Idempotency-Key {idempotency_key!r} was used for a different request")
+                if job_id in self._jobs:
+                    return self._jobs[job_id], False
+
+            job = AnalysisJob(request, idempotency_key)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.rejected += 1
+                raise QueueFullError("analysis queue is full")
+            self._jobs[job.id] = job
+            if idempotency_key is not None:
+                self._idempotency[idempotency_key] = (job.id, fingerprint)
+            self._prune()
+        return job, True
+
+    def get(self, job_id):
+        """Job by id, or None"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        # Drop the oldest finished jobs (and their idempotency keys) beyond max_jobs
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.done.is_set()][:max(excess, 0)]:
+            job = self._jobs.pop(job_id)
+            if job.idempotency_key is not None:
+                self._idempotency.pop(job.idempotency_key, None)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                self.running += 1
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                job.result = self._run(job.request).to_dict()
+                job.status = "done"
+            except Exception as e:
+                if not isinstance(e, ValueError):
+                    logger.exception("Analysis job %s failed", job.id)
+                job.error = str(e)
+                job.status = "failed"
+            job.finished_at = time.time()
+            with self._lock:
+                self.running -= 1
+                self.completed += job.status == "done"
+                self.failed += job.status == "failed"
+            job.done.set()
+            self._queue.task_done()
+
+    def _run(self, request):
+        resume = request["resume"]
+        if request["resume_pdf"] is not None:
+            resume = extract_pdf_text(request["resume_pdf"])
+            if is_extraction_failure(resume):
+                raise ValueError(resume)
+        return analyze(resume, request["job_role"], request["custom_job_desc"], self.api_key, user_id=request["user_id"])
+
+    def stats(self):
+        """Queue depth, busy workers and job counters"""
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "max_queued": self._queue.maxsize,
+                "running": self.running,
+                "workers": self.workers,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "retained_jobs": len(self._jobs),
+            }
+
+class AnalysisServiceHandler(BaseHTTPRequestHandler):
+    """POST /analyses, GET /analyses/<id>[?wait=seconds], GET /health and GET /metrics"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != ANALYSES_PATH:
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self.close_connection = True  # Where the body ends is unknown, so the connection can't be reused
+            self._send_json(400, {"error": "Content-Length must be a non-negative integer"})
+            return
+        if length > SERVICE_MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(413, {"error": f"request body larger than {SERVICE_MAX_BODY_BYTES} bytes"})
+            return
+        try:
+            request = parse_analysis_request(json.loads(self.rfile.read(length) or b"{}"))
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            job, created = self.server.jobs.submit(request, self.headers.get("Idempotency-Key"))
+        except QueueFullError as e:
+            self._send_json(429, {"error": str(e)}, {"Retry-After": str(self.server.retry_after)})
+            return
+        except IdempotencyConflictError as e:
+            self._send_json(409, {"error": str(e)})
+            return
+        self._send_json(202 if created else 200, job.to_dict(), {"Location": f"{ANALYSES_PATH}/{job.id}"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path.rstrip("/")
+        if path == "/health":
+            self._send_json(200, {"status": "ok", "model": get_model_registry().metrics["status"], **self.server.jobs.stats()})
+        elif path == "/metrics":
+            body = get_telemetry().render_prometheus().encode("utf-8")
+            self._send(200, body, "text/plain; version=0.0.4; charset=utf-8")
+        elif path.startswith(ANALYSES_PATH + "/"):
+            job = self.server.jobs.get(path[len(ANALYSES_PATH) + 1:])
+            if job is None:
+                self._send_json(404, {"error": "Unknown job"})
+                return
+            try:
+                wait = min(float(parse_qs(url.query).get("wait", ["0"])[0]), MAX_WAIT_SECONDS)
+            except ValueError:
+                self._send_json(400, {"error": "wait must be a number of seconds"})
+                return
+            if wait > 0:
+                job.done.wait(wait)
+            self._send_json(200, job.to_dict())
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload, headers=None):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json", headers)
+
+def start_analysis_service(host=SERVICE_HOST, port=SERVICE_PORT, workers=SERVICE_WORKERS, max_queued=SERVICE_MAX_QUEUED, retry_after=5):
+    """Start the service in a daemon thread and begin loading the model; returns (server, base_url)"""
+    get_model_registry().start_background_load()
+    server = ThreadingHTTPServer((host, port), AnalysisServiceHandler)
+    server.daemon_threads = True
+    server.jobs = AnalysisJobQueue(workers, max_queued)
+    server.retry_after = retry_after
+    get_telemetry().register_stats("service", server.jobs.stats)
+    threading.Thread(target=server.serve_forever, name="analysis-service", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main(args):
+    """Entry point for `python -m resume_reviewer serve`"""
+    server, base_url = start_analysis_service(args.host, args.port, args.workers, args.max_queued)
+    print(f"Analysis service listening on {base_url} ({args.workers} workers, queue of {args.max_queued})", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
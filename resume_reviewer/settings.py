@@ -0,0 +1,61 @@
+# Shared configuration for the Smart Resume Reviewer engine
+
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+# Model and cache configuration
+SIMILARITY_BACKEND = os.getenv("SIMILARITY_BACKEND", "sentence-transformers")  # "sentence-transformers", "onnx", "onnx-int8" or "minilm"
+MINILM_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+# The minilm backend always loads MiniLM, so SIMILARITY_MODEL_NAME only applies to the other backends
+SIMILARITY_MODEL_NAME = MINILM_MODEL_NAME if SIMILARITY_BACKEND == "minilm" else (
+    os.getenv("SIMILARITY_MODEL_NAME") or 'sentence-transformers/all-mpnet-base-v2'
+)
+SIMILARITY_ONNX_INT8_FILE = os.getenv("SIMILARITY_ONNX_INT8_FILE", "onnx/model_quint8_avx2.onnx")
+EMBEDDING_MODEL_ID = f"{SIMILARITY_MODEL_NAME}@{SIMILARITY_BACKEND}"  # Identifies vectors in caches; backends differ numerically
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(".cache", "embeddings.sqlite3"))  # Empty disables it
+EMBEDDING_CACHE_MAX_MB = float(os.getenv("EMBEDDING_CACHE_MAX_MB", "256"))
+LLM_MODEL_NAME = "llama-3.3-70b-versatile"
+PROMPT_VERSION = "v3"  # Bump whenever the report prompt changes to invalidate cached analyses
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "256"))
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "21600"))
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", os.path.join(".cache", "history.sqlite3"))  # Empty disables the analysis history
+HISTORY_RETENTION_DAYS = float(os.getenv("HISTORY_RETENTION_DAYS", "30"))  # Saved analyses older than this are purged; 0 keeps them
+ROLE_EMBEDDINGS_DIR = os.getenv("ROLE_EMBEDDINGS_DIR", os.path.join(".cache", "role_embeddings"))
+PDF_EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("PDF_EXTRACTION_TIMEOUT_SECONDS", "20"))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))  # 0 means no limit
+PDF_EXTRACTION_WORKERS = int(os.getenv("PDF_EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+PDF_TEXT_CACHE_MAX_ENTRIES = int(os.getenv("PDF_TEXT_CACHE_MAX_ENTRIES", "512"))
+PDF_TEXT_CACHE_MAX_CHARS = int(os.getenv("PDF_TEXT_CACHE_MAX_CHARS", "50000000"))
+PDF_TEXT_CACHE_DIR = os.getenv("PDF_TEXT_CACHE_DIR", "")  # Empty disables on-disk persistence
+SIMILARITY_CHUNK_WORDS = int(os.getenv("SIMILARITY_CHUNK_WORDS", "180"))  # Stays under the model's 384 word-piece limit
+SIMILARITY_MAX_CHUNKS = int(os.getenv("SIMILARITY_MAX_CHUNKS", "24"))
+SIMILARITY_POOLING = os.getenv("SIMILARITY_POOLING", "topk")  # "max", "mean" or "topk"
+SIMILARITY_TOP_K = int(os.getenv("SIMILARITY_TOP_K", "3"))
+CHUNKING_VERSION = "v1"  # Bump whenever chunking changes to invalidate cached scores and embeddings
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL") or None  # e.g. http://127.0.0.1:8765 for the local stub server
+GROQ_TIMEOUT_SECONDS = float(os.getenv("GROQ_TIMEOUT_SECONDS", "60"))
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "20"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "4"))
+GROQ_BACKOFF_BASE_SECONDS = float(os.getenv("GROQ_BACKOFF_BASE_SECONDS", "0.5"))
+GROQ_BACKOFF_MAX_SECONDS = float(os.getenv("GROQ_BACKOFF_MAX_SECONDS", "20"))
+GROQ_REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))  # 0 disables the limiter
+GROQ_TOKENS_PER_MINUTE = float(os.getenv("GROQ_TOKENS_PER_MINUTE", "12000"))  # 0 disables the limiter
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "2500"))  # Max resume tokens sent to the LLM
+RANKING_TOP_N = int(os.getenv("RANKING_TOP_N", "5"))
+RANKING_KEYWORD_WEIGHT = float(os.getenv("RANKING_KEYWORD_WEIGHT", "0.3"))  # Share of keyword coverage in the best-fit score
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")  # Local scraping only by default
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))  # 0 disables the Prometheus endpoint
+SHOW_ADMIN_PANEL = os.getenv("SHOW_ADMIN_PANEL", "").lower() in ("1", "true", "yes")
+SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8000"))
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "4"))  # Analyses run concurrently by the HTTP service
+SERVICE_MAX_QUEUED = int(os.getenv("SERVICE_MAX_QUEUED", "32"))  # Further submissions get 429
+SERVICE_MAX_JOBS = int(os.getenv("SERVICE_MAX_JOBS", "1000"))  # Finished jobs kept for polling
+SERVICE_MAX_BODY_BYTES = int(os.getenv("SERVICE_MAX_BODY_BYTES", str(10 * 1024 ** 2)))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))  # Wait for other sessions' encodes; 0 disables micro-batching
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "64"))  # Texts per merged encode call
+REVISION_MAX_CHANGED_RATIO = float(os.getenv("REVISION_MAX_CHANGED_RATIO", "0.5"))  # Larger revisions get a full report instead of a delta review
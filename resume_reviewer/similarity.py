@@ -0,0 +1,295 @@
+# Semantic similarity between resumes and job descriptions
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .batching import EncodeBatcher
+from .chunking import chunk_text, mean_pooled_embedding, pool_chunk_scores
+from .embedding_backends import create_embedding_backend
+from .embedding_store import get_embedding_store
+from .roles import role_catalogue_hash, role_comparison_text, standard_role_names
+from .settings import EMBED_BATCH_MAX_WAIT_MS, ROLE_EMBEDDINGS_DIR
+from .telemetry import get_telemetry, trace
+
+logger = logging.getLogger(__name__)
+
+def current_rss_mb():
+    """Resident memory of this process in MB, or None if unavailable"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return round(int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2, 1)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    except ImportError:
+        return None
+
+class ModelRegistry:
+    """Process-wide owner of the shared embedding backend.
+
+    The backend (see SIMILARITY_BACKEND) is loaded once, optionally in a
+    background thread, warmed up with a dummy encode and then shared by every
+    session. Encoding is serialized because the fast tokenizer is not safe
+    for concurrent use.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.model_name = backend.model_name
+        self.model = None
+        self.error = None
+        self.metrics = {
+            "status": "not loaded",
+            "backend": backend.backend_name,
+            "model_name": backend.model_name,
+            "load_seconds": None,
+            "warmup_seconds": None,
+            "rss_before_mb": None,
+            "rss_after_mb": None,
+            "param_mb": None,
+        }
+        self._load_lock = threading.Lock()
+        self._start_lock = threading.Lock()  # Separate from _load_lock, which is held for the whole load
+        self._encode_lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._loader_started = False
+
+    def start_background_load(self):
+        """Load and warm up the model in a daemon thread (once); never waits for a load in progress"""
+        with self._start_lock:
+            if self._loader_started or self._loaded.is_set():
+                return
+            self._loader_started = True
+        threading.Thread(target=self.load, name="similarity-model-loader", daemon=True).start()
+
+    def load(self):
+        """Load and warm up the model if it is not loaded yet; return it"""
+        with self._load_lock:
+            if self._loaded.is_set():
+                return self.model
+            self.metrics["status"] = "loading"
+            self.metrics["rss_before_mb"] = current_rss_mb()
+            with trace("model_load") as span:
+                try:
+                    start = time.perf_counter()
+                    model = self.backend.load()
+                    self.metrics["load_seconds"] = round(time.perf_counter() - start, 3)
+                    
+                    start = time.perf_counter()
+                    model.encode(["Warm-up sentence for the resume similarity model."])
+                    self.metrics["warmup_seconds"] = round(time.perf_counter() - start, 3)
+                    
+                    self.metrics["param_mb"] = model.param_mb()
+                    self.model = model
+                    self.metrics["status"] = "ready"
+                except Exception as e:
+                    self.error = str(e)
+                    self.metrics["status"] = "failed"
+                    span["error"] = True
+                    logger.error("Error loading similarity model: %s", e)
+            self.metrics["rss_after_mb"] = current_rss_mb()
+            self._loaded.set()
+            return self.model
+
+    def encode(self, *args, **kwargs):
+        """Thread-safe proxy for the backend's encode"""
+        model = self.load()
+        if model is None:
+            raise RuntimeError(f"Similarity model unavailable: {self.error}")
+        with self._encode_lock:
+            return model.encode(*args, **kwargs)
+
+_model_registry = ModelRegistry(create_embedding_backend())
+get_telemetry().register_stats("similarity_model", lambda: _model_registry.metrics)
+get_telemetry().register_stats("embedding_cache", lambda: get_embedding_store() and get_embedding_store().stats())
+
+def get_model_registry():
+    """Process-wide model registry"""
+    return _model_registry
+
+_encode_batcher = None
+_encode_batcher_lock = threading.Lock()
+
+def get_encode_batcher():
+    """Process-wide micro-batcher over the shared model, or None when EMBED_BATCH_MAX_WAIT_MS is 0"""
+    global _encode_batcher
+    if EMBED_BATCH_MAX_WAIT_MS <= 0:
+        return None
+    with _encode_batcher_lock:
+        if _encode_batcher is None:
+            _encode_batcher = EncodeBatcher(get_model_registry().encode)
+            get_telemetry().register_stats("encode_batcher", _encode_batcher.stats)
+        return _encode_batcher
+
+def _encode(texts, batch_size):
+    # Small requests (interactive analyses) are merged across sessions; bulk ones already fill a batch
+    batcher = get_encode_batcher()
+    if batcher is None or len(texts) >= batcher.max_batch:
+        return np.asarray(get_model_registry().encode(texts, batch_size=batch_size), dtype=np.float32)
+    return batcher.encode(texts)
+
+def encode_cached(texts, batch_size=32):
+    """Unit-length embeddings for texts, taken from the persistent embedding store where possible"""
+    store = get_embedding_store()
+    if store is None:
+        return normalize_embeddings(_encode(texts, batch_size))
+    return normalize_embeddings(store.encode(texts, lambda missing: _encode(missing, batch_size)))
+
+def load_similarity_model():
+    """Return the shared similarity model handle, waiting for the load if needed"""
+    registry = get_model_registry()
+    if registry.load() is None:
+        return None
+    return registry
+
+class RoleEmbeddingIndex:
+    """Precomputed unit-length embeddings of every standard role's comparison text"""
+
+    def __init__(self, role_names, embeddings):
+        self.role_names = role_names
+        self.embeddings = normalize_embeddings(embeddings)  # One small in-memory copy; older saved files are not normalized
+        self._positions = {name: i for i, name in enumerate(role_names)}
+
+    def __contains__(self, job_role):
+        return job_role in self._positions
+
+    def embedding(self, job_role):
+        """Embedding row for a role, shaped (1, dim)"""
+        return self.embeddings[self._positions[job_role]][np.newaxis, :]
+
+    def matrix(self, role_names):
+        """Stacked embeddings for several roles, shaped (len(role_names), dim)"""
+        return np.asarray(self.embeddings[[self._positions[name] for name in role_names]])
+
+    @classmethod
+    def load_or_build(cls, model, catalogue_hash, cache_dir=ROLE_EMBEDDINGS_DIR):
+        """Memory-map a saved index for this catalogue hash, or encode all roles in one batch and save it"""
+        role_names = standard_role_names()
+        path = os.path.join(cache_dir, f"roles_{catalogue_hash[:16]}.npy")
+        if os.path.exists(path):
+            try:
+                embeddings = np.load(path, mmap_mode="r")
+                if embeddings.shape[0] == len(role_names):
+                    return cls(role_names, embeddings)
+            except (OSError, ValueError):
+                pass
+        
+        embeddings = np.asarray(model.encode([role_comparison_text(name) for name in role_names]), dtype=np.float32)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as tmp_file:
+                np.save(tmp_file, embeddings)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # Read-only deployments just keep the in-memory index
+        return cls(role_names, embeddings)
+
+_role_indexes = {}
+_role_index_lock = threading.Lock()
+
+def get_role_embedding_index():
+    """Role embedding index for the current catalogue, built once per process and catalogue hash"""
+    catalogue_hash = role_catalogue_hash()
+    with _role_index_lock:
+        if catalogue_hash not in _role_indexes:
+            model = load_similarity_model()
+            if model is None:
+                return None
+            _role_indexes[catalogue_hash] = RoleEmbeddingIndex.load_or_build(model, catalogue_hash)
+        return _role_indexes[catalogue_hash]
+
+def normalize_embeddings(embeddings):
+    """Rows scaled to unit length (zero rows stay zero), so cosine similarity is a dot product"""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings / np.where(norms == 0, 1, norms)
+
+def cosine_similarity_matrix(embeddings1, embeddings2):
+    """Pairwise cosine similarity between two stacks of embeddings"""
+    return normalize_embeddings(embeddings1) @ normalize_embeddings(embeddings2).T
+
+class SimilarityResult:
+    """Similarity of a resume to a job description, with the unit-length vectors behind it.
+
+    resume_chunk_embeddings is (n_chunks, dim), one row per resume_chunks
+    entry; job_embedding and the mean-pooled resume_embedding are (dim,)
+    vectors. They are None when the model was unavailable, in which case
+    score is 0.0.
+    """
+
+    def __init__(self, score, resume_chunk_embeddings=None, job_embedding=None, resume_chunks=None):
+        self.score = score
+        self.resume_chunk_embeddings = resume_chunk_embeddings
+        self.job_embedding = job_embedding
+        self.resume_chunks = resume_chunks
+
+    @property
+    def resume_embedding(self):
+        if self.resume_chunk_embeddings is None:
+            return None
+        return mean_pooled_embedding(self.resume_chunk_embeddings)
+
+def compute_similarity(text1, text2, text2_embedding=None, previous=None):
+    """Semantic similarity between a resume and a job description, as a SimilarityResult.
+
+    Both texts are chunked so the whole document counts despite the model's
+    input limit, and all chunks are encoded in one batched call. Resume chunk
+    scores are pooled (see SIMILARITY_POOLING); a long job description is
+    mean-pooled into one vector. When text2_embedding is given (e.g. from the
+    role index), only the resume is encoded. With previous (the SimilarityResult
+    of an earlier revision), only resume chunks that changed are encoded.
+    """
+    with trace("similarity") as span:
+        similarity = _calculate_similarity(text1, text2, text2_embedding, previous)
+        span["error"] = similarity is None
+    return SimilarityResult(0.0) if similarity is None else similarity
+
+def calculate_similarity_bert(text1, text2, text2_embedding=None):
+    """Calculate semantic similarity between resume and job description (see compute_similarity)"""
+    return compute_similarity(text1, text2, text2_embedding).score
+
+def _calculate_similarity(text1, text2, text2_embedding, previous=None):
+    try:
+        model = load_similarity_model()
+        if model is None:
+            return None
+        
+        resume_chunks = chunk_text(text1)
+        known = {}
+        if previous is not None and previous.resume_chunks:
+            known = dict(zip(previous.resume_chunks, previous.resume_chunk_embeddings))
+        new_chunks = [chunk for chunk in resume_chunks if chunk not in known]
+        job_chunks = [] if text2_embedding is not None else chunk_text(text2)
+        embeddings = encode_cached(new_chunks + job_chunks) if new_chunks or job_chunks else []
+        
+        known.update(zip(new_chunks, embeddings[:len(new_chunks)]))
+        resume_embeddings = np.stack([known[chunk] for chunk in resume_chunks])
+        if text2_embedding is not None:
+            job_embedding = normalize_embeddings(np.ravel(text2_embedding))
+        else:
+            job_embedding = mean_pooled_embedding(embeddings[len(new_chunks):])
+        
+        # Both sides are unit length, so the chunk scores are a plain matrix-vector product
+        similarity = pool_chunk_scores((resume_embeddings @ job_embedding)[:, np.newaxis])[0]
+        return SimilarityResult(round(float(similarity), 3), resume_embeddings, job_embedding, resume_chunks)
+    except Exception as e:
+        logger.error("Error calculating similarity: %s", e)
+        return None
+
+_similarity_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="similarity")
+
+def calculate_similarity_async(text1, text2, text2_embedding=None):
+    """Run calculate_similarity_bert in a background thread; returns a Future"""
+    return _similarity_executor.submit(calculate_similarity_bert, text1, text2, text2_embedding)
+
+def compute_similarity_async(text1, text2, text2_embedding=None, previous=None):
+    """Run compute_similarity in a background thread; returns a Future of a SimilarityResult"""
+    return _similarity_executor.submit(compute_similarity, text1, text2, text2_embedding, previous)
@@ -0,0 +1,182 @@
+# Lightweight tracing of pipeline stages, exported as Prometheus text
+#
+# Stages are timed with `with trace("stage"):`; durations feed a histogram per
+# stage plus a window of recent samples for percentiles in the admin panel.
+# Modules owning caches or clients register their stats() functions, which are
+# read at scrape time. The text format is served on METRICS_HOST:METRICS_PORT.
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .settings import METRICS_HOST, METRICS_PORT
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "resume_reviewer"
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+class Telemetry:
+    """Thread-safe stage timings, counters and registered stats sources"""
+
+    def __init__(self, buckets=STAGE_BUCKETS, window=500):
+        self.buckets = buckets
+        self.window = window
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = defaultdict(float)
+        self._sources = {}
+
+    def observe(self, stage, seconds, error=False):
+        """Record one run of a stage"""
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {
+                    "count": 0,
+                    "errors": 0,
+                    "sum": 0.0,
+                    "buckets": [0] * len(self.buckets),
+                    "recent": deque(maxlen=self.window),
+                }
+            entry["count"] += 1
+            entry["errors"] += bool(error)
+            entry["sum"] += seconds
+            entry["recent"].append(seconds)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+
+    @contextmanager
+    def trace(self, stage):
+        """Time the block as a run of stage; set span["error"] for failures that do not raise"""
+        span = {"error": False, "start": time.perf_counter()}
+        try:
+            yield span
+        except Exception:
+            span["error"] = True
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - span["start"], span["error"])
+
+    def inc(self, name, amount=1, **labels):
+        """Add to a counter, exported as <prefix>_<name>_total"""
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += amount
+
+    def register_stats(self, name, stats):
+        """Export the numeric values of stats() as <prefix>_<name>_<key> gauges at scrape time"""
+        with self._lock:
+            self._sources[name] = stats
+
+    def stage_summary(self):
+        """{stage: count, errors, p50/p95 of recent runs in ms, total seconds}"""
+        with self._lock:
+            stages = {stage: dict(entry, recent=list(entry["recent"])) for stage, entry in self._stages.items()}
+        return {
+            stage: {
+                "count": entry["count"],
+                "errors": entry["errors"],
+                "p50_ms": round(float(np.percentile(entry["recent"], 50)) * 1000, 1),
+                "p95_ms": round(float(np.percentile(entry["recent"], 95)) * 1000, 1),
+                "total_seconds": round(entry["sum"], 3),
+            }
+            for stage, entry in stages.items()
+        }
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            stages = {stage: dict(entry) for stage, entry in self._stages.items()}
+            counters = dict(self._counters)
+            sources = dict(self._sources)
+
+        histogram = f"{METRIC_PREFIX}_stage_duration_seconds"
+        lines = [
+            f"# HELP {histogram} Duration of pipeline stages",
+            f"# TYPE {histogram} histogram",
+        ]
+        for stage, entry in sorted(stages.items()):
+            for bound, count in zip(self.buckets, entry["buckets"]):
+                lines.append(f"{histogram}_bucket{_format_labels({'stage': stage, 'le': bound})} {count}")
+            lines.append(f"{histogram}_bucket{_format_labels({'stage': stage, 'le': '+Inf'})} {entry['count']}")
+            lines.append(f"{histogram}_sum{_format_labels({'stage': stage})} {entry['sum']}")
+            lines.append(f"{histogram}_count{_format_labels({'stage': stage})} {entry['count']}")
+
+        errors = f"{METRIC_PREFIX}_stage_errors_total"
+        lines += [f"# HELP {errors} Failed runs of pipeline stages", f"# TYPE {errors} counter"]
+        lines += [f"{errors}{_format_labels({'stage': stage})} {entry['errors']}" for stage, entry in sorted(stages.items())]
+
+        for name in sorted({name for name, _ in counters}):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines += [f"{metric}{_format_labels(dict(labels))} {value}" for (counter, labels), value in sorted(counters.items()) if counter == name]
+
+        for name, stats in sorted(sources.items()):
+            try:
+                values = stats() or {}
+            except Exception as e:
+                logger.warning("Could not collect %s metrics: %s", name, e)
+                continue
+            for key, value in sorted(values.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metric = f"{METRIC_PREFIX}_{name}_{key}"
+                    lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+_telemetry = Telemetry()
+
+def get_telemetry():
+    """Process-wide telemetry"""
+    return _telemetry
+
+def trace(stage):
+    """Shortcut for get_telemetry().trace(stage)"""
+    return _telemetry.trace(stage)
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics from the process-wide telemetry"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = _telemetry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+_metrics_server = None
+_metrics_server_lock = threading.Lock()
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    """Serve /metrics in a daemon thread, once per process; returns the URL or None when disabled or the port is taken"""
+    global _metrics_server
+    if not port:
+        return None
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            try:
+                _metrics_server = ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError as e:
+                logger.warning("Metrics endpoint not started on %s:%s: %s", host, port, e)
+                return None
+            _metrics_server.daemon_threads = True
+            threading.Thread(target=_metrics_server.serve_forever, name="metrics-server", daemon=True).start()
+        return f"http://{host}:{_metrics_server.server_address[1]}/metrics"
@@ -2,20 +2,50 @@
 # Clean version - Removed boxes and metrics display
 
 import streamlit as st
-from pdfminer.high_level import extract_text
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from groq import Groq
-import re
-from dotenv import load_dotenv
-import os
-import tempfile
+import importlib.util
+import itertools
+import time
 from datetime import datetime
-import json
 
-# Load environment variables
-load_dotenv()
-api_key = os.getenv("GROQ_API_KEY")
+from resume_reviewer import (
+    JOB_ROLES,
+    analysis_history,
+    build_result,
+    cache_analysis,
+    calculate_percentage_score,
+    compare_results,
+    comparison_target,
+    compute_similarity_async,
+    content_hash,
+    count_quantified_achievements,
+    detect_sections,
+    diff_resumes,
+    forget_history,
+    get_analysis_cache,
+    get_assessment_level,
+    get_cached_analysis,
+    get_embedding_store,
+    get_history_store,
+    get_model_registry,
+    get_pdf_text_cache,
+    get_telemetry,
+    is_extraction_failure,
+    latest_analysis,
+    rank_roles,
+    record_analysis,
+    render_local_report,
+    role_keyword_match,
+    score_resume_locally,
+    score_trend,
+    start_metrics_server,
+    stream_comprehensive_report,
+    stream_delta_report,
+    submit_pdf_extraction,
+    use_delta_review,
+    validate_inputs,
+)
+from resume_reviewer.settings import GROQ_API_KEY as api_key
+from resume_reviewer.settings import HISTORY_RETENTION_DAYS, PDF_TEXT_CACHE_DIR, SHOW_ADMIN_PANEL
 
 # Page configuration
 st.set_page_config(
@@ -83,86 +113,37 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Session States
-session_vars = ['form_submitted', 'resume', 'resume_filename', 'selected_job_role', 'custom_job_desc', 'analysis_results']
+session_vars = ['form_submitted', 'resume', 'resume_filename', 'selected_job_role', 'custom_job_desc', 'analysis_results', 'best_fit_mode', 'role_ranking', 'revision_mode']
 for var in session_vars:
     if var not in st.session_state:
         st.session_state[var] = "" if var != 'form_submitted' else False
-
-# Comprehensive job roles database
-JOB_ROLES = {
-    "Data Scientist": {
-        "description": "Analyzes complex datasets to extract actionable insights, builds predictive models using machine learning algorithms, and creates data-driven solutions to solve business problems.",
-        "key_skills": ["Python", "R", "SQL", "Machine Learning", "Statistics", "Data Visualization", "Pandas", "NumPy", "Scikit-learn", "TensorFlow"],
-        "experience_focus": ["Model Development", "Data Analysis", "Statistical Modeling", "Feature Engineering", "A/B Testing"],
-        "industry_keywords": ["predictive modeling", "data mining", "neural networks", "deep learning", "data science", "analytics"]
-    },
-    "Software Engineer": {
-        "description": "Designs, develops, tests, and maintains software applications and systems using various programming languages and technologies.",
-        "key_skills": ["Java", "Python", "JavaScript", "C++", "React", "Node.js", "SQL", "Git", "Docker", "AWS"],
-        "experience_focus": ["Software Development", "Code Review", "System Architecture", "API Development", "Testing"],
-        "industry_keywords": ["software development", "programming", "coding", "debugging", "version control", "agile"]
-    },
-    "Product Manager": {
-        "description": "Drives product strategy, vision, and roadmap development while collaborating with cross-functional teams.",
-        "key_skills": ["Product Strategy", "Market Research", "User Experience Design", "Data Analysis", "Project Management", "Stakeholder Management"],
-        "experience_focus": ["Product Roadmapping", "Feature Prioritization", "User Research", "Market Analysis"],
-        "industry_keywords": ["product management", "product strategy", "user stories", "product roadmap", "market research"]
-    },
-    "Digital Marketing Specialist": {
-        "description": "Develops and executes comprehensive digital marketing strategies across multiple channels.",
-        "key_skills": ["SEO/SEM", "Google Analytics", "Social Media Marketing", "Content Marketing", "Email Marketing", "PPC Advertising"],
-        "experience_focus": ["Campaign Management", "Content Creation", "Social Media Strategy", "Performance Analysis"],
-        "industry_keywords": ["digital marketing", "SEO", "SEM", "social media", "content marketing", "conversion rates"]
-    },
-    "Business Analyst": {
-        "description": "Analyzes business processes and works with stakeholders to implement data-driven solutions.",
-        "key_skills": ["Business Analysis", "Requirements Gathering", "Process Mapping", "SQL", "Excel", "Power BI"],
-        "experience_focus": ["Process Analysis", "Requirements Documentation", "Data Analysis", "Process Improvement"],
-        "industry_keywords": ["business analysis", "process improvement", "requirements gathering", "business intelligence"]
-    },
-    "UI/UX Designer": {
-        "description": "Creates intuitive and engaging user interfaces and experiences for digital products.",
-        "key_skills": ["User Research", "Wireframing", "Prototyping", "Visual Design", "Figma", "Sketch", "Adobe Creative Suite", "User Testing"],
-        "experience_focus": ["User Experience Design", "User Interface Design", "User Research", "Prototyping", "Usability Testing"],
-        "industry_keywords": ["UI design", "UX design", "user experience", "user interface", "wireframing", "prototyping"]
-    },
-    "DevOps Engineer": {
-        "description": "Bridges the gap between development and operations teams by implementing CI/CD pipelines and managing infrastructure.",
-        "key_skills": ["CI/CD", "Docker", "Kubernetes", "AWS/Azure/GCP", "Terraform", "Jenkins", "Git", "Linux"],
-        "experience_focus": ["Infrastructure Management", "Automation", "CI/CD Pipeline Development", "Cloud Architecture"],
-        "industry_keywords": ["devops", "CI/CD", "infrastructure", "automation", "cloud computing", "containerization"]
-    },
-    "Sales Representative": {
-        "description": "Builds and maintains relationships with prospects and customers to drive revenue growth.",
-        "key_skills": ["Relationship Building", "Negotiation", "CRM Systems", "Lead Generation", "Sales Process", "Communication"],
-        "experience_focus": ["Lead Generation", "Customer Relationship Management", "Sales Presentations", "Contract Negotiation"],
-        "industry_keywords": ["sales", "business development", "lead generation", "customer acquisition", "revenue growth"]
-    },
-    "Financial Analyst": {
-        "description": "Analyzes financial data and creates comprehensive financial models to support strategic business decisions.",
-        "key_skills": ["Financial Modeling", "Excel", "Financial Analysis", "Forecasting", "Budgeting", "Valuation", "SQL"],
-        "experience_focus": ["Financial Modeling", "Budget Analysis", "Forecasting", "Investment Analysis", "Financial Reporting"],
-        "industry_keywords": ["financial analysis", "financial modeling", "budgeting", "forecasting", "investment analysis"]
-    },
-    "Human Resources Manager": {
-        "description": "Manages comprehensive HR functions including talent acquisition and employee relations.",
-        "key_skills": ["Recruitment", "Performance Management", "Employee Relations", "HR Policies", "Training & Development", "HRIS"],
-        "experience_focus": ["Talent Acquisition", "Employee Development", "Performance Management", "HR Policy Development"],
-        "industry_keywords": ["human resources", "talent acquisition", "employee relations", "performance management"]
-    },
-    "Content Writer": {
-        "description": "Creates compelling, engaging, and SEO-optimized written content across various platforms.",
-        "key_skills": ["Content Writing", "SEO Writing", "Research", "Editing", "Social Media Content", "Content Strategy"],
-        "experience_focus": ["Content Creation", "Content Strategy", "SEO Optimization", "Editorial Management"],
-        "industry_keywords": ["content writing", "content marketing", "SEO writing", "copywriting", "content strategy"]
-    },
-    "Custom Role": {
-        "description": "Enter your own job description below",
-        "key_skills": [],
-        "experience_focus": [],
-        "industry_keywords": []
-    }
-}
+if 'saved_job_descs' not in st.session_state:
+    st.session_state.saved_job_descs = {}  # Survives "Clear Form" so saved descriptions keep being ranked
+if 'last_analysis' not in st.session_state:
+    st.session_state.last_analysis = None  # Resume, target and result of the last analysis, for revision reviews
+
+if 'save_history' not in st.session_state:
+    st.session_state.save_history = False  # Analyses are only stored when the user opts in
+
+# Saved analyses belong to the signed-in account (Streamlit authentication); anonymous analyses are never stored
+user_id = None
+if st.user.get("is_logged_in"):
+    user_id = "account:" + content_hash(st.user.get("email") or st.user.get("sub"))
+history_enabled = user_id is not None and get_history_store() is not None
+history_retention = f"for {HISTORY_RETENTION_DAYS:g} days or until you delete it" if HISTORY_RETENTION_DAYS else "until you delete it"
+if history_enabled:
+    if st.session_state.last_analysis is None:
+        latest = latest_analysis(user_id)
+        if latest is not None:
+            last_resume, last_job_desc, last_result = latest
+            st.session_state.last_analysis = {
+                "resume": last_resume,
+                "job_role": last_result.job_role,
+                "custom_job_desc": last_job_desc,
+                "result": last_result,
+            }
+    if not st.session_state.analysis_results:
+        st.session_state.analysis_results = analysis_history(user_id)
 
 # Title and Header
 st.markdown("""
@@ -173,271 +154,9 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Functions
-@st.cache_data
-def load_similarity_model():
-    """Load the sentence transformer model with caching"""
-    try:
-        return SentenceTransformer('sentence-transformers/all-mpnet-base-v2')
-    except Exception as e:
-        st.error(f"Error loading similarity model: {str(e)}")
-        return None
-
-def extract_pdf_text(uploaded_file):
-    """Extract text from uploaded PDF file"""
-    try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_file_path = tmp_file.name
-        
-        extracted_text = extract_text(tmp_file_path)
-        os.unlink(tmp_file_path)
-        
-        if not extracted_text.strip():
-            return "Warning: No text could be extracted from this PDF. Please ensure your PDF contains selectable text."
-        
-        return extracted_text
-    except Exception as e:
-        st.error(f"Error extracting text from PDF: {str(e)}")
-        return "Could not extract text from the PDF file. Please try with a different PDF."
-
-def calculate_similarity_bert(text1, text2):
-    """Calculate semantic similarity between resume and job description"""
-    try:
-        model = load_similarity_model()
-        if model is None:
-            return 0.0
-        
-        embeddings1 = model.encode([text1])
-        embeddings2 = model.encode([text2])
-        
-        similarity = cosine_similarity(embeddings1, embeddings2)[0][0]
-        return round(similarity, 3)
-    except Exception as e:
-        st.error(f"Error calculating similarity: {str(e)}")
-        return 0.0
-
-def generate_comprehensive_report(resume, job_role, custom_job_desc=""):
-    """Generate CONCISE, CREATIVE analysis report using Groq LLM"""
-    try:
-        if not api_key:
-            return "❌ Error: GROQ_API_KEY not found. Please check your .env file."
-        
-        client = Groq(api_key=api_key)
-        
-        # Get job role context
-        role_context = ""
-        if job_role in JOB_ROLES and job_role != "Custom Role":
-            role_info = JOB_ROLES[job_role]
-            role_context = f"""
-**🎯 TARGET ROLE**: {job_role}
-**Key Skills**: {', '.join(role_info['key_skills'][:8])}
-**Focus Areas**: {', '.join(role_info.get('experience_focus', [])[:4])}
-"""
-
-        # Determine which job description to use
-        if custom_job_desc.strip():
-            # Use custom job description if provided
-            job_desc = custom_job_desc.strip()
-            job_source = "custom job description provided by user"
-        elif job_role in JOB_ROLES and job_role != "Custom Role":
-            # Use standard job description
-            role_info = JOB_ROLES[job_role]
-            job_desc = f"""We are seeking a skilled {job_role} with 3+ years experience in: {', '.join(role_info['key_skills'][:8])}. Strong proficiency in: {', '.join(role_info.get('experience_focus', [])[:5])}."""
-            job_source = f"standard {job_role} requirements"
-        else:
-            job_desc = "General professional role requiring relevant experience and skills."
-            job_source = "general professional requirements"
-
-        prompt = f"""
-You are an expert AI Career Consultant. Create a CONCISE, PROFESSIONAL resume analysis report with creative visual elements. Keep it focused and actionable - maximum 800 words total.
-
-{role_context}
-
-# 🎯 RESUME ANALYSIS REPORT
-**Target Position**: {job_role} | **Analysis Date**: {datetime.now().strftime('%B %d, %Y')}
-
----
-
-## 📊 EXECUTIVE SCORECARD
-
-**OVERALL MATCH**: [X]%
-
-```
-PERFORMANCE BREAKDOWN:
-├── Technical Skills    : [X]/10 ⭐⭐⭐⭐⭐⭐⭐⭐⚪⚪
-├── Experience Match   : [X]/10 ⭐⭐⭐⭐⭐⭐⭐⚪⚪⚪
-├── Achievement Impact : [X]/10 ⭐⭐⭐⭐⭐⭐⭐⭐⭐⚪
-├── ATS Compatibility  : [X]/10 ⭐⭐⭐⭐⭐⭐⭐⭐⚪⚪
-└── Professional Format: [X]/10 ⭐⭐⭐⭐⭐⭐⭐⭐⭐⭐
-```
-
-**🏆 COMPETITIVE POSITION**: [Strong Candidate/Needs Development/Excellent Match]
-
----
-
-## 🔍 KEY FINDINGS
-
-### ✅ STRENGTHS
-- [Top 3 specific strengths with examples]
-
-### ⚠️ IMPROVEMENT AREAS  
-- [Top 3 specific areas needing attention]
-
-### 📈 MARKET POSITION
-- [1-2 sentences on competitive positioning for {job_role}]
-
----
-
-## ⚡ PRIORITY ACTION PLAN
-
-### 🔥 IMMEDIATE WINS (24-48 Hours)
-1. **[SPECIFIC ACTION]**: Add quantified result - "Increased [metric] by X%"
-   - **Location**: Experience section, [specific bullet]
-   - **Impact**: +[X]% match improvement
-
-2. **[SPECIFIC ACTION]**: Include keywords: "[skill1], [skill2], [skill3]"
-   - **Location**: Skills section & summary
-   - **Impact**: +[X]% ATS score
-
-3. **[SPECIFIC ACTION]**: Enhance summary with: "[specific language]"
-   - **Location**: Top of resume
-   - **Impact**: Stronger first impression
-
-### 📋 CONTENT OPTIMIZATION
-```
-SKILLS UPGRADE:
-├── ADD: [3-4 missing {job_role} skills]
-├── REMOVE: [2-3 outdated skills]
-└── REORGANIZE: [Priority order for {job_role}]
-
-EXPERIENCE ENHANCEMENT:
-├── QUANTIFY: [Add specific numbers/percentages]
-├── CONTEXTUALIZE: [Include project scope]  
-└── IMPACT: [Connect to business outcomes]
-```
-
----
-
-## 🎯 SUCCESS METRICS
-
-**TARGET IMPROVEMENTS:**
-- ATS Score: 75%+ (Current: [X]%)
-- Interview Rate: +25% improvement expected
-- Response Time: <2 weeks average
-
-**📅 IMPLEMENTATION TIMELINE:**
-- Week 1: Complete all Priority Actions
-- Week 2: Content optimization & formatting
-- Week 3: Test optimized resume with 5+ applications
-
----
-
-## 💡 {job_role.upper()} SPECIFIC INSIGHTS
-
-**🔑 KEY SUCCESS FACTORS:**
-- [2-3 most important elements for {job_role} success]
-
-**📈 MARKET TRENDS:**
-- [1-2 current trends affecting {job_role} hiring]
-
-**🚀 COMPETITIVE EDGE:**
-- [Unique positioning strategy for {job_role}]
-
----
-
-**⚡ QUICK WIN SUMMARY:** Focus on quantifying achievements, adding {job_role} keywords, and optimizing for ATS compatibility. Expected results: 25-30% improvement in application success rate.
-
----
-
-# ANALYSIS INPUTS:
-**Target Role**: {job_role}
-**Resume Content**: {resume}
-**Job Requirements**: {job_desc}
-
-IMPORTANT: 
-- Keep total response under 800 words
-- Use REAL numbers for all scoring (X/10, X%)
-- Include SPECIFIC, actionable recommendations
-- Create VISUAL text elements (progress bars, trees, checklists)
-- Focus on highest-impact improvements
-- Include role-specific insights for {job_role}
-- Use engaging, professional language
-"""
-
-        chat_completion = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="llama-3.3-70b-versatile",
-            temperature=0.3,
-            max_tokens=1200
-        )
-        
-        return chat_completion.choices[0].message.content
-    
-    except Exception as e:
-        return f"❌ Error generating report: {str(e)}. Please check your API key and try again."
-
-def extract_scores(text):
-    """Extract numerical scores from the analysis report"""
-    try:
-        patterns = [
-            r'(\d+(?:\.\d+)?)/10',
-            r'(\d+(?:\.\d+)?)/5',
-            r'Score[:\s]*(\d+(?:\.\d+)?)/5',
-            r'(\d+(?:\.\d+)?)\s*out\s*of\s*5'
-        ]
-        
-        scores = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            scores.extend([float(match) for match in matches])
-        
-        # Convert 10-point scores to 5-point scale
-        converted_scores = []
-        for score in scores:
-            if score > 5:  # Assume it's a 10-point score
-                converted_scores.append(score / 2)
-            else:
-                converted_scores.append(score)
-        
-        unique_scores = []
-        for score in converted_scores:
-            if 0 <= score <= 5 and score not in unique_scores:
-                unique_scores.append(score)
-        
-        return unique_scores[:6]
-    except Exception as e:
-        st.warning(f"Could not extract scores: {str(e)}")
-        return []
-
-def calculate_percentage_score(scores):
-    """Convert scores to percentage"""
-    if not scores:
-        return 0.0
-    avg_score = sum(scores) / len(scores)
-    percentage = (avg_score / 5) * 100
-    return round(percentage, 1)
-
-def get_assessment_level(ats_score, overall_score):
-    """Get assessment level based on scores"""
-    avg_score = (ats_score * 100 + overall_score) / 2
-    if avg_score >= 85:
-        return "🟢 Excellent Match", "Outstanding alignment with job requirements. You're highly competitive for this role."
-    elif avg_score >= 70:
-        return "🟡 Strong Candidate", "Good foundation with some areas for strategic improvement."
-    elif avg_score >= 55:
-        return "🟠 Moderate Fit", "Solid potential but requires focused enhancement in key areas."
-    else:
-        return "🔴 Needs Development", "Significant improvements needed to be competitive for this role."
-
-def validate_inputs(resume_text):
-    """Validate inputs meet minimum requirements"""
-    errors = []
-    
-    if len(resume_text.strip()) < 150:
-        errors.append("❌ Resume content seems too short. Please provide a complete resume with all sections.")
-    
-    return errors
+# Start loading the shared similarity model in the background while the user fills in the form
+get_model_registry().start_background_load()
+metrics_url = start_metrics_server()
 
 # Sidebar Configuration
 with st.sidebar:
@@ -460,7 +179,7 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("## ⚙️ Setup")
     if not api_key:
-        st.error("🚨 **GROQ_API_KEY Required!**")
+        st.warning("🚨 **GROQ_API_KEY missing** - running in offline mode (local scores only)")
         st.markdown("""
         1. Get free key: [Groq Console](https://console.groq.com/)
         2. Create `.env` file:
@@ -471,6 +190,146 @@ with st.sidebar:
         """)
     else:
         st.success("✅ API Key Configured")
+    
+    model_metrics = get_model_registry().metrics
+    if model_metrics["status"] == "ready":
+        st.caption(f"🧠 Similarity model ready ({model_metrics['backend']}, load {model_metrics['load_seconds']}s, warm-up {model_metrics['warmup_seconds']}s, RSS {model_metrics['rss_after_mb']} MB)")
+    elif model_metrics["status"] == "failed":
+        st.caption("🧠 Similarity model failed to load")
+    else:
+        st.caption("🧠 Similarity model loading in background...")
+    
+    cache_stats = get_analysis_cache().stats()
+    st.caption(f"⚡ Analysis cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses ({cache_stats['entries']}/{cache_stats['max_entries']} entries)")
+    embedding_store = get_embedding_store()
+    if embedding_store is not None:
+        embedding_stats = embedding_store.stats()
+        st.caption(f"🧬 Embedding cache: {round(embedding_stats['hit_rate'] * 100)}% hit rate ({embedding_stats['entries']} vectors, {embedding_stats['size_mb']}/{embedding_stats['max_mb']} MB)")
+    pdf_cache_stats = get_pdf_text_cache().stats()
+    st.caption(f"📄 PDF text cache: {pdf_cache_stats['hits']} hits / {pdf_cache_stats['misses']} misses ({pdf_cache_stats['entries']} files)")
+    if history_enabled:
+        history_caption = st.empty()  # Refreshed once a new analysis is saved
+        history_caption.caption(f"🗂️ History: {len(st.session_state.analysis_results)} saved analyses of yours")
+        if st.session_state.analysis_results and st.button("🗑️ Delete my saved history", use_container_width=True):
+            forget_history(user_id)
+            st.session_state.save_history = False  # Or the results page would save its analysis again on rerun
+            st.session_state.analysis_results = []
+            st.session_state.last_analysis = None
+            st.rerun()
+    
+    if SHOW_ADMIN_PANEL:
+        with st.expander("🛠️ Admin: Stage Timings"):
+            stage_summary = get_telemetry().stage_summary()
+            if stage_summary:
+                st.dataframe(
+                    [{"stage": stage, **summary} for stage, summary in sorted(stage_summary.items())],
+                    hide_index=True,
+                    use_container_width=True
+                )
+            else:
+                st.caption("No stages traced yet.")
+            st.caption(f"Prometheus metrics: {metrics_url}" if metrics_url else "Prometheus endpoint disabled (METRICS_PORT=0 or port in use)")
+
+REPORT_EXPECTED_CHARS = 4800  # About the report's 1200-token limit, to turn streamed characters into progress
+DELTA_REVIEW_EXPECTED_CHARS = 2000  # About the delta review's 500-token limit
+
+def stage_progress(similarity_done, report_fraction, scores_done):
+    """Progress percentage from the stages that have actually finished"""
+    return int(100 * (0.1 + 0.15 * similarity_done + 0.65 * min(report_fraction, 1.0) + 0.1 * scores_done))
+
+SECTION_CHECK_LABELS = {
+    "experience": "✅ Experience section detected",
+    "education": "✅ Education section detected",
+    "skills": "✅ Skills section detected",
+    "summary": "✅ Summary/Objective section detected",
+    "contact": "✅ Contact information detected",
+}
+
+def render_keyword_panel(keyword_match):
+    """Matched and missing catalogue keywords for the selected role"""
+    field_titles = {
+        "key_skills": "🎯 Key Skills",
+        "experience_focus": "💼 Experience Focus",
+        "industry_keywords": "🔑 Industry Keywords",
+    }
+    missing_count = sum(len(keywords) for keywords in keyword_match["missing"].values())
+    with st.expander(f"🔍 Keyword Match: {round(keyword_match['coverage'] * 100)}% covered, {missing_count} missing", expanded=False):
+        cols = st.columns(3)
+        for col, (field, title) in zip(cols, field_titles.items()):
+            with col:
+                st.markdown(f"**{title}**")
+                for keyword in keyword_match["matched"][field]:
+                    st.write(f"✅ {keyword}")
+                for keyword in keyword_match["missing"][field]:
+                    st.write(f"❌ {keyword}")
+
+def render_dashboard(ats_score, report_scores, preliminary=False, revision=None):
+    """Performance dashboard; preliminary=True renders instant local scores while the AI report streams.
+
+    revision (AnalysisResult.revision) adds the changes since the previous analysis to each metric.
+    """
+    overall_percentage = calculate_percentage_score(report_scores)
+    score_deltas = (revision or {}).get("score_deltas", {})
+    
+    # Executive Summary Dashboard
+    st.markdown("### 📊 Performance Dashboard")
+    if preliminary:
+        st.caption("⚡ Preliminary local scores - refined automatically when the AI report finishes")
+    if revision:
+        st.caption(f"♻️ Changes since your previous version ({round(revision['changed_ratio'] * 100)}% of lines edited)")
+        if revision["overall_delta"] is None:
+            st.caption("ℹ️ Score changes are hidden: this version and the previous one were scored differently (AI vs. offline)")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric(
+            "🤖 ATS Compatibility",
+            "⏳" if ats_score is None else f"{round(ats_score * 100, 1)}%",
+            f"{revision['ats_delta'] * 100:+.1f}%" if revision else None,
+            help=f"Semantic similarity with {st.session_state.selected_job_role} requirements"
+        )
+    
+    with col2:
+        st.metric(
+            "📋 Overall Score", 
+            f"{overall_percentage}%",
+            f"{revision['overall_delta']:+.1f}%" if revision and revision["overall_delta"] is not None else None,
+            help="Comprehensive evaluation across all criteria"
+        )
+    
+    with col3:
+        improvement_potential = 100 - overall_percentage
+        st.metric(
+            "🚀 Growth Potential",
+            f"+{improvement_potential:.1f}%",
+            help="Available improvement opportunity"
+        )
+    
+    # Overall Assessment
+    if ats_score is not None:
+        assessment_level, assessment_desc = get_assessment_level(ats_score, overall_percentage)
+        st.info(f"**{assessment_level}**: {assessment_desc}")
+    
+    # Show analysis type without metrics
+    if st.session_state.custom_job_desc.strip():
+        st.success("🎯 **Targeted Analysis**: Used your specific job description for precise recommendations")
+    else:
+        st.info(f"📊 **General Analysis**: Used standard {st.session_state.selected_job_role} requirements")
+    
+    # Individual Scores Breakdown
+    if report_scores:
+        st.markdown("### 📊 Detailed Score Breakdown")
+        
+        cols = st.columns(3)
+        for i, (category, score) in enumerate(report_scores.items()):
+            col_idx = i % 3
+            with cols[col_idx]:
+                percentage = round((score / 5) * 100, 1)
+                if category in score_deltas:
+                    st.metric(category, f"{percentage}%", f"{score_deltas[category]:+g}/5 ({score}/5)")
+                else:
+                    st.metric(category, f"{percentage}%", f"{score}/5")
 
 # Main Application Interface
 if not st.session_state.form_submitted:
@@ -484,6 +343,24 @@ if not st.session_state.form_submitted:
             index=0,
             help="Select the job role you're applying for. This will customize the analysis and recommendations."
         )
+        best_fit_mode = st.checkbox(
+            "🧭 Not sure? Rank all roles for my resume first",
+            help="Scores your resume against every role and your saved job descriptions in seconds; you then pick the role to generate the full AI report for."
+        )
+        revision_mode = False
+        if st.session_state.last_analysis:
+            revision_mode = st.checkbox(
+                "♻️ Only review what changed since my last analysis",
+                value=True,
+                help="For an edited resume with the same role and job description: only the changed sections are sent to the AI, and score changes are shown."
+            )
+        save_history = False
+        if history_enabled:
+            save_history = st.checkbox(
+                "💾 Keep this analysis in my history",
+                value=st.session_state.save_history,
+                help=f"Stores your resume, scores and report on this server {history_retention} (from the sidebar) so you can track your scores across revisions."
+            )
         
         st.markdown("---")
         
@@ -506,7 +383,8 @@ if not st.session_state.form_submitted:
             key="pdf_uploader"
         )
         
-        if uploaded_file is not None:
+        # Skip parsing entirely when this run was triggered by "Clear Form"
+        if uploaded_file is not None and not st.session_state.get("clear_form_button"):
             col1, col2 = st.columns([3, 1])
             with col1:
                 st.success(f"✅ PDF Uploaded: **{uploaded_file.name}**")
@@ -516,9 +394,19 @@ if not st.session_state.form_submitted:
                 st.info(f"📄 {file_size:.1f} KB")
             
             with st.spinner("🔍 Extracting text from PDF..."):
-                pdf_text = extract_pdf_text(uploaded_file)
+                # Parsing runs in a worker process; polling keeps the script interruptible,
+                # so clearing the form while waiting cancels the job
+                extraction_status = st.empty()
+                extraction_started = time.monotonic()
+                extraction_job = submit_pdf_extraction(uploaded_file)
+                pdf_text = extraction_job.result(
+                    on_wait=lambda: extraction_status.caption(
+                        f"⏳ Parsing PDF... {time.monotonic() - extraction_started:.0f}s"
+                    )
+                )
+                extraction_status.empty()
             
-            if "Warning" not in pdf_text and "Could not extract" not in pdf_text:
+            if not is_extraction_failure(pdf_text):
                 st.success("✅ Text extracted successfully!")
                 
                 with st.expander("📖 Preview Extracted Text", expanded=False):
@@ -526,11 +414,12 @@ if not st.session_state.form_submitted:
                     col1, col2, col3 = st.columns(3)
                     col1.metric("Words", word_count)
                     col2.metric("Characters", len(pdf_text))
-                    col3.metric("Estimated Pages", max(1, word_count // 250))
+                    col3.metric("Pages", len(extraction_job.pages))
                     
+                    first_page = extraction_job.pages[0].strip()
                     st.text_area(
-                        "Extracted Resume Text:",
-                        value=pdf_text[:1000] + "..." if len(pdf_text) > 1000 else pdf_text,
+                        "Extracted Resume Text (page 1):",
+                        value=first_page[:1000] + "..." if len(first_page) > 1000 else first_page,
                         height=200,
                         disabled=True,
                         key="pdf_preview"
@@ -607,20 +496,9 @@ SKILLS
             col4.metric("⏱️ Read Time", f"{max(1, words // 200)} min")
             
             # Content quality check for pasted text
-            resume_lower = pasted_text.lower()
-            quality_checks = []
-            
-            if any(section in resume_lower for section in ['experience', 'work history', 'employment']):
-                quality_checks.append("✅ Experience section detected")
-            if 'education' in resume_lower:
-                quality_checks.append("✅ Education section detected")
-            if any(section in resume_lower for section in ['skill', 'technical', 'competenc']):
-                quality_checks.append("✅ Skills section detected")
-            if any(section in resume_lower for section in ['summary', 'objective', 'profile']):
-                quality_checks.append("✅ Summary/Objective section detected")
-            if '@' in pasted_text and any(contact in resume_lower for contact in ['phone', 'email', 'linkedin']):
-                quality_checks.append("✅ Contact information detected")
-            if any(char.isdigit() for char in pasted_text):
+            sections = detect_sections(pasted_text)
+            quality_checks = [SECTION_CHECK_LABELS[section] for section in sections]
+            if count_quantified_achievements(pasted_text):
                 quality_checks.append("✅ Quantified achievements detected")
             
             if quality_checks:
@@ -707,6 +585,13 @@ Benefits of adding specific job description:
             help="Adding a specific job description will make the analysis more targeted and accurate for your application.",
             key="custom_job_desc_input"
         )
+        save_job_desc_as = st.text_input(
+            "💾 Save this job description as (optional):",
+            placeholder="e.g. TechCorp Senior Data Scientist",
+            help="Saved job descriptions are included when ranking roles for your resume."
+        )
+        if st.session_state.saved_job_descs:
+            st.caption(f"💾 Saved job descriptions: {', '.join(st.session_state.saved_job_descs)}")
         
         st.markdown("---")
         
@@ -725,7 +610,8 @@ Benefits of adding specific job description:
         with col2:
             clear_form = st.form_submit_button(
                 "🗑️ Clear Form",
-                use_container_width=True
+                use_container_width=True,
+                key="clear_form_button"
             )
         
         # Show current input status
@@ -740,13 +626,13 @@ Benefits of adding specific job description:
         # AI DISCLAIMER SECTION
         st.markdown("---")
         st.markdown('<div class="disclaimer-section">', unsafe_allow_html=True)
-        st.markdown("""
+        st.markdown(f"""
         **🤖 AI-Powered Analysis Disclaimer**
         
         This application uses artificial intelligence (AI) technology to analyze your resume and provide career recommendations. Please note:
         
         • **AI Analysis**: All resume evaluations and recommendations are generated using advanced AI language models
-        • **Data Privacy**: Your resume content is processed securely and is not stored permanently on our servers
+        • **Data Privacy**: Your resume is sent to our AI provider (Groq) for analysis. It is only stored on our servers if you are signed in and tick "Keep this analysis in my history", and is then kept {history_retention} from the sidebar. Separately, reports are held in memory for a few hours so identical requests are not sent twice, and only numeric embeddings of your resume's text are cached on disk{" (along with the text of uploaded PDFs)" if PDF_TEXT_CACHE_DIR else ""}
         • **Recommendations**: AI-generated suggestions should be considered as guidance - use your professional judgment for implementation
         • **Accuracy**: While our AI strives for accuracy, please verify all recommendations before applying to your resume
         • **Human Review**: Consider having your updated resume reviewed by human career professionals for additional perspective
@@ -763,13 +649,18 @@ Benefits of adding specific job description:
         
         if submitted:
             if not api_key:
-                st.error("❌ **API Configuration Required**: Please set up your GROQ_API_KEY in a .env file.")
+                st.warning("⚠️ **No GROQ_API_KEY configured**: Running the offline analysis only.")
                 st.info("Get your free API key from [Groq Console](https://console.groq.com/) and create a .env file with: `GROQ_API_KEY=your_key_here`")
-            elif final_resume_text:
+            if final_resume_text:
                 st.session_state.resume = final_resume_text
                 st.session_state.resume_filename = resume_filename
                 st.session_state.selected_job_role = selected_role
                 st.session_state.custom_job_desc = custom_job_description
+                st.session_state.best_fit_mode = best_fit_mode
+                st.session_state.revision_mode = revision_mode
+                st.session_state.save_history = save_history
+                if save_job_desc_as.strip() and custom_job_description.strip():
+                    st.session_state.saved_job_descs[save_job_desc_as.strip()] = custom_job_description.strip()
                 
                 validation_errors = validate_inputs(final_resume_text)
                 
@@ -783,128 +674,253 @@ Benefits of adding specific job description:
             else:
                 st.warning("⚠️ Please provide your resume content using either PDF upload OR text paste to proceed.")
 
-# Results and Report Section
-if st.session_state.form_submitted:
+# Best-fit mode: rank every role from one resume encode, then analyze only the role the user picks
+if st.session_state.form_submitted and st.session_state.best_fit_mode:
     st.markdown("---")
+    st.markdown("## 🧭 Best-Fit Roles for Your Resume")
     
-    # Analysis header
-    st.markdown(f"## 📊 Analysis Report for: **{st.session_state.selected_job_role}**")
-    
-    # Progress tracking
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    ranking_key = (content_hash(st.session_state.resume), tuple(sorted(st.session_state.saved_job_descs.items())))
+    if not st.session_state.role_ranking or st.session_state.role_ranking[0] != ranking_key:
+        with st.spinner("🧭 Ranking all roles..."):
+            st.session_state.role_ranking = (ranking_key, rank_roles(st.session_state.resume, st.session_state.saved_job_descs))
+    ranking = st.session_state.role_ranking[1]
     
-    # Step 1: Analysis preparation
-    status_text.text("🎯 Step 1/4: Analyzing job requirements...")
-    progress_bar.progress(25)
-    
-    # Generate job description for similarity calculation
-    if st.session_state.custom_job_desc.strip():
-        comparison_job_desc = st.session_state.custom_job_desc.strip()
-    elif st.session_state.selected_job_role in JOB_ROLES and st.session_state.selected_job_role != "Custom Role":
-        role_info = JOB_ROLES[st.session_state.selected_job_role]
-        comparison_job_desc = f"{role_info['description']} Key skills: {', '.join(role_info['key_skills'])} Experience areas: {', '.join(role_info.get('experience_focus', []))}"
-    else:
-        comparison_job_desc = "Professional role requiring relevant experience and skills."
+    def format_percentage(value):
+        return "—" if value is None else f"{round(value * 100, 1)}%"
     
-    ats_score = calculate_similarity_bert(st.session_state.resume, comparison_job_desc)
-    ats_percentage = round(ats_score * 100, 1)
-    
-    # Step 2: AI Analysis
-    status_text.text("🤖 Step 2/4: Generating AI analysis...")
-    progress_bar.progress(50)
-    
-    comprehensive_report = generate_comprehensive_report(
-        st.session_state.resume, 
-        st.session_state.selected_job_role,
-        st.session_state.custom_job_desc
+    st.dataframe(
+        [
+            {
+                "Role": entry["role"] + (" (saved JD)" if entry["job_desc"] else ""),
+                "Fit": format_percentage(entry["score"]),
+                "Semantic Match": format_percentage(entry["similarity"]),
+                "Keyword Coverage": format_percentage(entry["keyword_coverage"]),
+            }
+            for entry in ranking
+        ],
+        hide_index=True,
+        use_container_width=True
     )
     
-    # Step 3: Score Extraction
-    status_text.text("📈 Step 3/4: Calculating performance metrics...")
-    progress_bar.progress(75)
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        chosen_rank = st.selectbox(
+            "Generate the full AI report for:",
+            options=range(len(ranking)),
+            format_func=lambda i: ranking[i]["role"] + (" (saved JD)" if ranking[i]["job_desc"] else "")
+        )
+    with col2:
+        st.write("")
+        if st.button("🎯 Analyze This Role", type="primary", use_container_width=True):
+            chosen = ranking[chosen_rank]
+            st.session_state.selected_job_role = "Custom Role" if chosen["job_desc"] else chosen["role"]
+            # A standard role is analyzed against its own requirements, not a job description typed earlier
+            st.session_state.custom_job_desc = chosen["job_desc"]
+            st.session_state.best_fit_mode = False
+            st.rerun()
+
+# Results and Report Section
+if st.session_state.form_submitted and not st.session_state.best_fit_mode:
+    st.markdown("---")
     
-    report_scores = extract_scores(comprehensive_report)
-    overall_percentage = calculate_percentage_score(report_scores)
+    # Analysis header
+    st.markdown(f"## 📊 Analysis Report for: **{st.session_state.selected_job_role}**")
     
-    # Step 4: Complete
-    status_text.text("✅ Analysis complete!")
-    progress_bar.progress(100)
+    # Local scores fill the dashboard instantly; the final dashboard replaces them once the report has streamed
+    dashboard_placeholder = st.empty()
     
-    assessment_level, assessment_desc = get_assessment_level(ats_score, overall_percentage)
+    # Keyword coverage for the selected role comes from the precompiled matcher in one pass
+    keyword_match = role_keyword_match(st.session_state.resume, st.session_state.selected_job_role)
+    if keyword_match and keyword_match["coverage"] is not None:
+        render_keyword_panel(keyword_match)
     
-    # Clear progress
-    import time
-    time.sleep(1)
-    progress_bar.empty()
-    status_text.empty()
+    st.markdown("---")
     
-    # Executive Summary Dashboard
-    st.markdown("### 📊 Performance Dashboard")
+    # Comprehensive Report Display
+    st.markdown("### 📝 Analysis Report")
+    st.markdown("*Focused, actionable recommendations for immediate impact.*")
     
-    col1, col2, col3 = st.columns(3)
+    # An edited resume for the same role and job description can be reviewed against the last analysis
+    last_analysis = st.session_state.last_analysis
+    same_target = bool(last_analysis) and (last_analysis["job_role"], last_analysis["custom_job_desc"]) == (
+        st.session_state.selected_job_role, st.session_state.custom_job_desc
+    )
+    previous, diff = None, None
+    if same_target and last_analysis["resume"] != st.session_state.resume and st.session_state.revision_mode:
+        previous = last_analysis["result"]
+        diff = diff_resumes(last_analysis["resume"], st.session_state.resume)
     
-    with col1:
-        st.metric(
-            "🤖 ATS Compatibility",
-            f"{ats_percentage}%",
-            help=f"Semantic similarity with {st.session_state.selected_job_role} requirements"
+    # Reuse the analysis shown on the last run, or a previous analysis of identical inputs (reruns, repeat submissions)
+    if same_target and last_analysis["resume"] == st.session_state.resume:
+        analysis = last_analysis["result"]
+    else:
+        analysis = get_cached_analysis(
+            st.session_state.resume,
+            st.session_state.selected_job_role,
+            st.session_state.custom_job_desc,
+            keyword_match,
+            user_id
         )
+        if analysis is not None and previous is not None:
+            analysis.revision = compare_results(previous, analysis, diff, "full")
     
-    with col2:
-        st.metric(
-            "📋 Overall Score", 
-            f"{overall_percentage}%",
-            help="Comprehensive evaluation across all criteria"
+    if analysis is not None:
+        st.markdown(analysis.report)
+    else:
+        delta_review = previous is not None and use_delta_review(diff, previous, api_key)
+        # Progress tracking
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        
+        # Step 1: Analysis preparation
+        status_text.text("🎯 Step 1/4: Analyzing job requirements...")
+        progress_bar.progress(stage_progress(False, 0, False))
+        
+        # Generate job description for similarity calculation
+        comparison_job_desc, comparison_embedding = comparison_target(
+            st.session_state.selected_job_role, st.session_state.custom_job_desc
         )
-    
-    with col3:
-        improvement_potential = 100 - overall_percentage
-        st.metric(
-            "🚀 Growth Potential",
-            f"+{improvement_potential}%",
-            help="Available improvement opportunity"
+        
+        if previous is not None and previous.similarity is not None and comparison_embedding is None:
+            comparison_embedding = previous.similarity.job_embedding  # Same role and job description as last time
+        
+        # Embedding similarity runs in the background while the report streams; a revision only encodes changed chunks
+        similarity_future = compute_similarity_async(
+            st.session_state.resume,
+            comparison_job_desc,
+            comparison_embedding,
+            None if previous is None else previous.similarity
         )
-    
-    # Overall Assessment
-    st.info(f"**{assessment_level}**: {assessment_desc}")
-    
-    # Show analysis type without metrics
-    if st.session_state.custom_job_desc.strip():
-        st.success("🎯 **Targeted Analysis**: Used your specific job description for precise recommendations")
-    else:
-        st.info(f"📊 **General Analysis**: Used standard {st.session_state.selected_job_role} requirements")
-    
-    # Individual Scores Breakdown
-    if report_scores:
-        st.markdown("### 📊 Detailed Score Breakdown")
         
-        score_categories = [
-            "Technical Skills",
-            "Experience", 
-            "Achievements",
-            "Education",
-            "ATS Optimization",
-            "Presentation"
-        ]
+        # Preliminary dashboard from keyword and structure checks, available in milliseconds
+        preliminary_scores = score_resume_locally(
+            st.session_state.resume, st.session_state.selected_job_role, keyword_match=keyword_match
+        )["scores"]
+        with dashboard_placeholder.container():
+            render_dashboard(None, preliminary_scores, preliminary=True)
         
-        cols = st.columns(3)
-        for i, (category, score) in enumerate(zip(score_categories, report_scores)):
-            col_idx = i % 3
-            with cols[col_idx]:
-                percentage = round((score / 5) * 100, 1)
-                st.metric(category, f"{percentage}%", f"{score}/5")
+        # Step 2: AI Analysis
+        status_text.text("🤖 Step 2/4: Generating AI analysis...")
+        progress_bar.progress(stage_progress(similarity_future.done(), 0, False))
+        
+        def show_report(report_stream, expected_chars):
+            # The bar follows the characters received so far and the background similarity
+            def chunks_with_progress(chunks):
+                for chunk in chunks:
+                    progress_bar.progress(stage_progress(
+                        similarity_future.done(), report_stream.received_chars / expected_chars, False
+                    ))
+                    yield chunk
+            
+            report_chunks = chunks_with_progress(report_stream)
+            first_chunk = next(report_chunks, "")
+            if first_chunk.startswith("❌ Error"):
+                st.error(first_chunk)
+                for _ in report_chunks:
+                    pass
+            else:
+                st.write_stream(itertools.chain([first_chunk], report_chunks))
+        
+        report_stream = None
+        if delta_review:
+            st.info(f"♻️ **Revision review**: only the changed sections were sent to the AI ({', '.join(section['title'] for section in diff['sections'])})")
+            report_stream = stream_delta_report(
+                st.session_state.resume,
+                diff,
+                previous.scores,
+                st.session_state.selected_job_role,
+                st.session_state.custom_job_desc
+            )
+            show_report(report_stream, DELTA_REVIEW_EXPECTED_CHARS)
+            if not report_stream.result["scores"]:
+                # Local fallback scores are not comparable with the previous AI scores, so get a full report instead
+                st.warning("⚠️ The revision review failed - generating the full report instead.")
+                delta_review, report_stream = False, None
+        if report_stream is None and api_key:
+            report_stream = stream_comprehensive_report(
+                st.session_state.resume, 
+                st.session_state.selected_job_role,
+                st.session_state.custom_job_desc
+            )
+            show_report(report_stream, REPORT_EXPECTED_CHARS)
+        
+        # Step 3: Score Extraction
+        status_text.text("📈 Step 3/4: Calculating performance metrics...")
+        progress_bar.progress(stage_progress(similarity_future.done(), 1.0, False))
+        
+        similarity = similarity_future.result()
+        ats_score = similarity.score
+        progress_bar.progress(stage_progress(True, 1.0, False))
+        if get_model_registry().error:
+            st.error(f"Error loading similarity model: {get_model_registry().error}")
+        
+        analysis = build_result(
+            st.session_state.resume,
+            st.session_state.selected_job_role,
+            ats_score,
+            None if report_stream is None else report_stream.result,
+            keyword_match,
+            similarity
+        )
+        if previous is not None:
+            analysis.revision = compare_results(previous, analysis, diff, "delta" if delta_review else "full")
+        if analysis.compaction:
+            compaction = analysis.compaction
+            st.caption(f"✂️ Resume compacted for the AI: {compaction['tokens_saved']} tokens saved ({compaction['original_tokens']} → {compaction['compacted_tokens']})")
+        elif report_stream is None:
+            # Offline mode: no API key
+            st.info("ℹ️ No GROQ_API_KEY configured - showing the offline analysis.")
+            st.markdown(analysis.report)
+        elif analysis.scores_source == "local":
+            # The AI report failed: its error is shown above, followed by the offline analysis
+            st.markdown(render_local_report(
+                st.session_state.selected_job_role,
+                score_resume_locally(st.session_state.resume, st.session_state.selected_job_role, ats_score, keyword_match)
+            ))
+        
+        # Step 4: Complete
+        status_text.text("✅ Analysis complete!")
+        progress_bar.progress(stage_progress(True, 1.0, True))
+        
+        # Only successful full AI analyses are cached so failures and offline runs are retried on the next run
+        cache_analysis(st.session_state.resume, st.session_state.custom_job_desc, analysis)
+        if history_enabled and st.session_state.save_history and record_analysis(st.session_state.resume, st.session_state.custom_job_desc, analysis, user_id) is not None:
+            st.session_state.analysis_results = analysis_history(user_id)
+            history_caption.caption(f"🗂️ History: {len(st.session_state.analysis_results)} saved analyses of yours")
+        
+        progress_bar.empty()
+        status_text.empty()
     
-    st.markdown("---")
+    ats_score = analysis.ats_score
+    comprehensive_report = analysis.report
+    report_scores = analysis.scores
+    ats_percentage = round(ats_score * 100, 1)
+    overall_percentage = analysis.overall_percentage
+    assessment_level, assessment_desc = analysis.assessment
     
-    # Comprehensive Report Display
-    st.markdown("### 📝 Analysis Report")
-    st.markdown("*Focused, actionable recommendations for immediate impact.*")
+    st.session_state.last_analysis = {
+        "resume": st.session_state.resume,
+        "job_role": st.session_state.selected_job_role,
+        "custom_job_desc": st.session_state.custom_job_desc,
+        "result": analysis,
+    }
     
-    if "Error" in comprehensive_report:
-        st.error(comprehensive_report)
-    else:
-        st.markdown(comprehensive_report)
+    with dashboard_placeholder.container():
+        render_dashboard(ats_score, report_scores, revision=analysis.revision)
+    
+    # Score trend over this user's analyses for the role, read from the history index
+    if history_enabled:
+        trend = score_trend(user_id, st.session_state.selected_job_role)
+        if len(trend) > 1:
+            st.markdown("### 📈 Score Trend Across Your Revisions")
+            st.line_chart(
+                {
+                    "ATS Compatibility %": [round(record["ats_score"] * 100, 1) for record in trend],
+                    "Overall Score %": [record["overall_score"] for record in trend],
+                },
+                use_container_width=True
+            )
+            st.caption(f"Your last {len(trend)} analyses for {st.session_state.selected_job_role}, oldest first")
     
     st.markdown("---")
     
@@ -930,11 +946,11 @@ Analysis Type: {analysis_type_text} - AI-Generated
 • ATS Compatibility: {ats_percentage}%
 • Overall Performance: {overall_percentage}%
 • Assessment: {assessment_level}
-• Growth Potential: +{100-overall_percentage}% improvement available
+• Growth Potential: +{100 - overall_percentage:.1f}% improvement available
 
 🎯 INDIVIDUAL SCORES
 ═══════════════════════════════════════════════════════════════════════════════
-{chr(10).join([f'• {cat}: {score}/5 ({round((score/5)*100, 1)}%)' for cat, score in zip(['Technical Skills', 'Experience', 'Achievements', 'Education', 'ATS Optimization', 'Presentation'], report_scores)])}
+{chr(10).join([f'• {cat}: {score}/5 ({round((score/5)*100, 1)}%)' for cat, score in report_scores.items()])}
 
 📋 DETAILED ANALYSIS & RECOMMENDATIONS
 ═══════════════════════════════════════════════════════════════════════════════
@@ -1036,21 +1052,16 @@ st.markdown("---")
 st.markdown("*💡 AI-Powered Strategy: Smart insights • Quick wins • Measurable results • Immediate impact*")
 st.markdown("**Ready for AI-powered resume optimization? Generate your analysis above! 🎯**")
 
-# Error handling
-try:
-    import streamlit
-    import pdfminer
-    import sentence_transformers
-    import sklearn
-    import groq
-except ImportError as e:
+# Error handling: look the packages up without importing them, as the engine loads them lazily
+missing_modules = [name for name in ("pdfminer", "sentence_transformers", "groq") if importlib.util.find_spec(name) is None]
+if missing_modules:
     st.error(f"""
     ❌ **Missing Dependencies**
     
     Please install the required packages:
     ```bash
-    pip install streamlit pdfminer.six sentence-transformers scikit-learn groq python-dotenv
+    pip install streamlit pdfminer.six sentence-transformers groq python-dotenv
     ```
     
-    Error: {str(e)}
+    Error: No module named {', '.join(repr(name) for name in missing_modules)}
     """)
@@ -0,0 +1,41 @@
+# Micro-batching of concurrent encode requests
+
+import pytest
+
+from resume_reviewer.batching import EncodeBatcher
+
+class RecordingEncoder:
+    """Fake encode(texts, batch_size) returning each text's length as its one-dimensional vector"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, batch_size):
+        self.calls.append((len(texts), batch_size))
+        return [[float(len(text))] for text in texts]
+
+def test_batches_never_exceed_the_cap():
+    encoder = RecordingEncoder()
+    batcher = EncodeBatcher(encoder, max_batch=4, max_wait_ms=2000)
+
+    futures = [batcher.submit(texts) for texts in (["a"] * 3, ["bb"] * 3, ["ccc"])]
+
+    assert [future.result(timeout=5)[:, 0].tolist() for future in futures] == [[1.0] * 3, [2.0] * 3, [3.0]]
+    assert encoder.calls == [(3, 3), (4, 4)]
+    assert batcher.stats()["largest_batch"] == 4
+
+def test_single_request_larger_than_the_cap_runs_alone():
+    encoder = RecordingEncoder()
+    batcher = EncodeBatcher(encoder, max_batch=4, max_wait_ms=0)
+
+    assert len(batcher.encode(["x"] * 6)) == 6
+    assert encoder.calls == [(6, 4)]
+
+def test_encode_errors_reach_every_caller():
+    def failing_encode(texts, batch_size):
+        raise RuntimeError("model unavailable")
+
+    batcher = EncodeBatcher(failing_encode, max_batch=4, max_wait_ms=0)
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        batcher.encode(["a"])
@@ -0,0 +1,48 @@
+# LRU/TTL eviction of the in-process caches
+
+from types import SimpleNamespace
+
+from resume_reviewer import cache
+from resume_reviewer.cache import LRUCache, analysis_cache_key
+
+def test_least_recently_used_entry_is_evicted():
+    lru = LRUCache(max_entries=2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1  # "b" is now the least recently used
+
+    lru.put("c", 3)
+
+    assert (lru.get("a"), lru.get("b"), lru.get("c")) == (1, None, 3)
+
+def test_size_bound_evicts_until_the_cache_fits():
+    lru = LRUCache(max_entries=10, max_size=10, sizeof=len)
+    lru.put("a", "xxxx")
+    lru.put("b", "xxxx")
+    lru.put("c", "xxxxxx")
+
+    assert lru.get("a") is None
+    assert lru.size == 10 and lru.stats()["entries"] == 2
+
+def test_replacing_an_entry_updates_the_size():
+    lru = LRUCache(max_entries=10, max_size=10, sizeof=len)
+    lru.put("a", "xxxxxxxx")
+    lru.put("a", "xx")
+
+    assert lru.size == 2 and lru.get("a") == "xx"
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    lru = LRUCache(max_entries=10, ttl_seconds=60)
+    lru.put("a", 1)
+
+    clock[0] += 60
+    assert lru.get("a") == 1
+    clock[0] += 1
+    assert lru.get("a") is None
+    assert lru.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 0, "max_entries": 10, "size": 0}
+
+def test_analysis_key_ignores_job_description_whitespace():
+    assert analysis_cache_key("resume", "Data Scientist", " Python role \n") == analysis_cache_key("resume", "Data Scientist", "Python role")
+    assert analysis_cache_key("resume", "Data Scientist") != analysis_cache_key("resume", "DevOps Engineer")
@@ -0,0 +1,36 @@
+# Resume compaction before the LLM call
+
+from resume_reviewer.compaction import compact_resume, count_tokens
+
+PAGE_ONE = "Jane Doe | jane@example.com\n\nEXPERIENCE\nBuilt   Python data pipelines\t for reporting\n(cid:3)Led SQL migrations\nPage 1 of 2"
+PAGE_TWO = "Jane Doe | jane@example.com\n\nEDUCATION\nBSc Computer Science, State University\nBuilt Python data pipelines for reporting\n2"
+
+def test_layout_noise_is_removed():
+    compacted, stats = compact_resume(PAGE_ONE + "\f" + PAGE_TWO, token_budget=10_000)
+
+    lines = compacted.splitlines()
+    assert lines.count("Jane Doe | jane@example.com") == 1
+    assert "Built Python data pipelines for reporting" in lines
+    assert lines.count("Built Python data pipelines for reporting") == 1
+    assert "Led SQL migrations" in lines
+    assert not any(line.startswith("Page") or line == "2" for line in lines)
+    assert stats["tokens_saved"] > 0 and stats["truncated_sections"] == []
+
+def test_budget_truncates_the_lowest_priority_sections_first():
+    resume = "\n".join(
+        ["Jane Doe", "EXPERIENCE"] + [f"Delivered project {i} with measurable results" for i in range(30)]
+        + ["HOBBIES"] + [f"Enjoys hiking trail number {i} on weekends" for i in range(30)]
+    )
+    budget = count_tokens(resume) * 3 // 4
+
+    compacted, stats = compact_resume(resume, token_budget=budget)
+
+    assert stats["truncated_sections"] == ["HOBBIES"]
+    assert "Delivered project 29 with measurable results" in compacted
+    assert count_tokens(compacted) <= budget
+
+def test_short_resume_is_unchanged_apart_from_whitespace():
+    compacted, stats = compact_resume("Jane Doe\nSKILLS\nPython, SQL\n\n\n")
+
+    assert compacted == "Jane Doe\nSKILLS\nPython, SQL"
+    assert stats["truncated_sections"] == []
@@ -0,0 +1,33 @@
+# Embedding backends and the model id their vectors are cached under
+
+import json
+import os
+import subprocess
+import sys
+
+from resume_reviewer.embedding_backends import create_embedding_backend
+from resume_reviewer.settings import MINILM_MODEL_NAME
+
+def _settings(**env):
+    """Model settings as a fresh process sees them with env set (they are read at import)"""
+    code = (
+        "import json; from resume_reviewer import settings; "
+        "print(json.dumps([settings.SIMILARITY_MODEL_NAME, settings.EMBEDDING_MODEL_ID]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=dict(os.environ, **env), capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+def test_minilm_loads_minilm_whatever_model_name():
+    assert create_embedding_backend("minilm", "some/other-model").model_name == MINILM_MODEL_NAME
+    assert create_embedding_backend("onnx", "some/other-model").model_name == "some/other-model"
+
+def test_minilm_vectors_are_cached_under_the_minilm_model():
+    model_name, model_id = _settings(SIMILARITY_BACKEND="minilm", SIMILARITY_MODEL_NAME="some/other-model")
+
+    assert model_name == MINILM_MODEL_NAME
+    assert model_id == f"{MINILM_MODEL_NAME}@minilm"
+
+def test_model_name_applies_to_the_other_backends():
+    assert _settings(SIMILARITY_BACKEND="onnx", SIMILARITY_MODEL_NAME="some/other-model")[1] == "some/other-model@onnx"
@@ -0,0 +1,49 @@
+# ATS-parity checks of the embedding benchmark
+
+from resume_reviewer.embedding_bench import annotate_parity, compare_parity, failed_backends
+
+MPNET = "sentence-transformers/all-mpnet-base-v2"
+MINILM = "sentence-transformers/all-MiniLM-L6-v2"
+
+def _result(backend, model_name, ats_scores):
+    return {"backend": backend, "model_name": model_name, "ats_scores": ats_scores}
+
+def test_compare_parity_measures_drift_and_best_role_agreement():
+    reference = _result("sentence-transformers", MPNET, [[0.6, 0.4], [0.3, 0.5]])
+    candidate = _result("onnx", MPNET, [[0.62, 0.4], [0.45, 0.4]])
+    parity = compare_parity(reference, candidate, tolerance=0.03)
+    assert parity["max_abs_diff"] == 0.15
+    assert parity["best_role_agreement"] == 0.5
+    assert not parity["within_tolerance"]
+
+def test_same_model_backend_within_tolerance_passes():
+    results = annotate_parity([
+        _result("sentence-transformers", MPNET, [[0.6, 0.4]]),
+        _result("onnx-int8", MPNET, [[0.61, 0.39]]),
+    ], tolerance=0.03)
+    assert results[1]["parity"]["same_model"]
+    assert failed_backends(results) == []
+
+def test_same_model_backend_outside_tolerance_fails():
+    results = annotate_parity([
+        _result("sentence-transformers", MPNET, [[0.6, 0.4]]),
+        _result("onnx-int8", MPNET, [[0.5, 0.4]]),
+    ], tolerance=0.03)
+    assert [result["backend"] for result in failed_backends(results)] == ["onnx-int8"]
+
+def test_other_model_is_reported_but_not_enforced():
+    results = annotate_parity([
+        _result("sentence-transformers", MPNET, [[0.6, 0.4]]),
+        _result("minilm", MINILM, [[0.3, 0.5]]),
+    ], tolerance=0.03)
+    assert not results[1]["parity"]["same_model"]
+    assert not results[1]["parity"]["within_tolerance"]
+    assert failed_backends(results) == []
+
+def test_errors_fail_and_skip_parity():
+    results = annotate_parity([
+        _result("sentence-transformers", MPNET, [[0.6, 0.4]]),
+        {"backend": "onnx", "error": "onnxruntime is not installed"},
+    ], tolerance=0.03)
+    assert "parity" not in results[1]
+    assert [result["backend"] for result in failed_backends(results)] == ["onnx"]
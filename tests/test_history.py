@@ -0,0 +1,74 @@
+# Persistent analysis history: per-user scoping and retention
+
+import time
+
+import pytest
+
+from resume_reviewer import analysis
+from resume_reviewer.analysis import AnalysisResult, get_cached_analysis
+from resume_reviewer.cache import LRUCache
+from resume_reviewer.history import HistoryStore
+
+RESUME = "EXPERIENCE\nBuilt Python data pipelines\n\nSKILLS\nPython, SQL\n"
+SCORES = {"Technical Skills": 4.0, "Experience": 3.0}
+
+def _result(report="stored review"):
+    return AnalysisResult("Data Scientist", 0.6, report, SCORES, "llm")
+
+@pytest.fixture
+def store(tmp_path):
+    history_store = HistoryStore(str(tmp_path / "history.sqlite3"), retention_days=30)
+    yield history_store
+    history_store._connection.close()
+
+def test_reports_are_only_found_for_the_user_who_saved_them(store):
+    store.record(RESUME, "", _result(), "account:a")
+
+    assert store.find_report("account:a", RESUME, "Data Scientist")["report"] == "stored review"
+    assert store.find_report("account:b", RESUME, "Data Scientist") is None
+    assert store.latest("account:b") is None
+    assert store.recent("account:b") == []
+    assert [record["user_id"] for record in store.recent("account:a")] == ["account:a"]
+
+def test_history_is_only_consulted_for_a_user(store, monkeypatch):
+    store.record(RESUME, "", _result(), "account:a")
+    shared_cache = LRUCache(8)
+    monkeypatch.setattr(analysis, "get_history_store", lambda: store)
+    monkeypatch.setattr(analysis, "get_analysis_cache", lambda: shared_cache)
+
+    assert get_cached_analysis(RESUME, "Data Scientist") is None
+    assert get_cached_analysis(RESUME, "Data Scientist", user_id="account:b") is None
+    assert get_cached_analysis(RESUME, "Data Scientist", user_id="account:a").report == "stored review"
+    # Not copied into the cache shared by every user
+    assert get_cached_analysis(RESUME, "Data Scientist") is None
+
+def test_purge_by_user(store):
+    store.record(RESUME, "", _result(), "account:a")
+    store.record(RESUME, "", _result(), "account:b")
+
+    assert store.purge("account:a") == 1
+    assert store.latest("account:a") is None
+    assert store.latest("account:b") is not None
+    with pytest.raises(ValueError):
+        store.purge()
+
+def test_expired_records_are_purged(store, tmp_path):
+    store.record(RESUME, "", _result(), "account:a")
+    store.record(RESUME, "", _result("recent review"), "account:a")
+    old_id = store.recent("account:a")[-1]["id"]
+    store._connection.execute("UPDATE analyses SET created_at = ? WHERE id = ?", (time.time() - 31 * 86400, old_id))
+    store._connection.commit()
+
+    assert store.purge_expired() == 1
+    assert [record["id"] for record in store.recent("account:a")] == [old_id + 1]
+
+    keep_forever = HistoryStore(store.path, retention_days=0)
+    assert keep_forever.purge_expired() == 0
+    keep_forever._connection.close()
+
+def test_anonymous_analyses_are_not_recorded(store, monkeypatch):
+    monkeypatch.setattr(analysis, "get_history_store", lambda: store)
+
+    assert analysis.record_analysis(RESUME, "", _result(), None) is None
+    assert analysis.record_analysis(RESUME, "", _result(), "account:a") is not None
+    assert store.stats()["analyses"] == 1
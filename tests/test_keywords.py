@@ -0,0 +1,60 @@
+# Keyword index: aliases and match boundaries
+
+from resume_reviewer.keywords import KeywordIndex, normalize_keyword
+
+ROLES = {
+    "Data Scientist": {
+        "key_skills": ["Python", "R", "Machine Learning", "Deep Learning", "Data Visualization"],
+        "experience_focus": ["A/B Testing"],
+        "industry_keywords": ["Version Control"],
+    },
+    "Software Engineer": {
+        "key_skills": ["JavaScript", "C++", "Node.js"],
+        "experience_focus": ["Programming", "Coding"],
+        "industry_keywords": [],
+    },
+    "Empty": {},
+}
+
+def _index():
+    return KeywordIndex(ROLES)
+
+def test_synonyms_and_abbreviations_count_as_mentions():
+    found = _index().scan("Applied ML and split testing; wrote ECMAScript with source control")
+
+    assert {"machine learning", "a/b testing", "javascript", "version control"} <= found
+
+def test_related_tools_do_not_count_as_the_skill():
+    found = _index().scan("Built dashboards with PyTorch, tracked in Git, DL enthusiast")
+
+    assert not {"data visualization", "deep learning", "version control"} & found
+
+def test_one_mention_counts_once():
+    match = _index().match("Ten years of coding", ["Software Engineer"])["Software Engineer"]
+
+    assert match["matched"]["experience_focus"] == ["Coding"]
+
+def test_single_letters_need_a_word_end():
+    index = _index()
+
+    assert "r" in index.scan("Python, R, SQL")
+    assert "r" in index.scan("Languages: Python R")
+    assert "r" in index.scan("Languages: R")
+    assert "r" not in index.scan("Led R&D for the analytics team")
+    assert "r" not in index.scan("a regular reviewer")
+
+def test_symbols_match_at_keyword_edges():
+    found = _index().scan("Wrote C++ services and Node.js APIs; JS tooling")
+
+    assert {"c++", "node.js", "javascript"} <= found
+    assert "javascript" not in _index().scan("Node.js only")
+
+def test_match_reports_coverage_per_role():
+    results = _index().match("Python and machine learning")
+
+    assert results["Data Scientist"]["matched"]["key_skills"] == ["Python", "Machine Learning"]
+    assert results["Data Scientist"]["coverage"] == 2 / 7
+    assert results["Empty"]["coverage"] is None
+
+def test_normalize_keyword():
+    assert normalize_keyword("  Scikit-Learn ") == "scikit learn"
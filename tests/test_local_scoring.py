@@ -0,0 +1,52 @@
+# Deterministic local scoring from keywords and resume structure
+
+from resume_reviewer.local_scoring import count_quantified_achievements, detect_sections, render_local_report, score_resume_locally
+from resume_reviewer.scoring import SCORE_CATEGORIES, calculate_percentage_score
+
+STRONG = """Jane Doe | jane@example.com
+SUMMARY
+Data scientist with 6 years of experience in machine learning and statistics.
+EXPERIENCE
+• Built Python and SQL pipelines serving 2 million users
+• Raised model accuracy by 18% with deep learning and TensorFlow
+• Ran A/B testing that cut churn 12%
+• Automated reporting with pandas and NumPy, saving $40k a year
+• Shipped data visualization dashboards used by 300 customers
+EDUCATION
+MSc Statistics, State University
+SKILLS
+Python, R, SQL, scikit-learn, neural networks, big data
+"""
+WEAK = "Hardworking person looking for a job. I like computers and working with people."
+
+def test_sections_and_quantified_lines_are_detected():
+    assert detect_sections(STRONG) == ["experience", "education", "skills", "summary", "contact"]
+    assert count_quantified_achievements(STRONG) == 5
+
+def test_scores_cover_every_category_within_range():
+    scores = score_resume_locally(STRONG, "Data Scientist", ats_score=0.7)["scores"]
+
+    assert list(scores) == [label for _, label in SCORE_CATEGORIES]
+    assert all(0 <= score <= 5 for score in scores.values())
+
+def test_stronger_resume_scores_higher():
+    strong = score_resume_locally(STRONG, "Data Scientist", ats_score=0.7)
+    weak = score_resume_locally(WEAK, "Data Scientist", ats_score=0.2)
+
+    assert calculate_percentage_score(strong["scores"]) > calculate_percentage_score(weak["scores"]) + 30
+    assert "Python" in strong["details"]["matched_skills"] and "Python" in weak["details"]["missing_skills"]
+
+def test_scoring_is_deterministic():
+    assert score_resume_locally(STRONG, "Data Scientist", 0.7) == score_resume_locally(STRONG, "Data Scientist", 0.7)
+
+def test_roles_without_keywords_fall_back_to_similarity():
+    low = score_resume_locally(STRONG, "Custom Role", ats_score=0.1)["scores"]
+    high = score_resume_locally(STRONG, "Custom Role", ats_score=0.9)["scores"]
+
+    assert high["Technical Skills"] > low["Technical Skills"]
+
+def test_offline_report_lists_the_evidence():
+    report = render_local_report("Data Scientist", score_resume_locally(WEAK, "Data Scientist", 0.2))
+
+    assert "Offline Analysis for Data Scientist" in report
+    assert "**Sections detected**: —" in report
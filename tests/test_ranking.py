@@ -0,0 +1,30 @@
+# Best-fit ranking of standard roles and saved job descriptions
+
+import pytest
+
+from resume_reviewer import ranking
+from resume_reviewer.ranking import rank_roles
+
+RESUME = "SKILLS\nPython, SQL, machine learning, statistics, pandas\nEXPERIENCE\nBuilt data pipelines\n"
+
+@pytest.fixture(autouse=True)
+def keywords_only(monkeypatch):
+    """Rank without the embedding model, on keyword coverage alone"""
+    monkeypatch.setattr(ranking, "load_similarity_model", lambda: None)
+
+def test_saved_job_description_named_like_a_standard_role_keeps_both_rows():
+    saved = {"Data Scientist": "Looking for Kubernetes and Terraform experience"}
+
+    rows = [entry for entry in rank_roles(RESUME, saved, top_n=0) if entry["role"] == "Data Scientist"]
+
+    assert sorted(entry["job_desc"] for entry in rows) == ["", saved["Data Scientist"]]
+    standard = next(entry for entry in rows if not entry["job_desc"])
+    assert standard["keyword_coverage"] > 0
+
+def test_ranking_falls_back_to_keyword_coverage_without_the_model():
+    result = rank_roles(RESUME, top_n=3)
+
+    assert len(result) == 3
+    assert result[0]["role"] == "Data Scientist"
+    assert all(entry["similarity"] is None for entry in result)
+    assert [entry["score"] for entry in result] == sorted((entry["score"] for entry in result), reverse=True)
@@ -0,0 +1,67 @@
+# Parsing the scores block of LLM reports, and its one-shot repair
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from resume_reviewer import report
+from resume_reviewer.report import SCORECARD, ReportStream, build_report_prompt, parse_report
+from resume_reviewer.scoring import SCORE_CATEGORIES
+
+RAW_SCORES = {"technical_skills": 8, "experience": 7, "achievements": 6, "education": 7, "ats_optimization": 7, "presentation": 9}
+SCORES_BLOCK = "```json\n" + json.dumps({"scores": RAW_SCORES}) + "\n```"
+NARRATIVE = "# Report\nAdd a skills section like this:\n```json\n{\"skills\": [\"Python\"]}\n```\nThen quantify results."
+
+def _completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+def test_scores_come_from_the_last_json_block():
+    narrative, scores = parse_report(f"{NARRATIVE}\n\n{SCORES_BLOCK}\n")
+
+    assert narrative == NARRATIVE
+    assert scores["Technical Skills"] == 4.0 and scores["Presentation"] == 4.5
+
+@pytest.mark.parametrize("raw_report, problem", [
+    ("# Report without scores", "no ```json scores block"),
+    ("# Report\n```json\n{\"scores\": \n```", "not valid JSON"),
+    ("# Report\n```json\n{\"scores\": {\"technical_skills\": 11}}\n```", "technical_skills"),
+])
+def test_missing_or_invalid_scores_are_rejected(raw_report, problem):
+    with pytest.raises(ValueError, match=problem):
+        parse_report(raw_report)
+
+def test_invalid_scores_are_repaired_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(report, "create_chat_completion", lambda *args, **kwargs: calls.append(kwargs) or _completion(json.dumps({"scores": RAW_SCORES})))
+
+    result = report._finish_report("prompt", NARRATIVE + "\n```json\n{broken\n```", api_key="key")
+
+    assert result["repaired"] and result["report"] == NARRATIVE
+    assert result["scores"]["Achievements"] == 3.0
+    assert len(calls) == 1 and calls[0]["response_format"] == {"type": "json_object"}
+
+def test_failed_repair_leaves_no_scores(monkeypatch):
+    monkeypatch.setattr(report, "create_chat_completion", lambda *args, **kwargs: _completion("not json"))
+
+    result = report._finish_report("prompt", "# Report without scores", api_key="key")
+
+    assert result == {"report": "# Report without scores", "scores": {}, "repaired": True}
+
+def test_stream_shows_json_in_the_narrative_but_not_the_scores(monkeypatch):
+    raw_report = f"{NARRATIVE}\n\n{SCORES_BLOCK}\n"
+    pieces = [raw_report[i:i + 7] for i in range(0, len(raw_report), 7)]
+    chunks = [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))]) for piece in pieces]
+    monkeypatch.setattr(report, "_create_completion", lambda *args, **kwargs: iter(chunks))
+    monkeypatch.setattr(report, "compact_resume", lambda resume: (resume, None))
+
+    stream = ReportStream("resume", "Data Scientist", api_key="key")
+
+    assert "".join(stream) == NARRATIVE
+    assert stream.result["scores"]["Experience"] == 3.5
+
+def test_scorecard_lists_the_dashboard_categories():
+    prompt = build_report_prompt("resume", "Data Scientist")
+
+    assert SCORECARD in prompt
+    assert [line.split(":")[0].strip("├└─ ") for line in SCORECARD.splitlines()] == [label for _, label in SCORE_CATEGORIES]
@@ -0,0 +1,83 @@
+# Incremental re-analysis of revised resumes
+
+from concurrent.futures import Future
+
+import pytest
+
+from resume_reviewer import analysis
+from resume_reviewer.analysis import AnalysisResult, analyze_revision, compare_results
+from resume_reviewer.revisions import diff_resumes
+from resume_reviewer.similarity import SimilarityResult
+
+PREVIOUS_RESUME = (
+    "EXPERIENCE\nBuilt Python data pipelines for reporting\nLed SQL migrations across three teams\n\n"
+    "EDUCATION\nBSc Computer Science, State University\n\n"
+    "SKILLS\nPython, SQL, machine learning, statistics\n"
+    + "Worked on analytics projects with product stakeholders\n" * 20
+)
+REVISED_RESUME = PREVIOUS_RESUME.replace("Led SQL migrations across three teams", "Led SQL migrations across three teams, cutting cost 30%")
+PREVIOUS_SCORES = {
+    "Technical Skills": 3.5, "Experience": 3.0, "Achievements": 2.5,
+    "Education": 3.5, "ATS Optimization": 3.0, "Presentation": 4.0,
+}
+FULL_SCORES = dict(PREVIOUS_SCORES, Achievements=3.5)
+
+def _report(scores):
+    return {"report": "review" if scores else "❌ Error: request failed", "scores": scores, "repaired": False}
+
+@pytest.fixture
+def offline_engine(monkeypatch):
+    """Stub out the model, the LLM calls and the history store; returns the list of LLM calls made"""
+    calls = []
+
+    def similarity_async(*args):
+        future = Future()
+        future.set_result(SimilarityResult(0.62))
+        return future
+
+    monkeypatch.setattr(analysis, "compute_similarity_async", similarity_async)
+    monkeypatch.setattr(analysis, "comparison_target", lambda job_role, custom_job_desc="": ("job", None))
+    monkeypatch.setattr(analysis, "get_history_store", lambda: None)
+    monkeypatch.setattr(analysis, "generate_delta_report", lambda *args: calls.append("delta") or _report({}))
+    monkeypatch.setattr(analysis, "generate_comprehensive_report", lambda *args: calls.append("full") or _report(FULL_SCORES))
+    return calls
+
+def _previous():
+    return AnalysisResult("Data Scientist", 0.6, "previous review", PREVIOUS_SCORES, "llm")
+
+def test_failed_delta_review_falls_back_to_full_report(offline_engine):
+    result = analyze_revision(REVISED_RESUME, PREVIOUS_RESUME, _previous(), api_key="key")
+
+    assert offline_engine == ["delta", "full"]
+    assert result.scores_source == "llm"
+    assert result.revision["mode"] == "full"
+    assert result.revision["score_deltas"]["Achievements"] == 1.0
+
+def test_deltas_are_hidden_when_every_report_fails(offline_engine, monkeypatch):
+    monkeypatch.setattr(analysis, "generate_comprehensive_report", lambda *args: offline_engine.append("full") or _report({}))
+
+    result = analyze_revision(REVISED_RESUME, PREVIOUS_RESUME, _previous(), api_key="key")
+
+    assert result.scores_source == "local"
+    assert result.revision["mode"] == "full"
+    assert result.revision["overall_delta"] is None
+    assert result.revision["score_deltas"] == {}
+    assert result.revision["ats_delta"] == 0.02
+
+def test_successful_delta_review_keeps_delta_mode(offline_engine, monkeypatch):
+    monkeypatch.setattr(analysis, "generate_delta_report", lambda *args: offline_engine.append("delta") or _report(FULL_SCORES))
+
+    result = analyze_revision(REVISED_RESUME, PREVIOUS_RESUME, _previous(), api_key="key")
+
+    assert offline_engine == ["delta"]
+    assert result.revision["mode"] == "delta"
+    assert result.revision["overall_delta"] == round(result.overall_percentage - _previous().overall_percentage, 1)
+
+def test_compare_results_only_compares_like_scores():
+    previous = _previous()
+    local = AnalysisResult("Data Scientist", 0.7, "offline", FULL_SCORES, "local")
+
+    revision = compare_results(previous, local, diff_resumes(PREVIOUS_RESUME, REVISED_RESUME), "full")
+
+    assert revision["changed_sections"] == ["EXPERIENCE"]
+    assert revision["overall_delta"] is None and revision["score_deltas"] == {}
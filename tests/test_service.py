@@ -0,0 +1,77 @@
+# HTTP analysis service: request validation, backpressure and idempotency
+
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from resume_reviewer import service
+from resume_reviewer.service import AnalysisJobQueue, AnalysisServiceHandler
+
+BODY = {"resume": "EXPERIENCE\nBuilt Python data pipelines\n", "job_role": "Data Scientist"}
+
+@pytest.fixture
+def server():
+    """Service with no workers, so submitted jobs stay queued, and room for one of them"""
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), AnalysisServiceHandler)
+    http_server.daemon_threads = True
+    http_server.jobs = AnalysisJobQueue(workers=0, max_queued=1)
+    http_server.retry_after = 7
+    threading.Thread(target=http_server.serve_forever, args=(0.05,), daemon=True).start()
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+
+def _post(server, body=None, headers=None, raw_length=None):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    data = json.dumps(BODY if body is None else body).encode("utf-8")
+    connection.putrequest("POST", "/analyses")
+    connection.putheader("Content-Length", str(len(data)) if raw_length is None else raw_length)
+    for name, value in (headers or {}).items():
+        connection.putheader(name, value)
+    connection.endheaders()
+    if raw_length is None:
+        connection.send(data)
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    connection.close()
+    return response, payload
+
+@pytest.mark.parametrize("length", ["-1", "abc", "1.5"])
+def test_invalid_content_length_is_rejected(server, length):
+    response, payload = _post(server, raw_length=length)
+
+    assert response.status == 400
+    assert "Content-Length" in payload["error"]
+
+def test_oversized_body_is_rejected(server, monkeypatch):
+    monkeypatch.setattr(service, "SERVICE_MAX_BODY_BYTES", 10)
+
+    response, _ = _post(server)
+
+    assert response.status == 413
+
+@pytest.mark.parametrize("body", [{"resume": "text", "job_role": "Astronaut"}, {"job_role": "Data Scientist"}, ["not", "an", "object"]])
+def test_invalid_requests_are_rejected(server, body):
+    response, _ = _post(server, body)
+
+    assert response.status == 400
+
+def test_full_queue_answers_429_with_retry_after(server):
+    first, _ = _post(server)
+    second, _ = _post(server)
+
+    assert first.status == 202
+    assert second.status == 429
+    assert second.getheader("Retry-After") == "7"
+    assert server.jobs.stats()["rejected"] == 1
+
+def test_idempotency_key_returns_the_original_job(server):
+    created, job = _post(server, headers={"Idempotency-Key": "k1"})
+    retried, same_job = _post(server, headers={"Idempotency-Key": "k1"})
+    conflict, _ = _post(server, dict(BODY, job_role="DevOps Engineer"), headers={"Idempotency-Key": "k1"})
+
+    assert (created.status, retried.status, conflict.status) == (202, 200, 409)
+    assert same_job["id"] == job["id"]